@@ -1,8 +1,10 @@
 # agents/content_architect_agent.py
-from crewai import Agent
-from agents.tools.custom_tools import BloomsTaxonomyTool, CurriculumMappingTool, FileReadTool
+from agents.kickoff import kickoff_structured
+from agents.pool import pooled_agent
+from agents.phase_cache import PhaseCache
+from agents.prompts import PromptTemplate
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 class LearningRequirements(BaseModel):
     subject: str
@@ -20,8 +22,31 @@ class LearningBlueprint(BaseModel):
     prerequisite_skills: List[str]
 
 class ContentArchitectAgent:
-    def __init__(self):
-        self.architect_agent = Agent(
+    # Fields of each upstream artifact that this phase's prompt actually needs (None = all)
+    CONTEXT_FIELDS = {
+        "requirements": ["target_audience", "skill_level", "learning_objectives", "success_metrics", "constraints"]
+    }
+    PROMPT = PromptTemplate("blueprint", """
+        Based on the learning requirements below, create a comprehensive learning blueprint.
+        
+        Design a hands-on learning experience that includes:
+        1. Modular course structure with clear progression
+        2. Measurable learning objectives (Apply/Analyze level)
+        3. Assessment strategy with both formative and summative elements
+        4. Instructional methods optimized for skill development
+        5. Detailed content outline with time estimates
+        6. Prerequisites and skill dependencies
+        """, [("requirements", "Requirements")])
+
+    def __init__(self, cache: Optional[PhaseCache] = None):
+        self.cache = cache
+
+    @pooled_agent
+    def architect_agent(self):
+        from crewai import Agent
+        from agents.tools.custom_tools import BloomsTaxonomyTool, CurriculumMappingTool, FileReadTool, DocumentSearchTool
+        
+        return Agent(
             role="Learning Design Strategist",
             goal="Create comprehensive learning blueprints and assessment strategies for hands-on technical courses",
             backstory="""You are a master instructional designer with expertise in 
@@ -31,7 +56,8 @@ class ContentArchitectAgent:
             tools=[
                 BloomsTaxonomyTool(),
                 CurriculumMappingTool(),
-                FileReadTool()
+                FileReadTool(),
+                DocumentSearchTool()
             ],
             verbose=True,
             max_iter=30,
@@ -48,23 +74,15 @@ class ContentArchitectAgent:
 
     def create_blueprint(self, requirements: LearningRequirements) -> LearningBlueprint:
         """Create detailed learning blueprint"""
-        blueprint_prompt = f"""
-        Based on the following learning requirements, create a comprehensive learning blueprint:
-        
-        Requirements: {requirements.model_dump_json()}
-        
-        Design a hands-on learning experience that includes:
-        1. Modular course structure with clear progression
-        2. Measurable learning objectives (Apply/Analyze level)
-        3. Assessment strategy with both formative and summative elements
-        4. Instructional methods optimized for skill development
-        5. Detailed content outline with time estimates
-        6. Prerequisites and skill dependencies
-        """
+        blueprint_prompt = self.PROMPT.render(requirements=requirements.model_dump_json(
+            include=set(self.CONTEXT_FIELDS["requirements"])))
         
-        result = self.architect_agent.kickoff(
+        result = kickoff_structured(
+            self.architect_agent,
             blueprint_prompt,
-            response_format=LearningBlueprint
+            response_format=LearningBlueprint,
+            cache=self.cache,
+            phase="blueprint"
         )
         
-        return result.pydantic
+        return result
@@ -1,8 +1,15 @@
 # agents/content_creation_agent.py
-from crewai import Agent
-from agents.tools.custom_tools import ContentGenerationTool, MediaCreationTool, CodeSnippetTool
-from pydantic import BaseModel
-from typing import List, Dict
+from agents.context import ContextProjector, ProjectedArtifact
+from agents.instrumentation import instrumentation
+from agents.kickoff import kickoff_structured
+from agents.pool import borrowed_agent, pooled_agent
+from agents.phase_cache import PhaseCache
+from agents.prompts import PromptTemplate
+from pydantic import BaseModel, create_model
+from typing import Any, List, Dict, Optional, Tuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, wait
+import json
 from .content_architect_agent import LearningBlueprint
 
 class LabEnvironment(BaseModel):
@@ -19,9 +26,58 @@ class ContentAssets(BaseModel):
     code_examples: List[Dict[str, str]]
     supporting_materials: List[Dict[str, str]]
 
+# Sections that can be written from the blueprint alone and those that need the lab design
+BLUEPRINT_SECTIONS = ["presentations", "assessments", "video_scripts", "supporting_materials"]
+LAB_SECTIONS = ["lab_guides", "code_examples"]
+ALL_SECTIONS = list(ContentAssets.model_fields)
+
+SECTION_INSTRUCTIONS = {
+    "presentations": "Interactive presentations with slide notes",
+    "lab_guides": "Step-by-step lab guides with troubleshooting",
+    "assessments": "Formative and summative assessments",
+    "video_scripts": "Video scripts for demonstrations",
+    "code_examples": "Code examples with explanations",
+    "supporting_materials": "Supporting materials (cheat sheets, references)"
+}
+
+@lru_cache(maxsize=None)
+def _section_model(sections: Tuple[str, ...]) -> type:
+    """Structured output model restricted to the requested ContentAssets fields"""
+    fields = {section: (List[Dict[str, str]], ...) for section in sections}
+    return create_model("ContentSections", **fields)
+
 class ContentCreationAgent:
-    def __init__(self):
-        self.content_creator = Agent(
+    # Fields of each upstream artifact that this phase's prompt actually needs (None = all)
+    CONTEXT_FIELDS = {
+        "blueprint": ["course_structure", "learning_objectives", "assessment_strategy",
+                      "instructional_methods", "content_outline"],
+        "lab_environment": ["environment_type", "cloud_provider", "resource_specifications",
+                            "setup_scripts", "access_controls"]
+    }
+    PROMPT = PromptTemplate("content_assets", """
+        Generate content assets from the learning blueprint and lab environment below.
+        
+        Create only the content listed under Create, for the module given when there is
+        one and for the whole course otherwise.
+        """, [("blueprint", "Learning Blueprint"), ("lab", "Lab Environment"),
+              ("module", "Module"), ("create", "Create")])
+
+    def __init__(self, cache: Optional[PhaseCache] = None, context: Optional[ContextProjector] = None,
+                 max_workers: int = 4, shard_by: str = "module", shard_retries: int = 2):
+        if shard_by not in ("module", "section"):
+            raise ValueError(f"shard_by must be 'module' or 'section', got '{shard_by}'")
+        self.cache = cache
+        self.context = context or ContextProjector()
+        self.max_workers = max_workers
+        self.shard_by = shard_by
+        self.shard_retries = shard_retries
+
+    @pooled_agent
+    def content_creator(self):
+        from crewai import Agent
+        from agents.tools.custom_tools import ContentGenerationTool, MediaCreationTool, CodeSnippetTool
+        
+        return Agent(
             role="Multi-media Content Developer",
             goal="Generate comprehensive instructional materials, code samples, and assessment content",
             backstory="""You are a versatile content creator with expertise in technical 
@@ -49,24 +105,80 @@ class ContentCreationAgent:
     def generate_content(self, blueprint: LearningBlueprint, 
                         lab_environment: LabEnvironment) -> ContentAssets:
         """Generate all content assets"""
-        content_prompt = f"""
-        Generate comprehensive content assets based on:
-        
-        Learning Blueprint: {blueprint.model_dump_json()}
-        Lab Environment: {lab_environment.model_dump_json()}
+        return ContentAssets(**self.generate_content_sections(blueprint, ALL_SECTIONS, lab_environment))
+
+    def generate_content_sections(self, blueprint: LearningBlueprint, sections: List[str],
+                                  lab_environment: Optional[LabEnvironment] = None) -> Dict[str, List[Dict[str, str]]]:
+        """Generate a subset of content asset sections, fanned out over parallel shards
         
-        Create content that includes:
-        1. Interactive presentations with slide notes
-        2. Step-by-step lab guides with troubleshooting
-        3. Formative and summative assessments
-        4. Video scripts for demonstrations
-        5. Code examples with explanations
-        6. Supporting materials (cheat sheets, references)
+        With shard_by="module" there is one shard per entry of the blueprint's
+        course_structure, with shard_by="section" one per asset type. Each shard is
+        retried on its own and the results are merged in shard order.
         """
+        unknown = [section for section in sections if section not in SECTION_INSTRUCTIONS]
+        if unknown:
+            raise ValueError(f"Unknown content sections: {unknown}")
+
+        projections = [self.context.project(blueprint, self.CONTEXT_FIELDS["blueprint"])]
+        if lab_environment is not None:
+            projections.append(self.context.project(lab_environment, self.CONTEXT_FIELDS["lab_environment"]))
+
+        if self.shard_by == "module" and blueprint.course_structure:
+            shards = [(module, sections) for module in blueprint.course_structure]
+        elif self.shard_by == "section":
+            shards = [(None, [section]) for section in sections]
+        else:
+            shards = [(None, sections)]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(shards))) as executor:
+            futures = [executor.submit(self._run_shard, projections, module, shard_sections)
+                       for module, shard_sections in shards]
+            wait(futures)
+
+        failed = [(i, future.exception()) for i, future in enumerate(futures) if future.exception()]
+        if failed:
+            details = "; ".join(f"shard {i}: {error}" for i, error in failed)
+            raise RuntimeError(f"{len(failed)} of {len(shards)} content shards failed: {details}") from failed[0][1]
+
+        merged: Dict[str, List[Dict[str, str]]] = {section: [] for section in sections}
+        for future in futures:
+            for section, items in future.result().items():
+                merged[section].extend(items)
+        return merged
+
+    def _run_shard(self, projections: List[ProjectedArtifact], module: Optional[Dict[str, str]],
+                   sections: List[str]) -> Dict[str, List[Dict[str, str]]]:
+        for attempt in range(self.shard_retries + 1):
+            try:
+                with borrowed_agent(self, "content_creator") as agent:
+                    return self._generate_shard(agent, projections, module, sections)
+            except Exception:
+                if attempt == self.shard_retries:
+                    raise
+                instrumentation.increment("retries_total", phase="content_assets")
+
+    def _generate_shard(self, agent: Any, projections: List[ProjectedArtifact],
+                        module: Optional[Dict[str, str]],
+                        sections: List[str]) -> Dict[str, List[Dict[str, str]]]:
+        instructions = "".join(
+            f"\n{i}. {SECTION_INSTRUCTIONS[section]}" for i, section in enumerate(sections, 1)
+        )
+        content_prompt = self.PROMPT.render(
+            blueprint=projections[0].text,
+            lab=projections[1].text if len(projections) > 1 else None,
+            module=json.dumps(module) if module is not None else None,
+            create=instructions
+        )
+        self.context.record("content_creation", content_prompt.text, projections)
         
-        result = self.content_creator.kickoff(
+        result = kickoff_structured(
+            agent,
             content_prompt,
-            response_format=ContentAssets
+            response_format=_section_model(tuple(sections)),
+            cache=self.cache,
+            phase="content_assets"
         )
+        if result is None:
+            raise ValueError("Content shard returned no structured output")
         
-        return result.pydantic
+        return result.model_dump()
@@ -0,0 +1,147 @@
+# agents/context.py
+import json
+import math
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+DEFAULT_TOKEN_BUDGET = 4000
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Any:
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # tiktoken is optional and needs network access to fetch its vocabulary once
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / 4)
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _shrink(value: Any, max_items: int, max_chars: int) -> Any:
+    if isinstance(value, list):
+        kept = [_shrink(item, max_items, max_chars) for item in value[:max_items]]
+        if len(value) > max_items:
+            kept.append(f"... {len(value) - max_items} more items omitted")
+        return kept
+    if isinstance(value, dict):
+        return {key: _shrink(item, max_items, max_chars) for key, item in value.items()}
+    if isinstance(value, str) and len(value) > max_chars:
+        return value[:max_chars] + "..."
+    return value
+
+
+def _longest(value: Any) -> tuple:
+    """Longest list length and longest string length anywhere in value"""
+    if isinstance(value, list):
+        sizes = [_longest(item) for item in value]
+        return max([len(value)] + [s[0] for s in sizes]), max([0] + [s[1] for s in sizes])
+    if isinstance(value, dict):
+        sizes = [_longest(item) for item in value.values()] or [(0, 0)]
+        return max(s[0] for s in sizes), max(s[1] for s in sizes)
+    if isinstance(value, str):
+        return 0, len(value)
+    return 0, 0
+
+
+@dataclass
+class ProjectedArtifact:
+    text: str
+    tokens_before: int
+    tokens_after: int
+
+
+class ContextProjector:
+    """Projects upstream artifacts onto the fields a phase needs, within a token budget
+    
+    Long lists are cut down to their first items plus a count of what was omitted and
+    long strings are truncated, halving the limits until the artifact fits the budget.
+    """
+
+    MIN_CHARS = 80
+
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET, max_list_items: Optional[int] = None):
+        self.token_budget = token_budget
+        self.max_list_items = max_list_items
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def project(self, artifact: BaseModel, fields: Optional[List[str]] = None) -> ProjectedArtifact:
+        """Serialise the selected fields of an artifact, shrinking it to the token budget"""
+        tokens_before = estimate_tokens(artifact.model_dump_json())
+        data = artifact.model_dump(mode="json", include=set(fields) if fields is not None else None)
+
+        max_items, max_chars = _longest(data)
+        if self.max_list_items is not None:
+            max_items = min(max_items, self.max_list_items)
+        max_chars = max(max_chars, self.MIN_CHARS)
+
+        text = full_text = _dumps(_shrink(data, max_items, max_chars))
+        tokens_after = full_tokens = estimate_tokens(text)
+        while tokens_after > self.token_budget and (max_items > 1 or max_chars > self.MIN_CHARS):
+            if max_items > 1:
+                max_items = max_items // 2
+            if max_chars > self.MIN_CHARS:
+                max_chars = max(max_chars // 2, self.MIN_CHARS)
+            text = _dumps(_shrink(data, max_items, max_chars))
+            tokens_after = estimate_tokens(text)
+
+        # Omission markers can outweigh what they replace when the budget is very small
+        if tokens_after > full_tokens:
+            text, tokens_after = full_text, full_tokens
+        return ProjectedArtifact(text, tokens_before, tokens_after)
+
+    def record(self, phase: str, prompt: str, projections: List[ProjectedArtifact]):
+        """Account the prompt tokens of a phase with and without projection"""
+        tokens_after = estimate_tokens(prompt)
+        saved = sum(p.tokens_before - p.tokens_after for p in projections)
+        with self._lock:
+            stats = self.stats.setdefault(phase, {"calls": 0, "prompt_tokens_before": 0,
+                                                  "prompt_tokens_after": 0})
+            stats["calls"] += 1
+            stats["prompt_tokens_before"] += tokens_after + saved
+            stats["prompt_tokens_after"] += tokens_after
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        """Prompt token counts before and after projection, per phase"""
+        with self._lock:
+            return {phase: dict(stats) for phase, stats in self.stats.items()}
+
+    def drain(self) -> Dict[str, Dict[str, int]]:
+        """The report so far, resetting the counts"""
+        with self._lock:
+            stats, self.stats = self.stats, {}
+            return stats
+
+    def merge(self, stats: Dict[str, Dict[str, int]]):
+        """Add counts drained from another projector, e.g. one in a worker process"""
+        with self._lock:
+            for phase, counts in stats.items():
+                totals = self.stats.setdefault(phase, {"calls": 0, "prompt_tokens_before": 0,
+                                                       "prompt_tokens_after": 0})
+                for name, value in counts.items():
+                    totals[name] = totals.get(name, 0) + value
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # A copy sent to a worker process starts from empty counts, which are merged back per course
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["stats"] = {}
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
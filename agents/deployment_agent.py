@@ -1,10 +1,16 @@
 # agents/deployment_agent.py
-from crewai import Agent
-from agents.tools.custom_tools import LMSIntegrationTool, SCORMPackagingTool, AnalyticsTool
+from agents.context import ContextProjector
+from agents.kickoff import kickoff_structured
+from agents.pool import pooled_agent
+from agents.phase_cache import PhaseCache
+from agents.prompts import PromptTemplate
+from agents.tools.scorm_packager import ScormPackager
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 from .content_creation_agent import ContentAssets
 from .quality_assurance_agent import QualityReport
+import hashlib
+import os
 
 
 
@@ -17,8 +23,37 @@ class DeploymentPackage(BaseModel):
     maintenance_procedures: List[str]
 
 class DeploymentAgent:
-    def __init__(self):
-        self.deployment_agent = Agent(
+    # Fields of each upstream artifact that this phase's prompt actually needs (None = all)
+    CONTEXT_FIELDS = {
+        "content_assets": None,
+        "qa_report": ["technical_validation", "accessibility_compliance", "recommended_improvements"]
+    }
+    PROMPT = PromptTemplate("deployment_package", """
+        Create a comprehensive deployment package from the content assets and QA report below.
+        
+        Package everything for deployment including:
+        1. LMS-compatible content package (SCORM/xAPI)
+        2. Comprehensive instructor guide
+        3. Learner materials and resources
+        4. Analytics and reporting configuration
+        5. Step-by-step deployment instructions
+        6. Ongoing maintenance procedures
+        """, [("content", "Content Assets"), ("qa", "QA Report")])
+
+    def __init__(self, cache: Optional[PhaseCache] = None, context: Optional[ContextProjector] = None,
+                 package_dir: Optional[str] = None, scorm_version: str = "1.2"):
+        self.cache = cache
+        self.context = context or ContextProjector()
+        # When set, a real SCORM package is written here for every deployment
+        self.package_dir = package_dir or os.getenv("SCORM_PACKAGE_DIR")
+        self.scorm_version = scorm_version
+
+    @pooled_agent
+    def deployment_agent(self):
+        from crewai import Agent
+        from agents.tools.custom_tools import LMSIntegrationTool, SCORMPackagingTool, AnalyticsTool
+        
+        return Agent(
             role="Learning Experience Platform Specialist",
             goal="Package and deploy content to LMS/LXP systems with comprehensive analytics",
             backstory="""You are a learning technology specialist with extensive experience 
@@ -44,24 +79,32 @@ class DeploymentAgent:
     def create_deployment_package(self, content_assets: ContentAssets, 
                                 qa_report: QualityReport) -> DeploymentPackage:
         """Create complete deployment package"""
-        deployment_prompt = f"""
-        Create a comprehensive deployment package based on:
+        content = self.context.project(content_assets, self.CONTEXT_FIELDS["content_assets"])
+        qa = self.context.project(qa_report, self.CONTEXT_FIELDS["qa_report"])
+        deployment_prompt = self.PROMPT.render(content=content.text, qa=qa.text)
+        self.context.record("deployment", deployment_prompt.text, [content, qa])
         
-        Content Assets: {content_assets.model_dump_json()}
-        QA Report: {qa_report.model_dump_json()}
-        
-        Package everything for deployment including:
-        1. LMS-compatible content package (SCORM/xAPI)
-        2. Comprehensive instructor guide
-        3. Learner materials and resources
-        4. Analytics and reporting configuration
-        5. Step-by-step deployment instructions
-        6. Ongoing maintenance procedures
-        """
-        
-        result = self.deployment_agent.kickoff(
+        result = kickoff_structured(
+            self.deployment_agent,
             deployment_prompt,
-            response_format=DeploymentPackage
+            response_format=DeploymentPackage,
+            cache=self.cache,
+            phase="deployment_package"
         )
         
-        return result.pydantic
+        if self.package_dir and result is not None:
+            result = result.model_copy(update={
+                "lms_package": {**result.lms_package, **self.build_scorm_package(content_assets)}
+            })
+        return result
+
+    def build_scorm_package(self, content_assets: ContentAssets) -> Dict[str, str]:
+        """Write the SCORM zip for the content assets and describe it for lms_package"""
+        identifier = "course-" + hashlib.sha256(content_assets.model_dump_json().encode()).hexdigest()[:12]
+        report = ScormPackager(version=self.scorm_version).package(
+            content_assets,
+            os.path.join(self.package_dir, f"{identifier}.zip"),
+            title=identifier,
+            identifier=identifier
+        )
+        return {f"scorm_{key}": str(value) for key, value in report.as_dict().items()}
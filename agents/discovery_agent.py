@@ -1,9 +1,10 @@
 # agents/discovery_agent.py
-from crewai import Agent
-from crewai_tools import SerperDevTool, FileReadTool
-from agents.tools.custom_tools import StakeholderInterviewTool, GapAnalysisTool
+from agents.kickoff import kickoff_structured
+from agents.pool import pooled_agent
+from agents.phase_cache import PhaseCache
+from agents.prompts import PromptTemplate
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 class LearningRequirements(BaseModel):
     target_audience: str
@@ -14,8 +15,26 @@ class LearningRequirements(BaseModel):
     priority_level: str
 
 class DiscoveryAgent:
-    def __init__(self):
-        self.discovery_agent = Agent(
+    # Fields of each upstream artifact that this phase's prompt actually needs (None = all)
+    CONTEXT_FIELDS = {
+        "inputs": ["course_topic", "target_audience", "business_context", "timeline"]
+    }
+    PROMPT = PromptTemplate("requirements", """
+        Analyze the business requirements below for a hands-on technical course.
+        Conduct a comprehensive requirements analysis and provide structured output.
+        """, [("course_topic", "Course Topic"), ("target_audience", "Target Audience"),
+              ("business_context", "Business Context"), ("timeline", "Timeline")])
+
+    def __init__(self, cache: Optional[PhaseCache] = None):
+        self.cache = cache
+
+    @pooled_agent
+    def discovery_agent(self):
+        from crewai import Agent
+        from crewai_tools import SerperDevTool, FileReadTool
+        from agents.tools.custom_tools import StakeholderInterviewTool, GapAnalysisTool, DocumentSearchTool
+        
+        return Agent(
             role="Business Requirements Analyst",
             goal="Extract and validate comprehensive learning requirements from stakeholders",
             backstory="""You are an expert instructional design consultant with over 15 years 
@@ -26,7 +45,8 @@ class DiscoveryAgent:
                 SerperDevTool(),
                 FileReadTool(),
                 StakeholderInterviewTool(),
-                GapAnalysisTool()
+                GapAnalysisTool(),
+                DocumentSearchTool()
             ],
             verbose=True,
             max_iter=25,
@@ -43,20 +63,15 @@ class DiscoveryAgent:
 
     def execute_discovery(self, inputs: Dict[str, str]) -> LearningRequirements:
         """Execute discovery process with structured output"""
-        discovery_prompt = f"""
-        Analyze the following business requirements for a hands-on technical course:
-        
-        Course Topic: {inputs.get('course_topic', 'Not specified')}
-        Target Audience: {inputs.get('target_audience', 'Not specified')}
-        Business Context: {inputs.get('business_context', 'Not specified')}
-        Timeline: {inputs.get('timeline', 'Not specified')}
-        
-        Conduct a comprehensive requirements analysis and provide structured output.
-        """
+        discovery_prompt = self.PROMPT.render(**{key: inputs.get(key, 'Not specified')
+                                                 for key, _ in self.PROMPT.blocks})
         
-        result = self.discovery_agent.kickoff(
+        result = kickoff_structured(
+            self.discovery_agent,
             discovery_prompt,
-            response_format=LearningRequirements
+            response_format=LearningRequirements,
+            cache=self.cache,
+            phase="requirements"
         )
         
-        return result.pydantic
+        return result
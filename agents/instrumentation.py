@@ -0,0 +1,184 @@
+# agents/instrumentation.py
+import json
+import os
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _NoopSpan:
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("owner", "kind", "name", "start")
+
+    def __init__(self, owner: "Instrumentation", kind: str, name: str):
+        self.owner = owner
+        self.kind = kind
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.owner.observe(self.kind, self.name, time.perf_counter() - self.start, error=exc_type is not None)
+        return False
+
+
+class Instrumentation:
+    """Process-wide timings and counters for phases, agent kickoffs and tool calls
+    
+    When disabled every hook reduces to a single attribute check.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._spans: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._gauges: Dict[Tuple[str, LabelKey], float] = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def span(self, kind: str, name: str) -> Any:
+        """Context manager timing one phase, kickoff or tool call"""
+        if not self.enabled:
+            return _NOOP
+        return _Span(self, kind, name)
+
+    def observe(self, kind: str, name: str, seconds: float, error: bool = False):
+        with self._lock:
+            stats = self._spans.get((kind, name))
+            if stats is None:
+                stats = self._spans[(kind, name)] = {"count": 0, "errors": 0, "total_seconds": 0.0,
+                                                     "max_seconds": 0.0}
+            stats["count"] += 1
+            stats["errors"] += int(error)
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def increment(self, metric: str, value: float = 1, **labels: str):
+        if not self.enabled:
+            return
+        key = (metric, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, metric: str, value: float, **labels: str):
+        if not self.enabled:
+            return
+        key = (metric, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    def record_kickoff(self, phase: str, agent: Any, result: Any):
+        """Token usage and iteration counts of one Agent.kickoff"""
+        if not self.enabled:
+            return
+        usage = getattr(result, "usage_metrics", None) or {}
+        for kind in ("prompt_tokens", "completion_tokens", "cached_prompt_tokens"):
+            if usage.get(kind):
+                self.increment("llm_tokens_total", usage[kind], phase=phase, type=kind.replace("_tokens", ""))
+        requests = usage.get("successful_requests")
+        if requests:
+            self.increment("llm_requests_total", requests, phase=phase)
+            max_iter = getattr(agent, "max_iter", None)
+            if max_iter:
+                self.increment("max_iter_budget_total", max_iter, phase=phase)
+
+    def report(self) -> Dict[str, Any]:
+        """Snapshot of all spans and counters as JSON-serialisable data"""
+        with self._lock:
+            spans: Dict[str, Dict[str, Any]] = {}
+            for (kind, name), stats in sorted(self._spans.items()):
+                entry = dict(stats)
+                entry["mean_seconds"] = stats["total_seconds"] / stats["count"] if stats["count"] else 0.0
+                spans.setdefault(kind, {})[name] = entry
+            counters = [{"metric": metric, "labels": dict(labels), "value": value}
+                        for (metric, labels), value in sorted(self._counters.items())]
+            gauges = [{"metric": metric, "labels": dict(labels), "value": value}
+                      for (metric, labels), value in sorted(self._gauges.items())]
+        return {"generated_at": time.time(), "spans": spans, "counters": counters, "gauges": gauges}
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        text = json.dumps(self.report(), indent=2)
+        if path:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(text)
+        return text
+
+    def to_prometheus(self, prefix: str = "course") -> str:
+        """Prometheus text exposition format of the current metrics"""
+        def escape(value: Any) -> str:
+            return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+        def labels(**values: Any) -> str:
+            return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in values.items()) + "}"
+
+        report = self.report()
+        lines = [
+            f"# HELP {prefix}_span_seconds Wall-clock time of phases, agent kickoffs and tool calls",
+            f"# TYPE {prefix}_span_seconds summary"
+        ]
+        for kind, names in report["spans"].items():
+            for name, stats in names.items():
+                tags = labels(kind=kind, name=name)
+                lines.append(f"{prefix}_span_seconds_count{tags} {stats['count']}")
+                lines.append(f"{prefix}_span_seconds_sum{tags} {stats['total_seconds']:.6f}")
+        lines.append(f"# HELP {prefix}_span_errors_total Spans that ended with an error")
+        lines.append(f"# TYPE {prefix}_span_errors_total counter")
+        for kind, names in report["spans"].items():
+            for name, stats in names.items():
+                lines.append(f"{prefix}_span_errors_total{labels(kind=kind, name=name)} {stats['errors']}")
+
+        declared = set()
+        for kind in ("counter", "gauge"):
+            for sample in report[f"{kind}s"]:
+                metric = f"{prefix}_{sample['metric']}"
+                if metric not in declared:
+                    declared.add(metric)
+                    lines.append(f"# TYPE {metric} {kind}")
+                lines.append(f"{metric}{labels(**sample['labels'])} {sample['value']}")
+        return "\n".join(lines) + "\n"
+
+
+instrumentation = Instrumentation(
+    enabled=os.getenv("COURSE_INSTRUMENTATION", "").lower() in ("1", "true", "yes")
+)
+
+
+def instrument_tool(run: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a tool's _run so calls are timed and error results are counted"""
+    @wraps(run)
+    def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        if not instrumentation.enabled:
+            return run(self, *args, **kwargs)
+        name = self.name
+        with instrumentation.span("tool", name):
+            result = run(self, *args, **kwargs)
+        if isinstance(result, dict) and result.get("status") == "error":
+            instrumentation.increment("tool_errors_total", tool=name)
+        return result
+    return wrapper
@@ -0,0 +1,102 @@
+# agents/kickoff.py
+import time
+from pydantic import BaseModel, ValidationError
+from typing import Any, Optional, Type, TypeVar, Union
+from agents.context import estimate_tokens
+from agents.instrumentation import instrumentation
+from agents.llm_scheduler import llm_scheduler
+from agents.phase_cache import PhaseCache
+from agents.prompts import Prompt, prefix_cache_stats
+from agents.repair import failing_fields, parse_output, partial_model, repair_prompt
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def model_name(agent: Any) -> str:
+    llm = getattr(agent, "llm", None)
+    return getattr(llm, "model", None) or str(llm)
+
+
+def kickoff_structured(agent: Any, prompt: Union[str, Prompt], response_format: Type[T],
+                       cache: Optional[PhaseCache] = None, phase: Optional[str] = None) -> T:
+    """Run an agent for a structured result, serving repeated calls from the phase cache"""
+    phase = phase or response_format.__name__
+    key = None
+    if cache is not None:
+        key = cache.key(str(prompt), model_name(agent), response_format)
+        cached = cache.get(key, response_format)
+        instrumentation.increment("phase_cache_total", phase=phase, result="hit" if cached is not None else "miss")
+        if cached is not None:
+            return cached
+
+    result = _kickoff(agent, prompt, response_format, phase)
+    value = result.pydantic
+    if value is None:
+        value = repair_structured(agent, prompt, response_format, result, phase)
+
+    if cache is not None and value is not None:
+        cache.set(key, value)
+    return value
+
+
+def _kickoff(agent: Any, prompt: Union[str, Prompt], response_format: Type[BaseModel], phase: str,
+             span: str = "kickoff") -> Any:
+    """One agent kickoff, admitted by the global LLM scheduler"""
+    text = str(prompt)
+    estimate = estimate_tokens(text) + llm_scheduler.completion_tokens
+    with llm_scheduler.slot(phase, estimate) as ticket:
+        with instrumentation.span(span, phase):
+            start = time.perf_counter()
+            result = agent.kickoff(
+                text,
+                response_format=response_format
+            )
+        if isinstance(prompt, Prompt):
+            prefix_cache_stats.record(prompt, result, time.perf_counter() - start)
+        ticket.actual_tokens = total_tokens(result) or None
+        ticket.actual_requests = (getattr(result, "usage_metrics", None) or {}).get("successful_requests")
+    instrumentation.record_kickoff(phase, agent, result)
+    return result
+
+
+def total_tokens(result: Any) -> int:
+    usage = getattr(result, "usage_metrics", None) or {}
+    return usage.get("total_tokens") or usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
+
+
+def repair_structured(agent: Any, prompt: Union[str, Prompt], response_format: Type[T], result: Any,
+                      phase: str, repair_attempts: int = 2) -> Optional[T]:
+    """Recover a structured result that failed validation
+    
+    The fields that parsed and validated are kept and the agent is asked for only the
+    missing or invalid ones, up to repair_attempts times. A full kickoff with the
+    original prompt is the last resort. Tokens saved are measured against the cost
+    of the original kickoff, which is what a full retry would have spent again.
+    """
+    full_cost = total_tokens(result)
+    data = parse_output(getattr(result, "raw", None))
+    spent = 0
+    if data is not None:
+        for _ in range(repair_attempts):
+            fields = tuple(failing_fields(response_format, data))
+            if not fields:
+                break
+            patch = _kickoff(agent, repair_prompt(response_format, fields, data),
+                             partial_model(response_format, fields), phase, span="repair")
+            spent += total_tokens(patch)
+            patched = patch.pydantic.model_dump() if patch.pydantic is not None else parse_output(patch.raw)
+            data.update({name: value for name, value in (patched or {}).items() if name in fields})
+        try:
+            value = response_format.model_validate(data)
+        except ValidationError:
+            value = None
+        if value is not None:
+            instrumentation.increment("structured_repair_total", phase=phase, outcome="repaired")
+            instrumentation.increment("repair_tokens_saved_total", max(full_cost - spent, 0), phase=phase)
+            return value
+
+    retry = _kickoff(agent, prompt, response_format, phase)
+    instrumentation.increment("structured_repair_total", phase=phase,
+                              outcome="retried" if retry.pydantic is not None else "failed")
+    instrumentation.increment("repair_tokens_spent_total", spent, phase=phase)
+    return retry.pydantic
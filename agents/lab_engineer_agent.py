@@ -1,10 +1,18 @@
 # agents/lab_engineer_agent.py
-from crewai import Agent
-from agents.tools.custom_tools import CloudProvisioningTool, SecurityPolicyTool, InfrastructureTool
+from agents.context import ContextProjector
+from agents.instrumentation import instrumentation
+from agents.kickoff import kickoff_structured
+from agents.pool import pooled_agent
+from agents.phase_cache import PhaseCache
+from agents.prompts import PromptTemplate
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
+import logging
+import re
 from .content_architect_agent import LearningBlueprint, LearningRequirements
 
+logger = logging.getLogger(__name__)
+
 class LabEnvironment(BaseModel):
     environment_type: str
     cloud_provider: str
@@ -16,8 +24,43 @@ class LabEnvironment(BaseModel):
     access_controls: Dict[str, str]
 
 class LabEngineerAgent:
-    def __init__(self):
-        self.lab_engineer = Agent(
+    # Fields of each upstream artifact that this phase's prompt actually needs (None = all)
+    CONTEXT_FIELDS = {
+        "blueprint": ["course_structure", "learning_objectives", "instructional_methods", "content_outline"],
+        "requirements": ["target_audience", "skill_level", "constraints"]
+    }
+    PROMPT = PromptTemplate("lab_environment", """
+        Design a hands-on lab environment from the learning blueprint and requirements below.
+        
+        Create a production-ready lab environment that includes:
+        1. Cloud infrastructure specifications
+        2. Security configurations and access controls
+        3. Cost optimization strategies
+        4. Automated setup and teardown procedures
+        5. Scalability considerations
+        6. Monitoring and logging setup
+        
+        Give resource_specifications per learner with cpu, memory and storage keys, and
+        take cost_estimates from CloudProvisioningTool rather than estimating them.
+        """, [("blueprint", "Learning Blueprint"), ("requirements", "Requirements")])
+
+    # Keys of LearningRequirements.constraints that state the expected number of concurrent learners
+    LEARNER_KEYS = ("concurrent_learners", "peak_learners", "max_learners", "concurrent_users",
+                    "cohort_size", "class_size", "seats")
+    COUNT = re.compile(r"\d{1,3}(?:,\d{3})+|\d+")
+
+    def __init__(self, cache: Optional[PhaseCache] = None, context: Optional[ContextProjector] = None,
+                 default_peak_learners: int = 100):
+        self.cache = cache
+        self.context = context or ContextProjector()
+        self.default_peak_learners = default_peak_learners
+
+    @pooled_agent
+    def lab_engineer(self):
+        from crewai import Agent
+        from agents.tools.custom_tools import CloudProvisioningTool, SecurityPolicyTool, InfrastructureTool
+        
+        return Agent(
             role="Technical Environment Specialist",
             goal="Design and provision secure, scalable lab environments for hands-on learning",
             backstory="""You are a cloud infrastructure expert with deep experience in 
@@ -45,24 +88,47 @@ class LabEngineerAgent:
     def design_lab_environment(self, blueprint: LearningBlueprint, 
                               requirements: LearningRequirements) -> LabEnvironment:
         """Design comprehensive lab environment"""
-        lab_prompt = f"""
-        Design a hands-on lab environment based on:
-        
-        Learning Blueprint: {blueprint.model_dump_json()}
-        Requirements: {requirements.model_dump_json()}
+        blueprint_context = self.context.project(blueprint, self.CONTEXT_FIELDS["blueprint"])
+        requirements_context = self.context.project(requirements, self.CONTEXT_FIELDS["requirements"])
+        lab_prompt = self.PROMPT.render(blueprint=blueprint_context.text, requirements=requirements_context.text)
+        self.context.record("lab_environment", lab_prompt.text, [blueprint_context, requirements_context])
         
-        Create a production-ready lab environment that includes:
-        1. Cloud infrastructure specifications
-        2. Security configurations and access controls
-        3. Cost optimization strategies
-        4. Automated setup and teardown procedures
-        5. Scalability considerations
-        6. Monitoring and logging setup
-        """
-        
-        result = self.lab_engineer.kickoff(
+        result = kickoff_structured(
+            self.lab_engineer,
             lab_prompt,
-            response_format=LabEnvironment
+            response_format=LabEnvironment,
+            cache=self.cache,
+            phase="lab_environment"
         )
         
-        return result.pydantic
+        if result is not None:
+            result.cost_estimates = self.ground_costs(result, requirements)
+        return result
+
+    def peak_learners(self, requirements: LearningRequirements) -> int:
+        """Expected concurrent learners stated in the requirements' constraints, or the default
+        
+        Only a bare count under one of LEARNER_KEYS counts, so "5 hours per week" or a
+        cohort start date never passes for a number of learners.
+        """
+        for key, value in (getattr(requirements, "constraints", None) or {}).items():
+            if re.sub(r"[\s-]+", "_", key.strip().lower()) not in self.LEARNER_KEYS:
+                continue
+            value = str(value).strip()
+            if self.COUNT.fullmatch(value) and int(value.replace(",", "")) > 0:
+                return int(value.replace(",", ""))
+        return self.default_peak_learners
+
+    def ground_costs(self, lab: LabEnvironment, requirements: LearningRequirements) -> Dict[str, float]:
+        """Replace the model's cost figures with the capacity planner's, keeping them if it cannot plan"""
+        from agents.tools.lab_capacity import plan_lab_capacity
+
+        try:
+            plan = plan_lab_capacity(lab.resource_specifications, peak_learners=self.peak_learners(requirements),
+                                     provider=lab.cloud_provider)
+        except (ValueError, TypeError) as e:
+            logger.warning("Keeping the model's cost estimates, capacity planning failed: %s", e)
+            instrumentation.increment("cost_grounding_total", outcome="failed")
+            return lab.cost_estimates
+        instrumentation.increment("cost_grounding_total", outcome="planned")
+        return plan["cost_estimates"]
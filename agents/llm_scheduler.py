@@ -0,0 +1,228 @@
+# agents/llm_scheduler.py
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+from agents.instrumentation import instrumentation
+
+# Lower runs first: phases closer to a finished course go ahead of new discovery work
+PHASE_PRIORITIES = {
+    "deployment_package": 0,
+    "qa_report": 1,
+    "content_assets": 2,
+    "lab_environment": 3,
+    "blueprint": 4,
+    "requirements": 5,
+}
+DEFAULT_PRIORITY = 3
+
+
+class LLMQueueFull(RuntimeError):
+    """The scheduler's queue stayed full (or the request waited) longer than the caller's timeout"""
+
+
+class TokenBucket:
+    """Refills at per_minute / 60 units per second up to burst; may go into debt when reconciled"""
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = burst or per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount is available; requests larger than the bucket wait for a full one"""
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        return 0.0 if self.level >= needed else (needed - self.level) / self.rate
+
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        self.level -= amount
+
+
+@dataclass
+class Ticket:
+    phase: str
+    priority: int
+    tokens: int
+    enqueued: float
+    seq: int
+    started: Optional[float] = None
+    # Filled in by the caller once the response's usage is known
+    actual_tokens: Optional[int] = None
+    actual_requests: Optional[int] = None
+
+
+@dataclass
+class _WaitStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+class LLMScheduler:
+    """Process-wide admission control for LLM kickoffs
+
+    Requests wait in one queue ordered by phase priority, with aging so that low
+    priority work is not starved, and are admitted when the concurrency cap and the
+    requests-per-minute and tokens-per-minute buckets allow. Token and request
+    estimates are reconciled against actual usage when a kickoff finishes. With
+    max_queue set, callers block (backpressure) while the queue is full.
+    """
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                 max_concurrency: Optional[int] = None, max_queue: Optional[int] = None,
+                 priorities: Optional[Dict[str, int]] = None, aging: float = 30.0,
+                 completion_tokens: int = 1000):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.priorities = priorities or PHASE_PRIORITIES
+        self.aging = aging
+        self.completion_tokens = completion_tokens
+        self._cond = threading.Condition()
+        self._queue: List[Ticket] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self.max_queue_depth = 0
+        self.rejected = 0
+        self._waits: Dict[str, _WaitStats] = {}
+
+    @classmethod
+    def from_env(cls) -> "LLMScheduler":
+        """Build a scheduler from the LLM_* environment variables; unset limits are not enforced"""
+        def number(name: str) -> Optional[float]:
+            value = os.getenv(name)
+            return float(value) if value else None
+
+        concurrency, queue = number("LLM_MAX_CONCURRENCY"), number("LLM_MAX_QUEUE")
+        return cls(
+            rpm=number("LLM_RPM"),
+            tpm=number("LLM_TPM"),
+            max_concurrency=int(concurrency) if concurrency else None,
+            max_queue=int(queue) if queue else None
+        )
+
+    def _effective_priority(self, ticket: Ticket, now: float) -> float:
+        return ticket.priority - (now - ticket.enqueued) / self.aging
+
+    def _delay(self, ticket: Ticket, now: float) -> Optional[float]:
+        """0 when ticket can start now, seconds until the buckets allow it, None when it must wait for a release"""
+        head = min(self._queue, key=lambda queued: (self._effective_priority(queued, now), queued.seq))
+        if head is not ticket:
+            return None
+        if self.max_concurrency is not None and self._in_flight >= self.max_concurrency:
+            return None
+        delay = 0.0
+        if self.requests is not None:
+            delay = max(delay, self.requests.wait_time(1, now))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.wait_time(ticket.tokens, now))
+        return delay
+
+    def _publish(self):
+        instrumentation.set_gauge("llm_queue_depth", len(self._queue))
+        instrumentation.set_gauge("llm_in_flight", self._in_flight)
+
+    def _reject(self, phase: str, reason: str):
+        self.rejected += 1
+        instrumentation.increment("llm_queue_rejected_total", phase=phase)
+        raise LLMQueueFull(reason)
+
+    def acquire(self, phase: str, tokens: int = 0, timeout: Optional[float] = None) -> Ticket:
+        """Block until a kickoff of phase with an estimated token count may start"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self.max_queue is not None and len(self._queue) >= self.max_queue:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._reject(phase, f"LLM queue full ({self.max_queue} waiting)")
+                self._cond.wait(remaining)
+
+            ticket = Ticket(phase, self.priorities.get(phase, DEFAULT_PRIORITY), tokens,
+                            time.monotonic(), next(self._seq))
+            self._queue.append(ticket)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+            self._publish()
+            while True:
+                now = time.monotonic()
+                delay = self._delay(ticket, now)
+                if delay == 0.0:
+                    break
+                # Aging can promote a waiter without any release, so never sleep indefinitely
+                wait = min(delay or 0.5, 0.5)
+                if deadline is not None:
+                    if deadline <= now:
+                        self._queue.remove(ticket)
+                        self._publish()
+                        self._cond.notify_all()
+                        self._reject(phase, f"waited {timeout}s for an LLM slot")
+                    wait = min(wait, deadline - now)
+                self._cond.wait(wait)
+
+            self._queue.remove(ticket)
+            self._in_flight += 1
+            if self.requests is not None:
+                self.requests.consume(1, now)
+            if self.tokens is not None:
+                self.tokens.consume(tokens, now)
+            ticket.started = now
+            self._record_wait(phase, now - ticket.enqueued)
+            self._publish()
+            # The next ticket in line may be admissible as well
+            self._cond.notify_all()
+        return ticket
+
+    def release(self, ticket: Ticket):
+        """Free the ticket's slot and charge the buckets for any usage beyond the estimate"""
+        with self._cond:
+            now = time.monotonic()
+            if self.tokens is not None and ticket.actual_tokens is not None:
+                self.tokens.consume(ticket.actual_tokens - ticket.tokens, now)
+            if self.requests is not None and ticket.actual_requests:
+                self.requests.consume(ticket.actual_requests - 1, now)
+            self._in_flight -= 1
+            self._publish()
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, phase: str, tokens: int = 0, timeout: Optional[float] = None) -> Iterator[Ticket]:
+        ticket = self.acquire(phase, tokens, timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def _record_wait(self, phase: str, seconds: float):
+        stats = self._waits.setdefault(phase, _WaitStats())
+        stats.count += 1
+        stats.total_seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        if instrumentation.enabled:
+            instrumentation.observe("llm_queue", phase, seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, in-flight count and per-phase wait times"""
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self.max_queue_depth,
+                "in_flight": self._in_flight,
+                "rejected": self.rejected,
+                "waits": {phase: {"count": stats.count, "total_seconds": stats.total_seconds,
+                                  "mean_seconds": stats.total_seconds / stats.count,
+                                  "max_seconds": stats.max_seconds}
+                          for phase, stats in sorted(self._waits.items())},
+            }
+
+
+llm_scheduler = LLMScheduler.from_env()
@@ -0,0 +1,129 @@
+# agents/phase_cache.py
+import hashlib
+import json
+import os
+import tempfile
+import time
+from functools import lru_cache
+from pydantic import BaseModel, ValidationError
+from typing import Optional, Type, TypeVar
+
+T = TypeVar("T", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _schema_json(response_format: Type[BaseModel]) -> str:
+    return json.dumps(response_format.model_json_schema(), sort_keys=True)
+
+
+class PhaseCache:
+    """Content-addressed on-disk cache of validated phase outputs
+    
+    Entries are keyed on the prompt, the model and the response_format schema. The
+    cache is bounded by total size with least-recently-used eviction, entries older
+    than ttl seconds are ignored, and bypass skips lookups while still refreshing
+    the stored result.
+    """
+
+    def __init__(self, directory: str = ".phase_cache", max_bytes: int = 256 * 1024 * 1024,
+                 ttl: Optional[float] = None, bypass: bool = False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "PhaseCache":
+        """Build a cache from the PHASE_CACHE_* environment variables"""
+        ttl = os.getenv("PHASE_CACHE_TTL")
+        return cls(
+            directory=os.getenv("PHASE_CACHE_DIR", ".phase_cache"),
+            max_bytes=int(float(os.getenv("PHASE_CACHE_MAX_MB", "256")) * 1024 * 1024),
+            ttl=float(ttl) if ttl else None,
+            bypass=os.getenv("PHASE_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+        )
+
+    def key(self, prompt: str, model: str, response_format: Type[BaseModel]) -> str:
+        digest = hashlib.sha256()
+        for part in (model, _schema_json(response_format), prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str, response_format: Type[T]) -> Optional[T]:
+        """Return the cached result for key, or None on a miss"""
+        if self.bypass:
+            self.misses += 1
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+            if self.ttl is not None and time.time() - entry["created"] > self.ttl:
+                os.remove(path)
+                raise FileNotFoundError(path)
+            value = response_format.model_validate(entry["data"])
+        except (OSError, ValueError, KeyError, ValidationError):
+            self.misses += 1
+            return None
+
+        # The file mtime doubles as the last-access time for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: BaseModel):
+        """Store a validated result and evict old entries beyond max_bytes"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {"created": time.time(), "data": value.model_dump(mode="json")}
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(entry, file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    os.remove(os.path.join(root, name))
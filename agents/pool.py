@@ -0,0 +1,81 @@
+# agents/pool.py
+import threading
+from contextlib import contextmanager
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class AgentPool:
+    """Process-wide pool of built crewai agents, shared by every crew in the process"""
+
+    def __init__(self):
+        self._idle: Dict[str, List[Any]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self.built: Counter = Counter()
+        self.reused: Counter = Counter()
+        self.factory: Optional[Callable[[str, Callable[[], Any]], Any]] = None
+
+    def acquire(self, key: str, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            if self._idle[key]:
+                self.reused[key] += 1
+                return self._idle[key].pop()
+            self.built[key] += 1
+            factory = self.factory
+        return factory(key, build) if factory else build()
+
+    def use_factory(self, factory: Optional[Callable[[str, Callable[[], Any]], Any]]):
+        """Route new agent builds through factory(key, build), e.g. to substitute offline fakes"""
+        with self._lock:
+            self.factory = factory
+            self._idle.clear()
+
+    def release(self, key: str, agent: Any):
+        with self._lock:
+            self._idle[key].append(agent)
+
+    def clear(self):
+        with self._lock:
+            self._idle.clear()
+
+
+agent_pool = AgentPool()
+
+
+class pooled_agent:
+    """Build the decorated crewai Agent on first access, reusing an idle pooled one if available"""
+
+    def __init__(self, build: Callable[[Any], Any]):
+        self.build = build
+        self.key = f"{build.__module__}.{build.__qualname__}"
+        self.__doc__ = build.__doc__
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+        agent = agent_pool.acquire(self.key, lambda: self.build(instance))
+        # Cached on the instance so later lookups skip the descriptor entirely
+        instance.__dict__[self.name] = agent
+        return agent
+
+
+def release_agents(wrapper: Any):
+    """Return the crewai agents a wrapper has built to the pool for use by another crew"""
+    for cls in type(wrapper).__mro__:
+        for name, attr in vars(cls).items():
+            if isinstance(attr, pooled_agent) and name in wrapper.__dict__:
+                agent_pool.release(attr.key, wrapper.__dict__.pop(name))
+
+
+@contextmanager
+def borrowed_agent(wrapper: Any, name: str) -> Iterator[Any]:
+    """Check out an extra agent of the kind wrapper.<name> builds, for concurrent kickoffs"""
+    descriptor = vars(type(wrapper))[name]
+    agent = agent_pool.acquire(descriptor.key, lambda: descriptor.build(wrapper))
+    try:
+        yield agent
+    finally:
+        agent_pool.release(descriptor.key, agent)
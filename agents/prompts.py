@@ -0,0 +1,108 @@
+# agents/prompts.py
+"""Prompt templates laid out for provider-side prefix caching
+
+Providers reuse the work done on the longest prompt prefix they have seen recently
+(OpenAI from 1024 tokens, in 128-token steps). crewai sends each agent's role,
+backstory, tools and response schema as the system message ahead of our prompt, so
+a template keeps its fixed instructions next, and the per-course data last in a
+fixed order. Every call of a phase then shares the whole system message and the
+instructions as one cacheable prefix.
+"""
+import textwrap
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Sequence, Tuple
+
+from agents.instrumentation import instrumentation
+
+
+@dataclass(frozen=True)
+class Prompt:
+    template: str
+    prefix: str
+    text: str
+
+    def __str__(self) -> str:
+        return self.text
+
+
+class PromptTemplate:
+    """Fixed instructions followed by labelled data blocks
+
+    The instructions are dedented and joined with the block labels once, when the
+    template is built, so render only concatenates the per-call values.
+    """
+
+    def __init__(self, name: str, instructions: str, blocks: Sequence[Tuple[str, str]]):
+        self.name = name
+        self.blocks = tuple(blocks)
+        self.prefix = textwrap.dedent(instructions).strip() + "\n\n"
+        self._labels = {key: f"{label}: " for key, label in self.blocks}
+
+    def render(self, **values: Any) -> Prompt:
+        """Prompt with each block's value in template order; None values are left out"""
+        unknown = set(values) - set(self._labels)
+        if unknown:
+            raise ValueError(f"Prompt template '{self.name}' has no blocks {sorted(unknown)}")
+        parts = [self.prefix]
+        for key, _ in self.blocks:
+            value = values.get(key)
+            if value is not None:
+                parts.append(f"{self._labels[key]}{value}\n")
+        return Prompt(self.name, self.prefix, "".join(parts))
+
+
+class PrefixCacheStats:
+    """Provider prefix-cache hits and latency per prompt template
+
+    A kickoff counts as a hit when the provider reports cached prompt tokens. Latency
+    saved is the difference between the mean latency of misses and of hits,
+    multiplied by the number of hits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, prompt: Prompt, result: Any, seconds: float):
+        usage = getattr(result, "usage_metrics", None) or {}
+        cached = usage.get("cached_prompt_tokens") or 0
+        outcome = "hit" if cached else "miss"
+        with self._lock:
+            stats = self._stats.setdefault(prompt.template, {
+                "calls": 0, "hits": 0, "prompt_tokens": 0, "cached_tokens": 0,
+                "hit_seconds": 0.0, "miss_seconds": 0.0})
+            stats["calls"] += 1
+            stats["hits"] += bool(cached)
+            stats["prompt_tokens"] += usage.get("prompt_tokens") or 0
+            stats["cached_tokens"] += cached
+            stats[f"{outcome}_seconds"] += seconds
+        instrumentation.increment("prompt_prefix_cache_total", template=prompt.template, result=outcome)
+        if cached:
+            instrumentation.increment("prompt_cached_tokens_total", cached, template=prompt.template)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            report = {}
+            for name, stats in sorted(self._stats.items()):
+                hits, misses = stats["hits"], stats["calls"] - stats["hits"]
+                hit_latency = stats["hit_seconds"] / hits if hits else None
+                miss_latency = stats["miss_seconds"] / misses if misses else None
+                saved = (miss_latency - hit_latency) * hits if hits and misses else None
+                report[name] = {
+                    "calls": stats["calls"],
+                    "hit_rate": round(hits / stats["calls"], 4),
+                    "cached_token_share": round(stats["cached_tokens"] / stats["prompt_tokens"], 4)
+                    if stats["prompt_tokens"] else 0.0,
+                    "mean_hit_seconds": hit_latency,
+                    "mean_miss_seconds": miss_latency,
+                    "latency_saved_seconds": saved,
+                }
+        return report
+
+
+prefix_cache_stats = PrefixCacheStats()
@@ -1,8 +1,15 @@
 # agents/quality_assurance_agent.py
-from crewai import Agent
-from agents.tools.custom_tools import AutomatedTestingTool, AccessibilityTool, LearnerSimulationTool
+from agents.context import ContextProjector
+from agents.kickoff import kickoff_structured
+from agents.pool import pooled_agent
+from agents.phase_cache import PhaseCache
+from agents.prompts import PromptTemplate
+from agents.tools.accessibility import check_accessibility
+from agents.tools.script_runner import ScriptRunner, collect_scripts, script_details, technical_validation
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
+import json
+from .content_architect_agent import LearningBlueprint
 from .content_creation_agent import ContentAssets
 from .lab_engineer_agent import LabEnvironment  
 
@@ -13,10 +20,49 @@ class QualityReport(BaseModel):
     user_experience_feedback: Dict[str, str]
     performance_metrics: Dict[str, float]
     recommended_improvements: List[str]
+    # Filled in after the kickoff and read by no later phase, so timings never reach a prompt
+    script_runs: Dict[str, str] = {}
 
 class QualityAssuranceAgent:
-    def __init__(self):
-        self.qa_agent = Agent(
+    # Fields of each upstream artifact that this phase's prompt actually needs (None = all)
+    CONTEXT_FIELDS = {
+        "content_assets": None,
+        "lab_environment": ["environment_type", "cloud_provider", "resource_specifications",
+                            "security_configuration", "setup_scripts", "teardown_procedures",
+                            "access_controls"],
+        "blueprint": ["course_structure"]
+    }
+    PROMPT = PromptTemplate("quality_assurance", """
+        Conduct comprehensive quality assurance testing on the content assets and lab environment below.
+        
+        Perform testing that includes:
+        1. Technical validation of all lab components, starting from the script results below
+        2. Content accuracy and alignment verification
+        3. Fixes for the accessibility pre-check findings below
+        4. User experience evaluation
+        5. Performance and scalability testing
+        6. Recommendations for improvement
+        
+        Base performance metrics on LearnerSimulationTool runs over the course structure.
+        Accessibility has already been checked deterministically; do not re-assess it.
+        """, [("content", "Content Assets"), ("lab", "Lab Environment"), ("structure", "Course Structure"),
+              ("findings", "Accessibility Findings"), ("scripts", "Script Results")])
+
+    def __init__(self, cache: Optional[PhaseCache] = None, context: Optional[ContextProjector] = None,
+                 simulated_learners: int = 100_000, max_accessibility_findings: int = 30,
+                 script_runner: Optional[ScriptRunner] = None):
+        self.cache = cache
+        self.context = context or ContextProjector()
+        self.simulated_learners = simulated_learners
+        self.max_accessibility_findings = max_accessibility_findings
+        self.script_runner = script_runner or ScriptRunner.from_env()
+
+    @pooled_agent
+    def qa_agent(self):
+        from crewai import Agent
+        from agents.tools.custom_tools import AutomatedTestingTool, AccessibilityTool, LearnerSimulationTool
+        
+        return Agent(
             role="Testing and Validation Specialist",
             goal="Execute comprehensive testing and validation of learning content and environments",
             backstory="""You are a quality assurance expert with specialized experience 
@@ -41,26 +87,52 @@ class QualityAssuranceAgent:
         return self.qa_agent
 
     def execute_quality_assurance(self, content_assets: ContentAssets, 
-                                 lab_environment: LabEnvironment) -> QualityReport:
+                                 lab_environment: LabEnvironment,
+                                 blueprint: Optional[LearningBlueprint] = None) -> QualityReport:
         """Execute comprehensive QA process"""
-        qa_prompt = f"""
-        Conduct comprehensive quality assurance testing on:
+        accessibility = check_accessibility(content_assets)
+        scripts = self.script_runner.run(collect_scripts(lab_environment, content_assets))
+        validation = technical_validation(scripts, self.script_runner.mode)
+        findings = json.dumps(accessibility.as_dict(self.max_accessibility_findings))
+        content = self.context.project(content_assets, self.CONTEXT_FIELDS["content_assets"])
+        lab = self.context.project(lab_environment, self.CONTEXT_FIELDS["lab_environment"])
+        projections = [content, lab]
+        structure = None
+        if blueprint is not None:
+            course = self.context.project(blueprint, self.CONTEXT_FIELDS["blueprint"])
+            projections.append(course)
+            structure = course.text
+        qa_prompt = self.PROMPT.render(content=content.text, lab=lab.text, structure=structure,
+                                       findings=findings, scripts=json.dumps(validation))
+        self.context.record("quality_assurance", qa_prompt.text, projections)
         
-        Content Assets: {content_assets.model_dump_json()}
-        Lab Environment: {lab_environment.model_dump_json()}
-        
-        Perform testing that includes:
-        1. Technical validation of all lab components
-        2. Content accuracy and alignment verification
-        3. Accessibility compliance assessment
-        4. User experience evaluation
-        5. Performance and scalability testing
-        6. Recommendations for improvement
-        """
-        
-        result = self.qa_agent.kickoff(
+        result = kickoff_structured(
+            self.qa_agent,
             qa_prompt,
-            response_format=QualityReport
+            response_format=QualityReport,
+            cache=self.cache,
+            phase="qa_report"
         )
         
-        return result.pydantic
+        if result is not None:
+            result.accessibility_compliance = accessibility.compliance()
+            result.technical_validation.update(validation)
+            result.script_runs = script_details(scripts)
+        if result is not None and blueprint is not None and blueprint.course_structure:
+            result.performance_metrics.update(self.simulated_metrics(blueprint))
+        return result
+
+    def simulated_metrics(self, blueprint: LearningBlueprint) -> Dict[str, float]:
+        """Performance metrics from a learner simulation of the blueprint's course structure"""
+        from agents.tools.learner_simulation import simulate_learners
+
+        report = simulate_learners(blueprint.course_structure, learners=self.simulated_learners)
+        metrics = {
+            "simulated_completion_rate": report["completion_rate"],
+            "simulated_dropout_rate": report["dropout_rate"],
+            "simulated_peak_concurrent_lab_learners": float(report["peak_concurrent_lab_learners"]),
+        }
+        for percentile in ("p50", "p90", "p99"):
+            metrics[f"simulated_completion_hours_{percentile}"] = report["completion_hours"][percentile]
+            metrics[f"simulated_completion_days_{percentile}"] = report["completion_days"][percentile]
+        return metrics
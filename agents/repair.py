@@ -0,0 +1,62 @@
+# agents/repair.py
+import json
+import re
+from functools import lru_cache
+from pydantic import BaseModel, ValidationError, create_model
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+# Accepted fields are quoted only up to this length to keep repair prompts small
+MAX_CONTEXT_CHARS = 2000
+
+
+def parse_output(raw: Optional[str]) -> Optional[Dict[str, Any]]:
+    """The JSON object in an agent's raw output, tolerating code fences and surrounding prose"""
+    if not raw:
+        return None
+    text = _FENCE.sub("", raw.strip())
+    candidates = [text]
+    start, end = text.find("{"), text.rfind("}")
+    if 0 <= start < end:
+        candidates.append(text[start:end + 1])
+    for candidate in candidates:
+        try:
+            data = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+def failing_fields(response_format: Type[BaseModel], data: Dict[str, Any]) -> List[str]:
+    """Top-level fields of data that are missing or invalid, in schema order"""
+    try:
+        response_format.model_validate(data)
+        return []
+    except ValidationError as e:
+        failing = {error["loc"][0] for error in e.errors() if error["loc"]}
+    return [name for name in response_format.model_fields if name in failing]
+
+
+@lru_cache(maxsize=None)
+def partial_model(response_format: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """A model holding only the given fields of response_format"""
+    definitions = {name: (response_format.model_fields[name].annotation, response_format.model_fields[name])
+                   for name in fields}
+    return create_model(f"{response_format.__name__}Repair", **definitions)
+
+
+def repair_prompt(response_format: Type[BaseModel], fields: Tuple[str, ...],
+                  data: Dict[str, Any]) -> str:
+    """Minimal prompt asking only for the fields that failed validation"""
+    valid = json.dumps({name: value for name, value in data.items()
+                        if name in response_format.model_fields and name not in fields}, default=str)
+    if len(valid) > MAX_CONTEXT_CHARS:
+        valid = valid[:MAX_CONTEXT_CHARS] + "..."
+    schema = json.dumps(partial_model(response_format, fields).model_json_schema())
+    return (
+        f"Your previous {response_format.__name__} was incomplete. "
+        f"Provide only the fields {', '.join(fields)} as JSON matching this schema:\n{schema}\n"
+        f"They must be consistent with the fields already accepted:\n{valid}"
+    )
@@ -0,0 +1,173 @@
+# agents/tools/accessibility.py
+"""Deterministic accessibility pre-check of ContentAssets
+
+Every asset is scanned once by all rules: missing alt text, heading order, reading
+level, declared colour contrast and, for video scripts, transcript presence.
+The rules are cheap regex scans, so they run inline on the calling (QA) thread.
+"""
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+RULES = ("missing_alt_text", "heading_order", "reading_level", "colour_contrast", "missing_transcript")
+
+_MD_IMAGE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_HTML_IMAGE = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+_ALT_ATTR = re.compile(r"\balt\s*=\s*(\"([^\"]*)\"|'([^']*)')", re.IGNORECASE)
+# Markdown and HTML headings in one pattern, so finditer yields them in document order
+_HEADING = re.compile(r"^(#{1,6})\s+\S|<h([1-6])\b", re.MULTILINE | re.IGNORECASE)
+_WORD = re.compile(r"[A-Za-z]+(?:'[a-z]+)?")
+_SENTENCE = re.compile(r"[.!?]+(?:\s|$)")
+_VOWELS = re.compile(r"[aeiouy]+", re.IGNORECASE)
+_SILENT_E = re.compile(r"[^aeiouy\W]e\b", re.IGNORECASE)
+_COLOUR = re.compile(r"(?<![\w-])(background(?:-color)?|color|colour|foreground)\s*[:=]\s*"
+                     r"(#[0-9a-f]{6}\b|#[0-9a-f]{3}\b|rgb\(\s*\d+\s*,\s*\d+\s*,\s*\d+\s*\))", re.IGNORECASE)
+_IMAGE_KEYS = ("image", "diagram", "figure", "screenshot", "illustration")
+_ALT_KEYS = ("alt", "alt_text", "description", "caption")
+_TRANSCRIPT_KEYS = ("transcript", "captions", "subtitles")
+
+
+@dataclass
+class Finding:
+    section: str
+    index: int
+    title: str
+    rule: str
+    message: str
+
+
+@dataclass
+class AccessibilityReport:
+    items_checked: int
+    findings: List[Finding] = field(default_factory=list)
+
+    def counts(self) -> Dict[str, int]:
+        counts = Counter(finding.rule for finding in self.findings)
+        return {rule: counts.get(rule, 0) for rule in RULES}
+
+    @property
+    def passed(self) -> bool:
+        return not self.findings
+
+    def compliance(self) -> Dict[str, str]:
+        """Summary in the shape of QualityReport.accessibility_compliance"""
+        summary = {"status": "pass" if self.passed else "fail", "items_checked": str(self.items_checked)}
+        for rule, count in self.counts().items():
+            summary[rule] = "pass" if count == 0 else f"{count} finding(s)"
+        return summary
+
+    def as_dict(self, max_findings: Optional[int] = None) -> Dict[str, Any]:
+        findings = self.findings if max_findings is None else self.findings[:max_findings]
+        return {
+            "items_checked": self.items_checked,
+            "passed": self.passed,
+            "counts": self.counts(),
+            "findings": [asdict(finding) for finding in findings],
+            "findings_omitted": len(self.findings) - len(findings),
+        }
+
+
+def _hex_or_rgb(value: str) -> Tuple[float, float, float]:
+    value = value.strip().lower()
+    if value.startswith("rgb"):
+        return tuple(int(part) / 255 for part in re.findall(r"\d+", value)[:3])
+    digits = value[1:]
+    if len(digits) == 3:
+        digits = "".join(ch * 2 for ch in digits)
+    return tuple(int(digits[i:i + 2], 16) / 255 for i in (0, 2, 4))
+
+
+def _luminance(rgb: Tuple[float, float, float]) -> float:
+    linear = [c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4 for c in rgb]
+    return 0.2126 * linear[0] + 0.7152 * linear[1] + 0.0722 * linear[2]
+
+
+def contrast_ratio(foreground: str, background: str) -> float:
+    """WCAG 2 contrast ratio of two CSS colours (#rgb, #rrggbb or rgb())"""
+    lighter, darker = sorted((_luminance(_hex_or_rgb(foreground)), _luminance(_hex_or_rgb(background))),
+                             reverse=True)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def reading_grade(text: str) -> Tuple[float, int]:
+    """Flesch-Kincaid grade level and word count of text"""
+    words = _WORD.findall(text)
+    if not words:
+        return 0.0, 0
+    sentences = max(len(_SENTENCE.findall(text)), 1)
+    # Vowel groups approximate syllables; a trailing silent e is not one
+    syllables = max(len(_VOWELS.findall(text)) - len(_SILENT_E.findall(text)), len(words))
+    return 0.39 * len(words) / sentences + 11.8 * syllables / len(words) - 15.59, len(words)
+
+
+class AccessibilityChecker:
+    """Rules engine over content assets; thresholds follow WCAG 2.1 AA by default"""
+
+    def __init__(self, max_grade: float = 12.0, min_contrast: float = 4.5, min_words: int = 100):
+        self.max_grade = max_grade
+        self.min_contrast = min_contrast
+        self.min_words = min_words
+
+    @staticmethod
+    def _items(content_assets: Union[BaseModel, Dict[str, Any]]) -> List[Tuple[str, int, Dict[str, str]]]:
+        sections = content_assets.model_dump() if isinstance(content_assets, BaseModel) else content_assets
+        return [(section, index, item) for section, items in sections.items()
+                for index, item in enumerate(items or [])]
+
+    def check(self, content_assets: Union[BaseModel, Dict[str, Any]]) -> AccessibilityReport:
+        items = self._items(content_assets)
+        return AccessibilityReport(len(items), self.check_items(items))
+
+    def check_items(self, items: List[Tuple[str, int, Dict[str, str]]]) -> List[Finding]:
+        return [finding for section, index, item in items for finding in self.check_item(section, index, item)]
+
+    def check_item(self, section: str, index: int, item: Dict[str, str]) -> Iterator[Finding]:
+        """All rule violations of one asset"""
+        title = str(item.get("title") or item.get("name") or f"{section}[{index}]")
+        keys = {key.lower(): str(value) for key, value in item.items()}
+        text = "\n".join(keys.values())
+
+        def finding(rule: str, message: str) -> Finding:
+            return Finding(section, index, title, rule, message)
+
+        missing_alt = sum(1 for alt in _MD_IMAGE.findall(text) if not alt.strip())
+        for tag in _HTML_IMAGE.findall(text):
+            match = _ALT_ATTR.search(tag)
+            if not match or not (match.group(2) or match.group(3) or "").strip():
+                missing_alt += 1
+        has_alt_field = any(keys.get(key, "").strip() for key in _ALT_KEYS)
+        if not has_alt_field:
+            missing_alt += sum(1 for key in keys if any(word in key for word in _IMAGE_KEYS) and keys[key].strip())
+        if missing_alt:
+            yield finding("missing_alt_text", f"{missing_alt} image(s) without alternative text")
+
+        levels = [len(match.group(1)) if match.group(1) else int(match.group(2))
+                  for match in _HEADING.finditer(text)]
+        for previous, level in zip(levels, levels[1:]):
+            if level > previous + 1:
+                yield finding("heading_order", f"heading level jumps from h{previous} to h{level}")
+                break
+
+        grade, words = reading_grade(text)
+        if words >= self.min_words and grade > self.max_grade:
+            yield finding("reading_level", f"reading grade {grade:.1f} exceeds {self.max_grade:g}")
+
+        colours: Dict[str, str] = {}
+        for prop, value in _COLOUR.findall(text):
+            colours["background" if prop.lower().startswith("background") else "foreground"] = value
+        if len(colours) == 2:
+            ratio = contrast_ratio(colours["foreground"], colours["background"])
+            if ratio < self.min_contrast:
+                yield finding("colour_contrast", f"contrast ratio {ratio:.2f}:1 is below {self.min_contrast:g}:1")
+
+        if section == "video_scripts" and not any(
+                keys.get(key, "").strip() for key in keys if any(word in key for word in _TRANSCRIPT_KEYS)):
+            yield finding("missing_transcript", "video script has no transcript or captions")
+
+
+def check_accessibility(content_assets: Union[BaseModel, Dict[str, Any]],
+                        checker: Optional[AccessibilityChecker] = None) -> AccessibilityReport:
+    return (checker or AccessibilityChecker()).check(content_assets)
@@ -1,11 +1,36 @@
 # tools/custom_tools.py
+import json
+import os
+from dataclasses import asdict
 from crewai.tools import BaseTool
-from typing import Dict, List, Any
-
-class BloomsTaxonomyTool(BaseTool):
+from typing import Dict, List, Any, Optional
+from agents.instrumentation import instrument_tool
+from agents.tools.accessibility import check_accessibility
+from agents.tools.document_index import get_index
+from agents.tools.file_reader import ChunkedFileReader, DEFAULT_MAX_BYTES
+from agents.tools.lab_capacity import plan_lab_capacity
+from agents.tools.learner_simulation import simulate_learners
+from agents.tools.scorm_packager import ScormPackager
+from agents.tools.script_runner import ScriptRunner, collect_scripts, technical_validation
+from agents.tools.tool_cache import memoize_tool
+from agents.tools.xapi_analytics import get_engine
+
+class CourseTool(BaseTool):
+    """Base class for the custom tools; every _run is timed by the instrumentation layer
+
+    Deterministic tools opt in to result memoization by decorating _run with memoize_tool.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "_run" in cls.__dict__:
+            cls._run = instrument_tool(cls.__dict__["_run"])
+
+class BloomsTaxonomyTool(CourseTool):
     name: str = "BloomsTaxonomyTool"
     description: str = "Tool for creating learning objectives using Bloom's Taxonomy levels"
 
+    @memoize_tool
     def _run(self, topic: str, level: str = "Apply") -> Dict[str, Any]:
         """Create learning objectives using Bloom's Taxonomy"""
         return {
@@ -14,10 +39,11 @@ class BloomsTaxonomyTool(BaseTool):
             "objectives": f"Learning objectives for {topic} at {level} level"
         }
 
-class CurriculumMappingTool(BaseTool):
+class CurriculumMappingTool(CourseTool):
     name: str = "CurriculumMappingTool"
     description: str = "Tool for mapping curriculum and creating course structures"
 
+    @memoize_tool
     def _run(self, subject: str, duration: str = "8 weeks") -> Dict[str, Any]:
         """Map curriculum and create course structure"""
         return {
@@ -26,28 +52,57 @@ class CurriculumMappingTool(BaseTool):
             "structure": f"Curriculum structure for {subject} over {duration}"
         }
 
-class FileReadTool(BaseTool):
+class FileReadTool(CourseTool):
     name: str = "FileReadTool"
-    description: str = "Tool for reading and analyzing file contents"
-
-    def _run(self, file_path: str) -> Dict[str, Any]:
+    description: str = (
+        "Tool for reading and analyzing file contents. Large files are returned in chunks: "
+        "pass offset/length (bytes) or start_line/end_line (1-based, inclusive) to read a range, "
+        "and the continuation_token from a truncated result to read the next chunk"
+    )
+    max_bytes: int = DEFAULT_MAX_BYTES
+
+    def _run(self, file_path: str, offset: Optional[int] = None, length: Optional[int] = None,
+             start_line: Optional[int] = None, end_line: Optional[int] = None,
+             continuation_token: Optional[str] = None) -> Dict[str, Any]:
         """Read and analyze file contents"""
         try:
-            with open(file_path, 'r') as file:
-                content = file.read()
+            return ChunkedFileReader(self.max_bytes).read(
+                file_path, offset=offset, length=length, start_line=start_line,
+                end_line=end_line, continuation_token=continuation_token
+            )
+        except Exception as e:
             return {
                 "file_path": file_path,
-                "content": content,
+                "error": str(e),
+                "status": "error"
+            }
+
+class DocumentSearchTool(CourseTool):
+    name: str = "DocumentSearchTool"
+    description: str = (
+        "Tool for searching local stakeholder documents. Returns the passages most relevant "
+        "to a query instead of whole files"
+    )
+    documents_dir: str = os.getenv("STAKEHOLDER_DOCS_DIR", "documents")
+
+    def _run(self, query: str, top_k: int = 5) -> Dict[str, Any]:
+        """Search indexed documents with BM25"""
+        try:
+            index = get_index(self.documents_dir)
+            index.refresh_if_stale()
+            return {
+                "query": query,
+                "results": index.search(query, top_k),
                 "status": "success"
             }
         except Exception as e:
             return {
-                "file_path": file_path,
+                "query": query,
                 "error": str(e),
                 "status": "error"
             }
 
-class ContentGenerationTool(BaseTool):
+class ContentGenerationTool(CourseTool):
     name: str = "ContentGenerationTool"
     description: str = "Tool for generating instructional content"
 
@@ -59,7 +114,7 @@ class ContentGenerationTool(BaseTool):
             "content": f"Generated {content_type} content"
         }
 
-class MediaCreationTool(BaseTool):
+class MediaCreationTool(CourseTool):
     name: str = "MediaCreationTool"
     description: str = "Tool for creating multimedia content"
 
@@ -71,7 +126,7 @@ class MediaCreationTool(BaseTool):
             "output": f"Created {media_type} media"
         }
 
-class CodeSnippetTool(BaseTool):
+class CodeSnippetTool(CourseTool):
     name: str = "CodeSnippetTool"
     description: str = "Tool for generating code examples"
 
@@ -83,7 +138,7 @@ class CodeSnippetTool(BaseTool):
             "code": f"Code example in {language} for {functionality}"
         }
 
-class StakeholderInterviewTool(BaseTool):
+class StakeholderInterviewTool(CourseTool):
     name: str = "StakeholderInterviewTool"
     description: str = "Tool for conducting stakeholder interviews"
 
@@ -94,10 +149,11 @@ class StakeholderInterviewTool(BaseTool):
             "interview_results": f"Interview results for {stakeholder_info}"
         }
 
-class GapAnalysisTool(BaseTool):
+class GapAnalysisTool(CourseTool):
     name: str = "GapAnalysisTool"
     description: str = "Tool for performing skill gap analysis"
 
+    @memoize_tool
     def _run(self, current_skills: str, target_skills: str) -> Dict[str, Any]:
         """Perform gap analysis"""
         return {
@@ -106,21 +162,35 @@ class GapAnalysisTool(BaseTool):
             "gap_analysis": f"Gap analysis between {current_skills} and {target_skills}"
         }
 
-class CloudProvisioningTool(BaseTool):
+class CloudProvisioningTool(CourseTool):
     name: str = "CloudProvisioningTool"
-    description: str = "Tool for cloud infrastructure provisioning"
-
-    def _run(self, requirements: str) -> Dict[str, Any]:
-        """Provision cloud infrastructure"""
-        return {
-            "requirements": requirements,
-            "infrastructure": f"Cloud infrastructure for {requirements}"
-        }
+    description: str = (
+        "Tool for sizing and costing lab infrastructure. Give per-learner resource_specifications "
+        "(cpu, memory, storage), the peak number of concurrent learners or an hourly concurrency "
+        "curve, and optionally a cloud_provider (aws, azure, gcp). Returns the cheapest configuration "
+        "that serves the demand and its cost_estimates"
+    )
+
+    @memoize_tool
+    def _run(self, resource_specifications: Dict[str, str], peak_concurrent_learners: int = 100,
+             concurrency_curve: Optional[List[float]] = None,
+             cloud_provider: Optional[str] = None) -> Dict[str, Any]:
+        """Find the cheapest lab configuration for the given demand"""
+        try:
+            return plan_lab_capacity(resource_specifications, peak_learners=peak_concurrent_learners,
+                                     concurrency_curve=concurrency_curve, provider=cloud_provider)
+        except (ValueError, TypeError) as e:
+            return {
+                "resource_specifications": resource_specifications,
+                "error": str(e),
+                "status": "error"
+            }
 
-class SecurityPolicyTool(BaseTool):
+class SecurityPolicyTool(CourseTool):
     name: str = "SecurityPolicyTool"
     description: str = "Tool for creating security policies"
 
+    @memoize_tool
     def _run(self, environment: str) -> Dict[str, Any]:
         """Create security policies"""
         return {
@@ -128,7 +198,7 @@ class SecurityPolicyTool(BaseTool):
             "policies": f"Security policies for {environment}"
         }
 
-class InfrastructureTool(BaseTool):
+class InfrastructureTool(CourseTool):
     name: str = "InfrastructureTool"
     description: str = "Tool for infrastructure management"
 
@@ -139,40 +209,76 @@ class InfrastructureTool(BaseTool):
             "setup": f"Infrastructure setup for {infrastructure_type}"
         }
 
-class AutomatedTestingTool(BaseTool):
+class AutomatedTestingTool(CourseTool):
     name: str = "AutomatedTestingTool"
-    description: str = "Tool for automated testing"
+    description: str = (
+        "Tool for automated testing. Takes a JSON object with setup_scripts, teardown_procedures "
+        "and/or code_examples, runs them in isolated sandboxes (syntax checks unless execution is "
+        "enabled) and returns per-script pass/fail and latency"
+    )
 
     def _run(self, test_targets: str) -> Dict[str, Any]:
         """Perform automated testing"""
+        try:
+            targets = json.loads(test_targets)
+            if not isinstance(targets, dict):
+                raise ValueError("test_targets must be a JSON object")
+            runner = ScriptRunner.from_env()
+            results = runner.run(collect_scripts(targets, targets))
+        except (ValueError, TypeError, AttributeError) as e:
+            return {
+                "error": str(e),
+                "status": "error"
+            }
         return {
-            "test_targets": test_targets,
-            "results": f"Test results for {test_targets}"
+            "mode": runner.mode,
+            "summary": technical_validation(results, runner.mode),
+            "results": [dict(asdict(result), passed=result.passed) for result in results]
         }
 
-class AccessibilityTool(BaseTool):
+class AccessibilityTool(CourseTool):
     name: str = "AccessibilityTool"
-    description: str = "Tool for accessibility testing"
+    description: str = (
+        "Tool for accessibility testing. Checks content assets (a JSON object of sections, each a "
+        "list of items) for missing alt text, heading order, reading level, colour contrast and "
+        "video transcripts, and returns the findings"
+    )
+    max_findings: int = 50
 
     def _run(self, content: str) -> Dict[str, Any]:
         """Test accessibility"""
-        return {
-            "content": content,
-            "accessibility_report": f"Accessibility report for {content}"
-        }
+        try:
+            assets = json.loads(content)
+            if not isinstance(assets, dict):
+                raise ValueError("content must be a JSON object of asset sections")
+            return check_accessibility(assets).as_dict(self.max_findings)
+        except (ValueError, TypeError, AttributeError) as e:
+            return {
+                "error": str(e),
+                "status": "error"
+            }
 
-class LearnerSimulationTool(BaseTool):
+class LearnerSimulationTool(CourseTool):
     name: str = "LearnerSimulationTool"
-    description: str = "Tool for learner simulation"
-
-    def _run(self, learner_profile: str) -> Dict[str, Any]:
+    description: str = (
+        "Tool for learner simulation. Runs a seeded Monte Carlo simulation of synthetic learners "
+        "(novice, intermediate, advanced) through a course_structure with per-module time estimates "
+        "and returns completion-time percentiles, bottleneck modules and the peak concurrent lab load"
+    )
+
+    @memoize_tool
+    def _run(self, course_structure: List[Dict[str, str]], learners: int = 100_000,
+             profile_mix: Optional[Dict[str, float]] = None, seed: int = 0) -> Dict[str, Any]:
         """Simulate learner experience"""
-        return {
-            "learner_profile": learner_profile,
-            "simulation": f"Learner simulation for {learner_profile}"
-        }
+        try:
+            return simulate_learners(course_structure, learners=learners, profile_mix=profile_mix, seed=seed)
+        except (ValueError, TypeError) as e:
+            return {
+                "error": str(e),
+                "status": "error"
+            }
 
-class LMSIntegrationTool(BaseTool):
+class LMSIntegrationTool(CourseTool):
     name: str = "LMSIntegrationTool"
     description: str = "Tool for LMS integration"
 
@@ -183,24 +289,74 @@ class LMSIntegrationTool(BaseTool):
             "lms_package": f"LMS package for {content_package}"
         }
 
-class SCORMPackagingTool(BaseTool):
+class SCORMPackagingTool(CourseTool):
     name: str = "SCORMPackagingTool"
-    description: str = "Tool for SCORM packaging"
-
-    def _run(self, content: str) -> Dict[str, Any]:
+    description: str = (
+        "Tool for SCORM packaging. Takes ContentAssets JSON and writes a SCORM 1.2 or 2004 "
+        "zip package with an imsmanifest.xml; output_path is relative to the package directory"
+    )
+    output_dir: str = os.getenv("SCORM_PACKAGE_DIR", "packages")
+
+    def _resolve_output(self, output_path: str) -> str:
+        """output_path inside output_dir, refusing absolute paths and ones that escape it"""
+        if os.path.isabs(output_path) or os.path.splitdrive(output_path)[0]:
+            raise ValueError(f"output_path must be relative to the package directory, got '{output_path}'")
+        root = os.path.realpath(self.output_dir)
+        path = os.path.realpath(os.path.join(root, output_path))
+        if os.path.commonpath([root, path]) != root or path == root:
+            raise ValueError(f"output_path '{output_path}' does not name a file in the package directory")
+        return path
+
+    def _run(self, content: str, output_path: str = "scorm_package.zip", version: str = "1.2",
+             title: str = "Course") -> Dict[str, Any]:
         """Create SCORM package"""
+        try:
+            assets = json.loads(content)
+        except ValueError:
+            assets = None
+        if not isinstance(assets, dict):
+            assets = {"supporting_materials": [{"title": title, "content": content}]}
+        try:
+            output_path = self._resolve_output(output_path)
+            report = ScormPackager(version=version).package(assets, output_path, title=title)
+        except Exception as e:
+            return {
+                "error": str(e),
+                "status": "error"
+            }
         return {
-            "content": content,
-            "scorm_package": f"SCORM package for {content}"
+            "scorm_package": output_path,
+            "status": "success",
+            **report.as_dict()
         }
 
-class AnalyticsTool(BaseTool):
+class AnalyticsTool(CourseTool):
     name: str = "AnalyticsTool"
-    description: str = "Tool for analytics and reporting"
-
-    def _run(self, data: str) -> Dict[str, Any]:
+    description: str = (
+        "Tool for learning analytics. Ingests new xAPI statements from the local statement files and "
+        "reports a course's learners, completions, time on task and scores per module; pass module for "
+        "one module, learner for one learner's progress, or daily=true for activity per day"
+    )
+    statements_dir: str = os.getenv("XAPI_STATEMENTS_DIR", "xapi")
+    store_dir: str = os.getenv("XAPI_STORE_DIR", "xapi_store")
+
+    def _run(self, course: str, module: Optional[str] = None, learner: Optional[str] = None,
+             daily: bool = False) -> Dict[str, Any]:
         """Generate analytics"""
-        return {
-            "data": data,
-            "analytics": f"Analytics report for {data}"
-        }
+        try:
+            engine = get_engine(self.store_dir)
+            if os.path.exists(self.statements_dir):
+                engine.ingest(self.statements_dir)
+            if learner is not None:
+                return engine.learner(learner, course)
+            if module is not None:
+                return engine.module(course, module)
+            if daily:
+                return {"course": course, "activity": engine.activity(course)}
+            return engine.course(course)
+        except (KeyError, OSError, ValueError) as e:
+            return {
+                "course": course,
+                "error": str(e.args[0]) if isinstance(e, KeyError) else str(e),
+                "status": "error"
+            }
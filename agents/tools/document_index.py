@@ -0,0 +1,255 @@
+# agents/tools/document_index.py
+import hashlib
+import heapq
+import math
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+INDEX_FILENAME = ".bm25_index.pkl"
+INDEX_VERSION = 1
+TEXT_EXTENSIONS = {".txt", ".md", ".rst", ".csv", ".json", ".yaml", ".yml", ".html", ".htm", ".log", ".xml"}
+PASSAGE_WORDS = 200
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[._-][a-z0-9]+)*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def split_passages(text: str, max_words: int = PASSAGE_WORDS) -> List[str]:
+    """Group paragraphs into passages of up to max_words, splitting longer paragraphs"""
+    passages: List[str] = []
+    current: List[str] = []
+    count = 0
+    for paragraph in re.split(r"\n\s*\n", text):
+        words = paragraph.split()
+        while words:
+            room = max_words - count
+            if room <= 0:
+                passages.append(" ".join(current))
+                current, count = [], 0
+                continue
+            current.extend(words[:room])
+            count += min(len(words), room)
+            words = words[room:]
+        if count >= max_words // 2:
+            passages.append(" ".join(current))
+            current, count = [], 0
+    if current:
+        passages.append(" ".join(current))
+    return passages
+
+
+@dataclass
+class Passage:
+    path: str
+    position: int
+    text: str
+    length: int
+    terms: Dict[str, int]
+
+
+@dataclass
+class FileEntry:
+    mtime_ns: int
+    size: int
+    sha256: str
+    passage_ids: List[int] = field(default_factory=list)
+
+
+class DocumentIndex:
+    """Incremental BM25 index over the text documents of a local folder, persisted to disk
+    
+    refresh() re-reads only files whose mtime or size changed and re-indexes only
+    those whose content hash changed. refresh_if_stale() walks the folder at most
+    once every refresh_interval seconds, for callers that refresh on every query.
+    """
+
+    def __init__(self, root: str, index_path: Optional[str] = None, k1: float = 1.5, b: float = 0.75,
+                 refresh_interval: float = 5.0):
+        self.root = os.path.abspath(root)
+        self.index_path = index_path or os.path.join(self.root, INDEX_FILENAME)
+        self.k1 = k1
+        self.b = b
+        self.refresh_interval = refresh_interval
+        self.refreshed_at: Optional[float] = None
+        self.files: Dict[str, FileEntry] = {}
+        self.passages: Dict[int, Passage] = {}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.total_length = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, "rb") as file:
+                state = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return
+        if state.get("version") != INDEX_VERSION or state.get("root") != self.root:
+            return
+        self.files = state["files"]
+        self.passages = state["passages"]
+        self.postings = state["postings"]
+        self.total_length = state["total_length"]
+        self._next_id = state["next_id"]
+
+    def save(self):
+        state = {
+            "version": INDEX_VERSION,
+            "root": self.root,
+            "files": self.files,
+            "passages": self.passages,
+            "postings": self.postings,
+            "total_length": self.total_length,
+            "next_id": self._next_id
+        }
+        directory = os.path.dirname(self.index_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _documents(self) -> Dict[str, os.stat_result]:
+        found = {}
+        for directory, dirs, names in os.walk(self.root):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in names:
+                if os.path.splitext(name)[1].lower() not in TEXT_EXTENSIONS:
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    found[os.path.relpath(path, self.root)] = os.stat(path)
+                except OSError:
+                    continue
+        return found
+
+    def _remove(self, path: str):
+        entry = self.files.pop(path, None)
+        if entry is None:
+            return
+        for passage_id in entry.passage_ids:
+            passage = self.passages.pop(passage_id)
+            self.total_length -= passage.length
+            for term in passage.terms:
+                postings = self.postings[term]
+                del postings[passage_id]
+                if not postings:
+                    del self.postings[term]
+
+    def _add(self, path: str, text: str, entry: FileEntry):
+        for position, passage_text in enumerate(split_passages(text)):
+            terms = Counter(tokenize(passage_text))
+            length = sum(terms.values())
+            if not length:
+                continue
+            passage_id = self._next_id
+            self._next_id += 1
+            self.passages[passage_id] = Passage(path, position, passage_text, length, dict(terms))
+            self.total_length += length
+            for term, frequency in terms.items():
+                self.postings.setdefault(term, {})[passage_id] = frequency
+            entry.passage_ids.append(passage_id)
+        self.files[path] = entry
+
+    def refresh(self) -> Dict[str, int]:
+        """Bring the index up to date with the folder and persist it if anything changed"""
+        with self._lock:
+            stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+            documents = self._documents()
+            for path in [p for p in self.files if p not in documents]:
+                self._remove(path)
+                stats["removed"] += 1
+
+            touched = False
+            for path, stat in documents.items():
+                entry = self.files.get(path)
+                if entry is not None and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+                    stats["unchanged"] += 1
+                    continue
+                try:
+                    with open(os.path.join(self.root, path), "rb") as file:
+                        data = file.read()
+                except OSError:
+                    continue
+                digest = hashlib.sha256(data).hexdigest()
+                touched = True
+                if entry is not None and entry.sha256 == digest:
+                    entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+                    stats["unchanged"] += 1
+                    continue
+                stats["updated" if entry is not None else "added"] += 1
+                self._remove(path)
+                self._add(path, data.decode("utf-8", errors="replace"),
+                          FileEntry(stat.st_mtime_ns, stat.st_size, digest))
+
+            if touched or stats["removed"]:
+                self.save()
+            self.refreshed_at = time.monotonic()
+            return stats
+
+    def refresh_if_stale(self) -> Optional[Dict[str, int]]:
+        """refresh() unless the last one was under refresh_interval seconds ago, in which case None"""
+        if self.refreshed_at is not None and time.monotonic() - self.refreshed_at < self.refresh_interval:
+            return None
+        return self.refresh()
+
+    def search(self, query: str, top_k: int = 5) -> List[Dict[str, object]]:
+        """Top-k passages for a query ranked by BM25"""
+        with self._lock:
+            count = len(self.passages)
+            if not count:
+                return []
+            average_length = self.total_length / count
+            scores: Dict[int, float] = {}
+            for term in set(tokenize(query)):
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for passage_id, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.passages[passage_id].length / average_length)
+                    scores[passage_id] = scores.get(passage_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+            best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+            return [
+                {
+                    "path": self.passages[passage_id].path,
+                    "passage": self.passages[passage_id].position,
+                    "score": round(score, 4),
+                    "text": self.passages[passage_id].text
+                }
+                for passage_id, score in best
+            ]
+
+
+_indexes: Dict[str, DocumentIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(root: str) -> DocumentIndex:
+    """Process-wide DocumentIndex for a folder, loaded from disk on first use"""
+    root = os.path.abspath(root)
+    with _indexes_lock:
+        if root not in _indexes:
+            interval = float(os.getenv("DOCUMENT_INDEX_REFRESH_SECONDS", "5"))
+            _indexes[root] = DocumentIndex(root, refresh_interval=interval)
+        return _indexes[root]
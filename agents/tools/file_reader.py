@@ -0,0 +1,211 @@
+# agents/tools/file_reader.py
+import base64
+import codecs
+import json
+import mmap
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 64 * 1024
+SAMPLE_BYTES = 64 * 1024
+INDEX_CHUNK_BYTES = 8 * 1024 * 1024
+# A line offset is stored for every LINES_PER_CHECKPOINT-th line, so a seek scans at most that many lines
+LINES_PER_CHECKPOINT = 256
+
+# Resolved to an explicit byte order, so a chunk that starts after the BOM still decodes correctly
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+]
+# Encodings in which b"\n" always encodes a newline, so lines can be indexed on raw bytes
+_ASCII_COMPATIBLE = {"utf-8", "utf-8-sig", "ascii", "latin-1", "cp1252"}
+
+
+def detect_encoding(sample: bytes) -> str:
+    """Guess a file's encoding from a leading sample of its bytes"""
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        # Not final: the sample may end in the middle of a multi-byte character
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    try:
+        from charset_normalizer import from_bytes
+        match = from_bytes(sample).best()
+        if match is not None:
+            return codecs.lookup(match.encoding).name
+    except ImportError:
+        pass
+    return "cp1252"
+
+
+def _bom_length(encoding: str) -> int:
+    """Length of the byte order mark that starts a file detected as encoding, which reads skip"""
+    return next((len(bom) for bom, name in _BOMS if name == encoding), 0)
+
+
+@dataclass
+class LineIndex:
+    checkpoints: List[int]
+    total_lines: int
+
+    def line_offset(self, mm: mmap.mmap, line: int) -> int:
+        """Byte offset at which the 0-based line starts, or the file size past the end"""
+        if line >= self.total_lines:
+            return len(mm)
+        position = self.checkpoints[line // LINES_PER_CHECKPOINT]
+        for _ in range(line % LINES_PER_CHECKPOINT):
+            position = mm.find(b"\n", position) + 1
+        return position
+
+
+def _build_index(mm: mmap.mmap) -> LineIndex:
+    checkpoints = [0]
+    newlines = 0
+    size = len(mm)
+    for chunk_start in range(0, size, INDEX_CHUNK_BYTES):
+        chunk = np.frombuffer(mm[chunk_start:chunk_start + INDEX_CHUNK_BYTES], dtype=np.uint8)
+        # Start offsets of the lines that follow each newline in this chunk
+        starts = np.flatnonzero(chunk == 10) + (chunk_start + 1)
+        first = -(newlines + 1) % LINES_PER_CHECKPOINT
+        checkpoints.extend(starts[first::LINES_PER_CHECKPOINT].tolist())
+        newlines += len(starts)
+    ends_with_newline = size > 0 and mm[size - 1:size] == b"\n"
+    return LineIndex(checkpoints, newlines if ends_with_newline or size == 0 else newlines + 1)
+
+
+@lru_cache(maxsize=32)
+def _cached_index(path: str, mtime_ns: int, size: int) -> LineIndex:
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _build_index(mm)
+
+
+@lru_cache(maxsize=256)
+def _cached_encoding(path: str, mtime_ns: int, size: int) -> str:
+    with open(path, "rb") as file:
+        return detect_encoding(file.read(SAMPLE_BYTES))
+
+
+def encode_token(state: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(",", ":")).encode()).decode()
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    try:
+        return json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid continuation token: {e}") from None
+
+
+def _char_boundaries(mm: mmap.mmap, start: int, end: int, encoding: str) -> Tuple[int, int]:
+    """Move a byte range inwards so it does not split a character"""
+    if encoding.startswith("utf-8"):
+        while start < end and 0x80 <= mm[start] < 0xC0:
+            start += 1
+        if end < len(mm):
+            while end > start and 0x80 <= mm[end] < 0xC0:
+                end -= 1
+    elif encoding.startswith(("utf-16", "utf-32")):
+        width = 2 if encoding.startswith("utf-16") else 4
+        start += -start % width
+        end -= (end - start) % width
+    return start, end
+
+
+class ChunkedFileReader:
+    """Reads byte or line ranges of a file through mmap without loading the whole file
+    
+    Reads larger than max_bytes return the first max_bytes along with a summary and
+    a continuation token for the rest of the requested range.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+
+    def read(self, file_path: str, offset: Optional[int] = None, length: Optional[int] = None,
+             start_line: Optional[int] = None, end_line: Optional[int] = None,
+             continuation_token: Optional[str] = None) -> Dict[str, Any]:
+        if continuation_token:
+            state = decode_token(continuation_token)
+            file_path, offset, end = state["path"], state["offset"], state["end"]
+        else:
+            state, end = None, None
+
+        stat = os.stat(file_path)
+        if state is not None and (state["mtime_ns"], state["size"]) != (stat.st_mtime_ns, stat.st_size):
+            raise ValueError(f"{file_path} changed since the continuation token was issued")
+        size = stat.st_size
+        # The token carries the encoding resolved for the first chunk, byte order included
+        encoding = state.get("encoding") if state is not None else None
+        encoding = encoding or _cached_encoding(file_path, stat.st_mtime_ns, size)
+
+        if size == 0:
+            return self._result(file_path, "", encoding, 0, 0, 0, None)
+
+        with open(file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            index = None
+            if state is None and (start_line is not None or end_line is not None):
+                if encoding not in _ASCII_COMPATIBLE:
+                    raise ValueError(f"Line ranges are not supported for {encoding} files")
+                if start_line is not None and end_line is not None and start_line > end_line:
+                    raise ValueError(f"start_line {start_line} is after end_line {end_line}")
+                index = _cached_index(file_path, stat.st_mtime_ns, size)
+                first = max((start_line or 1) - 1, 0)
+                offset = index.line_offset(mm, first)
+                end = index.line_offset(mm, end_line) if end_line is not None else size
+            elif state is None:
+                offset = min(max(offset or 0, 0), size)
+                end = size if length is None else min(offset + max(length, 0), size)
+            offset = min(max(offset, _bom_length(encoding)), size)
+            end = max(end, offset)
+
+            read_end = min(end, offset + self.max_bytes)
+            start, read_end = _char_boundaries(mm, offset, read_end, encoding)
+            if read_end == start and start < end:
+                # A character wider than the cap still has to make progress
+                read_end = min(end, start + 4)
+            content = mm[start:read_end].decode(encoding, errors="replace")
+
+            token = None
+            if read_end < end:
+                token = encode_token({"path": file_path, "offset": read_end, "end": end,
+                                      "encoding": encoding, "mtime_ns": stat.st_mtime_ns, "size": size})
+            result = self._result(file_path, content, encoding, start, read_end, size, token)
+            if token is not None:
+                result["summary"] = self._summary(file_path, start, read_end, end, size, index)
+            return result
+
+    @staticmethod
+    def _result(file_path: str, content: str, encoding: str, start: int, end: int,
+                size: int, token: Optional[str]) -> Dict[str, Any]:
+        result = {
+            "file_path": file_path,
+            "content": content,
+            "status": "success",
+            "encoding": encoding,
+            "offset": start,
+            "length": end - start,
+            "size_bytes": size,
+            "truncated": token is not None
+        }
+        if token is not None:
+            result["continuation_token"] = token
+        return result
+
+    @staticmethod
+    def _summary(file_path: str, start: int, read_end: int, end: int, size: int,
+                 index: Optional[LineIndex]) -> str:
+        lines = f", {index.total_lines} lines" if index is not None else ""
+        return (f"Returned bytes {start}-{read_end} of the requested {end - start} bytes "
+                f"from {os.path.basename(file_path)} ({size} bytes{lines}). "
+                f"{end - read_end} bytes remain; pass continuation_token to read the next chunk.")
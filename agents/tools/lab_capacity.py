@@ -0,0 +1,264 @@
+# agents/tools/lab_capacity.py
+"""Deterministic cost and capacity model for lab environments
+
+Every combination of instance type, seat packing (CPU overcommit), scaling policy,
+headroom and spot share is a scenario. All scenarios are evaluated at once against
+an hourly learner concurrency curve as (scenario x hour) NumPy arrays, and the
+cheapest one that serves enough learner-hours is returned.
+"""
+import json
+import logging
+import os
+import re
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# On-demand USD per hour; spot prices are on-demand times spot_discount
+DEFAULT_PRICE_TABLE: Dict[str, Any] = {
+    "spot_discount": 0.35,
+    "spot_interruption_rate": 0.05,
+    "storage_gb_month": {"aws": 0.08, "azure": 0.075, "gcp": 0.085},
+    "instances": [
+        {"provider": "aws", "name": "t3.medium", "vcpu": 2, "memory_gb": 4, "hourly": 0.0416},
+        {"provider": "aws", "name": "t3.xlarge", "vcpu": 4, "memory_gb": 16, "hourly": 0.1664},
+        {"provider": "aws", "name": "m6i.2xlarge", "vcpu": 8, "memory_gb": 32, "hourly": 0.384},
+        {"provider": "aws", "name": "m6i.4xlarge", "vcpu": 16, "memory_gb": 64, "hourly": 0.768},
+        {"provider": "aws", "name": "c6i.4xlarge", "vcpu": 16, "memory_gb": 32, "hourly": 0.68},
+        {"provider": "aws", "name": "r6i.4xlarge", "vcpu": 16, "memory_gb": 128, "hourly": 1.008},
+        {"provider": "azure", "name": "B2ms", "vcpu": 2, "memory_gb": 8, "hourly": 0.0832},
+        {"provider": "azure", "name": "D4s_v5", "vcpu": 4, "memory_gb": 16, "hourly": 0.192},
+        {"provider": "azure", "name": "D16s_v5", "vcpu": 16, "memory_gb": 64, "hourly": 0.768},
+        {"provider": "azure", "name": "F16s_v2", "vcpu": 16, "memory_gb": 32, "hourly": 0.677},
+        {"provider": "gcp", "name": "e2-standard-4", "vcpu": 4, "memory_gb": 16, "hourly": 0.134},
+        {"provider": "gcp", "name": "n2-standard-8", "vcpu": 8, "memory_gb": 32, "hourly": 0.388},
+        {"provider": "gcp", "name": "n2-standard-16", "vcpu": 16, "memory_gb": 64, "hourly": 0.777},
+        {"provider": "gcp", "name": "c2-standard-16", "vcpu": 16, "memory_gb": 64, "hourly": 0.835},
+    ],
+}
+
+OVERCOMMIT = (1.0, 1.5, 2.0, 3.0)
+HEADROOM = (0.0, 0.1, 0.25, 0.5)
+SPOT_SHARE = (0.0, 0.25, 0.5, 0.8)
+POLICIES = ("static", "autoscale")
+HOURS_PER_MONTH = 730
+
+logger = logging.getLogger(__name__)
+
+_NUMBER = re.compile(r"(\d+(?:\.\d+)?)\s*(?:([tgm])(?:i?b|i)?\b)?", re.IGNORECASE)
+
+
+@dataclass
+class SeatSpec:
+    """Resources one learner's lab occupies"""
+    vcpu: float = 1.0
+    memory_gb: float = 2.0
+    storage_gb: float = 10.0
+
+    @classmethod
+    def parse(cls, specifications: Dict[str, Any]) -> "SeatSpec":
+        """Read vCPU, memory and storage from free-form resource_specifications
+        
+        CPU accepts cores or Kubernetes millicores ("500m"), memory and storage MB, GB
+        or TB (binary or not). Unreadable values keep the default and are logged.
+        """
+        spec = cls()
+        for key, value in (specifications or {}).items():
+            key = key.lower()
+            is_cpu = "cpu" in key or "core" in key
+            if not (is_cpu or any(word in key for word in ("mem", "ram", "storage", "disk", "volume"))):
+                continue
+            match = _NUMBER.search(str(value))
+            if not match or float(match.group(1)) <= 0:
+                logger.warning("Cannot read %s=%r from resource_specifications, keeping the default", key, value)
+                continue
+            amount = float(match.group(1))
+            unit = (match.group(2) or "g").lower()
+            gigabytes = amount * {"t": 1024, "g": 1, "m": 1 / 1024}[unit]
+            if is_cpu:
+                spec.vcpu = amount / 1000 if unit == "m" else amount
+            elif "mem" in key or "ram" in key:
+                spec.memory_gb = gigabytes
+            elif "storage" in key or "disk" in key or "volume" in key:
+                spec.storage_gb = gigabytes
+        return spec
+
+
+@dataclass
+class CapacityPlan:
+    provider: str
+    instance_type: str
+    policy: str
+    seats_per_node: int
+    cpu_overcommit: float
+    headroom: float
+    spot_share: float
+    peak_nodes: int
+    node_hours: float
+    compute_cost: float
+    storage_cost: float
+    total_cost: float
+    cost_per_learner_hour: float
+    served_fraction: float
+
+    def cost_estimates(self, hours: int) -> Dict[str, float]:
+        """Figures for LabEnvironment.cost_estimates"""
+        scale = HOURS_PER_MONTH / hours
+        return {
+            "compute_monthly_usd": round(self.compute_cost * scale, 2),
+            "storage_monthly_usd": round(self.storage_cost * scale, 2),
+            "total_monthly_usd": round(self.total_cost * scale, 2),
+            "cost_per_learner_hour_usd": round(self.cost_per_learner_hour, 4),
+            "peak_nodes": float(self.peak_nodes),
+            "seats_per_node": float(self.seats_per_node),
+            "spot_share": self.spot_share,
+            "served_fraction": round(self.served_fraction, 4),
+        }
+
+
+def weekly_curve(peak_learners: float, hours: int = 168) -> np.ndarray:
+    """Hourly concurrent learners for a working-hours pattern peaking at peak_learners"""
+    hour = np.arange(hours)
+    hour_of_day = hour % 24
+    weekday = (hour // 24) % 7 < 5
+    daytime = np.exp(-0.5 * ((hour_of_day - 14) / 3.0) ** 2)
+    evening = 0.35 * np.exp(-0.5 * ((hour_of_day - 20) / 1.5) ** 2)
+    curve = np.where(weekday, 0.05 + daytime + evening, 0.05 + 0.3 * daytime)
+    return np.ceil(peak_learners * curve / curve.max())
+
+
+def load_price_table(path: Optional[str] = None) -> Dict[str, Any]:
+    """The price table at path or LAB_PRICE_TABLE, falling back to DEFAULT_PRICE_TABLE"""
+    path = path or os.getenv("LAB_PRICE_TABLE")
+    if not path:
+        return DEFAULT_PRICE_TABLE
+    return _read_price_table(path, os.stat(path).st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _read_price_table(path: str, mtime_ns: int) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+class CapacityPlanner:
+    """Evaluates every sizing and scheduling scenario for a seat spec and concurrency curve"""
+
+    def __init__(self, price_table: Optional[Dict[str, Any]] = None,
+                 max_unserved_fraction: float = 0.01):
+        self.prices = price_table or load_price_table()
+        self.max_unserved_fraction = max_unserved_fraction
+
+    def scenarios(self, seat: SeatSpec, providers: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Flattened scenario grid, one array entry per scenario"""
+        instances = [item for item in self.prices["instances"]
+                     if not providers or item["provider"] in providers]
+        if not instances:
+            raise ValueError(f"no instances in the price table for providers {list(providers)}")
+        grid = np.meshgrid(np.arange(len(instances)), np.arange(len(OVERCOMMIT)), np.arange(len(POLICIES)),
+                           np.arange(len(HEADROOM)), np.arange(len(SPOT_SHARE)), indexing="ij")
+        instance, overcommit, policy, headroom, spot = (axis.ravel() for axis in grid)
+        vcpu = np.array([item["vcpu"] for item in instances], dtype=float)[instance]
+        memory = np.array([item["memory_gb"] for item in instances], dtype=float)[instance]
+        overcommit_ratio = np.array(OVERCOMMIT)[overcommit]
+        seats = np.minimum(np.floor(vcpu * overcommit_ratio / seat.vcpu), np.floor(memory / seat.memory_gb))
+        return {
+            "instances": instances,
+            "instance": instance,
+            "hourly": np.array([item["hourly"] for item in instances])[instance],
+            "seats": seats,
+            "overcommit": overcommit_ratio,
+            "autoscale": np.array(POLICIES)[policy] == "autoscale",
+            "headroom": np.array(HEADROOM)[headroom],
+            "spot": np.array(SPOT_SHARE)[spot],
+        }
+
+    def evaluate(self, seat: SeatSpec, curve: np.ndarray,
+                 providers: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Cost and served learner-hours of every scenario over the curve"""
+        grid = self.scenarios(seat, providers)
+        valid = grid["seats"] >= 1
+        seats = np.maximum(grid["seats"], 1)[:, None]
+        demand = np.asarray(curve, dtype=float)[None, :]
+        headroom = grid["headroom"][:, None]
+
+        # Autoscaling reacts one hour late: capacity for hour t is sized from demand at t-1
+        reactive = np.concatenate([demand[:, :1], demand[:, :-1]], axis=1)
+        wanted = np.where(grid["autoscale"][:, None], reactive, demand.max(axis=1, keepdims=True))
+        nodes = np.ceil(wanted * (1 + headroom) / seats)
+
+        # Interrupted spot nodes are lost for the hour
+        interruption = self.prices.get("spot_interruption_rate", 0.0)
+        effective = nodes * (1 - grid["spot"][:, None] * interruption)
+        served = np.minimum(demand, effective * seats).sum(axis=1)
+        served_fraction = served / max(demand.sum(), 1e-9)
+
+        discount = self.prices.get("spot_discount", 1.0)
+        rate = grid["hourly"] * (1 - grid["spot"] * (1 - discount))
+        node_hours = nodes.sum(axis=1)
+        compute = node_hours * rate
+        storage_rates = self.prices.get("storage_gb_month", {})
+        storage_rate = np.array([storage_rates.get(item["provider"], 0.08)
+                                 for item in grid["instances"]])[grid["instance"]]
+        storage = seat.storage_gb * demand.max() * storage_rate * curve.size / HOURS_PER_MONTH
+        total = compute + storage
+        feasible = valid & (served_fraction >= 1 - self.max_unserved_fraction)
+        return dict(grid, nodes=nodes, node_hours=node_hours, compute=compute, storage=storage,
+                    total=total, served=served, served_fraction=served_fraction, feasible=feasible)
+
+    def plan(self, seat: SeatSpec, curve: np.ndarray, providers: Optional[Sequence[str]] = None,
+             top: int = 3) -> List[CapacityPlan]:
+        """The cheapest feasible scenarios, best first"""
+        result = self.evaluate(seat, curve, providers)
+        candidates = np.flatnonzero(result["feasible"])
+        if not (result["seats"] >= 1).any():
+            raise ValueError(f"no instance type fits one learner's lab of {seat}")
+        if candidates.size == 0:
+            raise ValueError("no scenario serves enough of the demand; relax max_unserved_fraction")
+        # Stable sort keeps ties in grid order, so the answer is deterministic
+        best = candidates[np.argsort(result["total"][candidates], kind="stable")[:top]]
+        return [self._plan(result, int(i)) for i in best]
+
+    @staticmethod
+    def _plan(result: Dict[str, np.ndarray], i: int) -> CapacityPlan:
+        instance = result["instances"][result["instance"][i]]
+        served = float(result["served"][i])
+        return CapacityPlan(
+            provider=instance["provider"],
+            instance_type=instance["name"],
+            policy="autoscale" if result["autoscale"][i] else "static",
+            seats_per_node=int(result["seats"][i]),
+            cpu_overcommit=float(result["overcommit"][i]),
+            headroom=float(result["headroom"][i]),
+            spot_share=float(result["spot"][i]),
+            peak_nodes=int(result["nodes"][i].max()),
+            node_hours=float(result["node_hours"][i]),
+            compute_cost=float(result["compute"][i]),
+            storage_cost=float(result["storage"][i]),
+            total_cost=float(result["total"][i]),
+            cost_per_learner_hour=float(result["total"][i]) / max(served, 1e-9),
+            served_fraction=float(result["served_fraction"][i]),
+        )
+
+
+def plan_lab_capacity(resource_specifications: Dict[str, Any], peak_learners: float = 100,
+                      concurrency_curve: Optional[Sequence[float]] = None,
+                      provider: Optional[str] = None, max_unserved_fraction: float = 0.01,
+                      price_table: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Optimal lab configuration and cost estimates as JSON-serialisable data"""
+    seat = SeatSpec.parse(resource_specifications)
+    curve = (np.asarray(concurrency_curve, dtype=float) if concurrency_curve
+             else weekly_curve(peak_learners))
+    providers = [provider.lower()] if provider and provider.lower() in {"aws", "azure", "gcp"} else None
+    planner = CapacityPlanner(price_table, max_unserved_fraction)
+    plans = planner.plan(seat, curve, providers)
+    return {
+        "seat": asdict(seat),
+        "hours": int(curve.size),
+        "peak_concurrent_learners": float(curve.max()),
+        "optimal": asdict(plans[0]),
+        "alternatives": [asdict(plan) for plan in plans[1:]],
+        "cost_estimates": plans[0].cost_estimates(int(curve.size)),
+    }
@@ -0,0 +1,195 @@
+# agents/tools/learner_simulation.py
+"""Seeded Monte Carlo simulation of learners moving through a course structure
+
+All learners are simulated at once as (learner x module) NumPy arrays: per-profile
+pacing multipliers scale each module's time estimate, failed attempts are drawn
+from a geometric distribution and add rework time, and learners who exhaust their
+attempts drop out. Lab occupancy is accumulated on a (day x hour) grid.
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class LearnerProfile:
+    share: float
+    pace: float
+    pace_sigma: float
+    failure_rate: float
+    daily_hours: float
+
+
+DEFAULT_PROFILES: Dict[str, LearnerProfile] = {
+    "novice": LearnerProfile(share=0.3, pace=1.4, pace_sigma=0.35, failure_rate=0.15, daily_hours=1.5),
+    "intermediate": LearnerProfile(share=0.5, pace=1.0, pace_sigma=0.3, failure_rate=0.08, daily_hours=2.0),
+    "advanced": LearnerProfile(share=0.2, pace=0.75, pace_sigma=0.25, failure_rate=0.03, daily_hours=2.5),
+}
+
+DEFAULT_MODULE_HOURS = 2.0
+MAX_ATTEMPTS = 3
+# Each failed attempt costs this fraction of the module's time again
+REWORK_FACTOR = 0.6
+LAB_FAILURE_FACTOR = 1.5
+PERCENTILES = (50, 75, 90, 95, 99)
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)\s*(minutes?|mins?|hours?|hrs?|h|days?|weeks?)?", re.IGNORECASE)
+_UNIT_HOURS = {"m": 1 / 60, "h": 1, "d": 8, "w": 40}
+_TIME_KEYS = ("duration", "time", "hours", "length", "estimate", "effort")
+_NAME_KEYS = ("title", "name", "module", "topic")
+
+
+def module_hours(module: Dict[str, str]) -> float:
+    """Planned hours of a course_structure entry, from its first duration-like field"""
+    for key, value in module.items():
+        if any(word in key.lower() for word in _TIME_KEYS):
+            match = _DURATION.search(str(value))
+            if match:
+                unit = (match.group(2) or "h").lower()
+                return float(match.group(1)) * _UNIT_HOURS.get(unit[0], 1)
+    return DEFAULT_MODULE_HOURS
+
+
+def module_name(module: Dict[str, str], index: int) -> str:
+    for key in _NAME_KEYS:
+        for field, value in module.items():
+            if field.lower() == key and value:
+                return str(value)
+    return f"Module {index + 1}"
+
+
+def is_lab(module: Dict[str, str]) -> bool:
+    text = " ".join(f"{k} {v}" for k, v in module.items()).lower()
+    return any(word in text for word in ("lab", "hands-on", "hands on", "exercise", "practical"))
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    if values.size == 0:
+        return {f"p{p}": 0.0 for p in PERCENTILES}
+    return {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+class LearnerSimulation:
+    """Simulates a cohort of learners through a list of course modules"""
+
+    def __init__(self, course_structure: List[Dict[str, str]],
+                 profiles: Optional[Dict[str, LearnerProfile]] = None, enrollment_days: int = 14):
+        if not course_structure:
+            raise ValueError("course_structure has no modules to simulate")
+        self.names = [module_name(module, i) for i, module in enumerate(course_structure)]
+        self.planned = np.array([module_hours(module) for module in course_structure])
+        self.labs = np.array([is_lab(module) for module in course_structure])
+        self.profiles = profiles or DEFAULT_PROFILES
+        self.enrollment_days = enrollment_days
+
+    def run(self, learners: int = 100_000, seed: int = 0) -> Dict[str, Any]:
+        rng = np.random.default_rng(seed)
+        names = list(self.profiles)
+        shares = np.array([self.profiles[name].share for name in names], dtype=float)
+        profile = rng.choice(len(names), size=learners, p=shares / shares.sum())
+
+        def per_learner(attr: str) -> np.ndarray:
+            return np.array([getattr(self.profiles[name], attr) for name in names])[profile]
+
+        pace = per_learner("pace") * rng.lognormal(0.0, per_learner("pace_sigma"))
+        modules = self.planned.size
+        # Per-module variation around the learner's own pace
+        noise = rng.lognormal(0.0, 0.2, size=(learners, modules))
+        failure = np.minimum(per_learner("failure_rate")[:, None] * np.where(self.labs, LAB_FAILURE_FACTOR, 1.0),
+                             0.95)
+        attempts = rng.geometric(1.0 - failure)
+        failed_out = attempts > MAX_ATTEMPTS
+        attempts = np.minimum(attempts, MAX_ATTEMPTS)
+
+        # Learners stop at the first module they cannot pass
+        dropped = failed_out.any(axis=1)
+        first_fail = np.where(dropped, failed_out.argmax(axis=1), modules)
+        taken = np.arange(modules)[None, :] <= first_fail[:, None]
+        hours = self.planned[None, :] * pace[:, None] * noise * (1 + REWORK_FACTOR * (attempts - 1))
+        hours = np.where(taken, hours, 0.0)
+        total = hours.sum(axis=1)
+
+        daily = per_learner("daily_hours")
+        completed = ~dropped
+        report = {
+            "learners": learners,
+            "seed": seed,
+            "completion_rate": round(float(completed.mean()), 4),
+            "dropout_rate": round(float(dropped.mean()), 4),
+            "completion_hours": _percentiles(total[completed]),
+            "completion_days": _percentiles(np.ceil(total[completed] / daily[completed])),
+            "profiles": {name: round(float((profile == i).mean()), 4) for i, name in enumerate(names)},
+            "bottleneck_modules": self._bottlenecks(hours, taken, attempts, failed_out),
+        }
+        report.update(self._lab_load(rng, hours, taken, daily))
+        return report
+
+    def _bottlenecks(self, hours: np.ndarray, taken: np.ndarray, attempts: np.ndarray,
+                     failed_out: np.ndarray, top: int = 3) -> List[Dict[str, Any]]:
+        """Modules where learners overrun the plan most, counting rework and dropouts"""
+        reached = np.maximum(taken.sum(axis=0), 1)
+        mean_hours = hours.sum(axis=0) / reached
+        retry_rate = ((attempts > 1) & taken).sum(axis=0) / reached
+        dropouts = (failed_out & taken).sum(axis=0)
+        overrun = mean_hours / self.planned
+        order = np.lexsort((-overrun, -dropouts))[:top]
+        return [{
+            "module": self.names[i],
+            "planned_hours": round(float(self.planned[i]), 2),
+            "mean_hours": round(float(mean_hours[i]), 2),
+            "overrun_ratio": round(float(overrun[i]), 3),
+            "retry_rate": round(float(retry_rate[i]), 4),
+            "dropouts": int(dropouts[i]),
+        } for i in order]
+
+    def _lab_load(self, rng: np.random.Generator, hours: np.ndarray, taken: np.ndarray,
+                  daily: np.ndarray) -> Dict[str, Any]:
+        """Peak number of learners in a lab at the same hour
+
+        Each learner enrols on a random day, studies daily_hours a day in a session
+        starting at a preferred hour, and holds a lab seat during every session that
+        falls within a lab module.
+        """
+        if not self.labs.any():
+            return {"peak_concurrent_lab_learners": 0, "peak_lab_day": None, "peak_lab_hour": None}
+        learners = hours.shape[0]
+        start_day = rng.integers(0, self.enrollment_days, size=learners)
+        session_start = np.clip(np.rint(rng.normal(14, 3, size=learners)), 0, 23).astype(int)
+        session_hours = np.ceil(daily).astype(int)
+
+        before = np.cumsum(hours, axis=1) - hours
+        first_day = start_day[:, None] + np.floor(before / daily[:, None]).astype(int)
+        last_day = start_day[:, None] + np.floor(np.maximum(before + hours - 1e-9, before) / daily[:, None]).astype(int)
+        in_lab = taken & self.labs[None, :] & (hours > 0)
+        learner, module = np.nonzero(in_lab)
+        first, last = first_day[learner, module], last_day[learner, module]
+
+        days = int(last.max()) + 2
+        grid = np.zeros((days, 24), dtype=np.int64)
+        for offset in range(int(session_hours.max())):
+            active = session_hours[learner] > offset
+            hour = (session_start[learner] + offset)[active] % 24
+            np.add.at(grid, (first[active], hour), 1)
+            np.add.at(grid, (last[active] + 1, hour), -1)
+        load = np.cumsum(grid, axis=0)
+        day, hour = np.unravel_index(int(load.argmax()), load.shape)
+        return {"peak_concurrent_lab_learners": int(load[day, hour]), "peak_lab_day": int(day),
+                "peak_lab_hour": int(hour)}
+
+
+def simulate_learners(course_structure: List[Dict[str, str]], learners: int = 100_000,
+                      profile_mix: Optional[Dict[str, float]] = None, seed: int = 0,
+                      enrollment_days: int = 14) -> Dict[str, Any]:
+    """Run the simulation, optionally overriding the share of each default profile"""
+    profiles = DEFAULT_PROFILES
+    if profile_mix:
+        unknown = set(profile_mix) - set(DEFAULT_PROFILES)
+        if unknown:
+            raise ValueError(f"unknown learner profiles {sorted(unknown)}; use {list(DEFAULT_PROFILES)}")
+        profiles = {name: LearnerProfile(**{**profile.__dict__, "share": float(profile_mix.get(name, 0.0))})
+                    for name, profile in DEFAULT_PROFILES.items()}
+        if sum(profile.share for profile in profiles.values()) <= 0:
+            raise ValueError("profile_mix shares must add up to more than zero")
+    return LearnerSimulation(course_structure, profiles, enrollment_days).run(learners, seed)
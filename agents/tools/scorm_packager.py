@@ -0,0 +1,288 @@
+# agents/tools/scorm_packager.py
+import hashlib
+import html
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pydantic import BaseModel
+from typing import Any, BinaryIO, Deque, Dict, Iterator, List, Tuple, Union
+from xml.sax.saxutils import escape, quoteattr
+
+SCORM_VERSIONS = ("1.2", "2004")
+
+# Fixed DOS timestamp (1980-01-01 00:00) so identical courses produce identical packages
+_DOS_TIME, _DOS_DATE = 0, (0 << 9) | (1 << 5) | 1
+_UTF8_FLAG = 0x0800
+_ZIP32_LIMIT = 0xFFFFFFFF
+
+SCORM_API_JS = """// scorm_api.js: locate the LMS runtime API and open/close the attempt
+(function () {
+  function find(win, name) {
+    for (var i = 0; win && i < 10; i++) {
+      if (win[name]) { return win[name]; }
+      if (win.parent === win) { break; }
+      win = win.parent;
+    }
+    return null;
+  }
+  var api2004 = find(window, "API_1484_11") || (window.opener && find(window.opener, "API_1484_11"));
+  var api12 = api2004 ? null : (find(window, "API") || (window.opener && find(window.opener, "API")));
+  window.addEventListener("load", function () {
+    if (api2004) { api2004.Initialize(""); api2004.SetValue("cmi.completion_status", "completed"); }
+    else if (api12) { api12.LMSInitialize(""); api12.LMSSetValue("cmi.core.lesson_status", "completed"); }
+  });
+  window.addEventListener("unload", function () {
+    if (api2004) { api2004.Terminate(""); } else if (api12) { api12.LMSFinish(""); }
+  });
+})();
+"""
+
+
+class StreamingZipWriter:
+    """Minimal zip writer that accepts entries compressed elsewhere, with Zip64 support
+    
+    Entries are written in the order they are added, so file bodies are never held
+    once written; only the central directory records (O(entries)) stay in memory.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.offset = 0
+        self._central: List[bytes] = []
+
+    def _write(self, data: bytes):
+        self.stream.write(data)
+        self.offset += len(data)
+
+    def add(self, name: str, payload: bytes, crc: int, size: int, method: int):
+        if size > _ZIP32_LIMIT or len(payload) > _ZIP32_LIMIT:
+            raise ValueError(f"Entry {name} exceeds 4 GiB")
+        encoded = name.encode("utf-8")
+        header_offset = self.offset
+        self._write(struct.pack("<IHHHHHIIIHH", 0x04034B50, 20, _UTF8_FLAG, method, _DOS_TIME,
+                                _DOS_DATE, crc, len(payload), size, len(encoded), 0))
+        self._write(encoded)
+        self._write(payload)
+
+        extra = b""
+        if header_offset >= _ZIP32_LIMIT:
+            extra = struct.pack("<HHQ", 0x0001, 8, header_offset)
+            header_offset = _ZIP32_LIMIT
+        needed = 45 if extra else 20
+        self._central.append(struct.pack(
+            "<IHHHHHHIIIHHHHHII", 0x02014B50, (3 << 8) | 45, needed, _UTF8_FLAG, method,
+            _DOS_TIME, _DOS_DATE, crc, len(payload), size, len(encoded), len(extra), 0, 0, 0,
+            0o100644 << 16, header_offset
+        ) + encoded + extra)
+
+    def close(self):
+        start = self.offset
+        for record in self._central:
+            self._write(record)
+        size = self.offset - start
+        count = len(self._central)
+
+        if count > 0xFFFF or start >= _ZIP32_LIMIT or size >= _ZIP32_LIMIT:
+            zip64_offset = self.offset
+            self._write(struct.pack("<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, size, start))
+            self._write(struct.pack("<IIQI", 0x07064B50, 0, zip64_offset, 1))
+            self._write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, 0xFFFF, 0xFFFF,
+                                    _ZIP32_LIMIT, _ZIP32_LIMIT, 0))
+        else:
+            self._write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, count, count, size, start, 0))
+        self.stream.flush()
+
+
+def compress(data: bytes, level: int) -> Tuple[bytes, int, int, int]:
+    """Raw-deflate data, falling back to storing it when deflate does not help"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    payload = compressor.compress(data) + compressor.flush()
+    if len(payload) >= len(data):
+        return data, zlib.crc32(data), len(data), 0
+    return payload, zlib.crc32(data), len(data), 8
+
+
+def render_asset(item: Dict[str, str]) -> bytes:
+    """Page for one content item, from the item alone so identical items in any section share a file"""
+    title = html.escape(str(item.get("title") or item.get("name") or "Course content"))
+    rows = "\n".join(
+        f"<dt>{html.escape(str(key))}</dt><dd>{html.escape(str(value))}</dd>" for key, value in item.items()
+    )
+    return (
+        "<!DOCTYPE html>\n<html lang=\"en\"><head><meta charset=\"utf-8\">"
+        f"<title>{title}</title><script src=\"../scorm_api.js\"></script></head>\n"
+        f"<body><main><h1>{title}</h1>\n"
+        f"<dl>\n{rows}\n</dl></main></body></html>\n"
+    ).encode("utf-8")
+
+
+@dataclass
+class PackageReport:
+    path: str
+    version: str
+    items: int
+    unique_assets: int
+    bytes_uncompressed: int
+    bytes_written: int
+    seconds: float
+
+    @property
+    def duplicate_assets(self) -> int:
+        return self.items - self.unique_assets
+
+    @property
+    def dedup_ratio(self) -> float:
+        return self.items / self.unique_assets if self.unique_assets else 1.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "version": self.version,
+            "items": self.items,
+            "unique_assets": self.unique_assets,
+            "duplicate_assets": self.duplicate_assets,
+            "dedup_ratio": round(self.dedup_ratio, 3),
+            "bytes_uncompressed": self.bytes_uncompressed,
+            "bytes_written": self.bytes_written,
+            "seconds": round(self.seconds, 3)
+        }
+
+
+class ScormPackager:
+    """Streams ContentAssets into a SCORM 1.2 or 2004 zip package
+    
+    Every asset becomes an HTML SCO. Assets with identical rendered content are
+    stored once and shared by all the items that use them. Compression runs on a
+    thread pool with a bounded number of entries in flight, so file bodies are
+    streamed; the manifest, asset hashes and central directory are O(items) metadata.
+    """
+
+    def __init__(self, version: str = "1.2", workers: int = 4, compresslevel: int = 6,
+                 max_pending: int = 64):
+        if version not in SCORM_VERSIONS:
+            raise ValueError(f"version must be one of {SCORM_VERSIONS}, got '{version}'")
+        self.version = version
+        self.workers = workers
+        self.compresslevel = compresslevel
+        self.max_pending = max_pending
+
+    @staticmethod
+    def _items(content_assets: Union[BaseModel, Dict[str, Any]]) -> Iterator[Tuple[str, int, Dict[str, str]]]:
+        # One item dumped at a time rather than the whole model up front
+        if isinstance(content_assets, BaseModel):
+            sections = ((name, getattr(content_assets, name)) for name in type(content_assets).model_fields)
+        else:
+            sections = content_assets.items()
+        for section, items in sections:
+            if isinstance(items, list):
+                for index, item in enumerate(items):
+                    if isinstance(item, BaseModel):
+                        item = item.model_dump()
+                    yield section, index, item if isinstance(item, dict) else {"content": str(item)}
+
+    def package(self, content_assets: Union[BaseModel, Dict[str, Any]], output_path: str,
+                title: str = "Course", identifier: str = "course") -> PackageReport:
+        start = time.perf_counter()
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        organization: Dict[str, List[Tuple[str, str]]] = {}
+        resources: List[str] = []
+        seen = set()
+        items = 0
+        uncompressed = 0
+
+        with open(output_path, "wb") as stream, ThreadPoolExecutor(self.workers) as executor:
+            writer = StreamingZipWriter(stream)
+            pending: Deque[Tuple[str, Future]] = deque()
+
+            def write_oldest():
+                name, future = pending.popleft()
+                writer.add(name, *future.result())
+
+            for section, index, item in self._items(content_assets):
+                label = section.replace("_", " ").title()
+                item_title = item.get("title") or item.get("name") or f"{label} {index + 1}"
+                body = render_asset(item)
+                digest = hashlib.sha256(body).hexdigest()[:20]
+                organization.setdefault(label, []).append((item_title, digest))
+                items += 1
+                if digest in seen:
+                    continue
+
+                seen.add(digest)
+                uncompressed += len(body)
+                resources.append(digest)
+                pending.append((f"assets/{digest}.html", executor.submit(compress, body, self.compresslevel)))
+                if len(pending) >= self.max_pending:
+                    write_oldest()
+            while pending:
+                write_oldest()
+
+            for name, data in (("scorm_api.js", SCORM_API_JS.encode("utf-8")),
+                               ("imsmanifest.xml", self._manifest(title, identifier, organization, resources))):
+                uncompressed += len(data)
+                writer.add(name, *compress(data, self.compresslevel))
+            writer.close()
+            written = writer.offset
+
+        return PackageReport(output_path, self.version, items, len(seen), uncompressed, written,
+                             time.perf_counter() - start)
+
+    def _manifest(self, title: str, identifier: str, organization: Dict[str, List[Tuple[str, str]]],
+                  resources: List[str]) -> bytes:
+        if self.version == "1.2":
+            header = (
+                '<manifest identifier={id} version="1.0" '
+                'xmlns="http://www.imsproject.org/xsd/imscp_rootv1p1p2" '
+                'xmlns:adlcp="http://www.adlnet.org/xsd/adlcp_rootv1p2" '
+                'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+                'xsi:schemaLocation="http://www.imsproject.org/xsd/imscp_rootv1p1p2 imscp_rootv1p1p2.xsd '
+                'http://www.adlnet.org/xsd/adlcp_rootv1p2 adlcp_rootv1p2.xsd">'
+            )
+            schema_version = "1.2"
+            scorm_type = "adlcp:scormtype"
+        else:
+            header = (
+                '<manifest identifier={id} version="1.0" '
+                'xmlns="http://www.imsglobal.org/xsd/imscp_v1p1" '
+                'xmlns:adlcp="http://www.adlnet.org/xsd/adlcp_v1p3" '
+                'xmlns:adlseq="http://www.adlnet.org/xsd/adlseq_v1p3" '
+                'xmlns:adlnav="http://www.adlnet.org/xsd/adlnav_v1p3" '
+                'xmlns:imsss="http://www.imsglobal.org/xsd/imsss" '
+                'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+                'xsi:schemaLocation="http://www.imsglobal.org/xsd/imscp_v1p1 imscp_v1p1.xsd '
+                'http://www.adlnet.org/xsd/adlcp_v1p3 adlcp_v1p3.xsd '
+                'http://www.adlnet.org/xsd/adlseq_v1p3 adlseq_v1p3.xsd '
+                'http://www.adlnet.org/xsd/adlnav_v1p3 adlnav_v1p3.xsd '
+                'http://www.imsglobal.org/xsd/imsss imsss_v1p0.xsd">'
+            )
+            schema_version = "2004 4th Edition"
+            scorm_type = "adlcp:scormType"
+
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            header.format(id=quoteattr(identifier)),
+            f"<metadata><schema>ADL SCORM</schema><schemaversion>{schema_version}</schemaversion></metadata>",
+            '<organizations default="ORG-1"><organization identifier="ORG-1">',
+            f"<title>{escape(title)}</title>"
+        ]
+        counter = 0
+        for s, (label, entries) in enumerate(organization.items(), 1):
+            parts.append(f'<item identifier="SECTION-{s}"><title>{escape(label)}</title>')
+            for item_title, digest in entries:
+                counter += 1
+                parts.append(f'<item identifier="ITEM-{counter}" identifierref="RES-{digest}">'
+                             f"<title>{escape(item_title)}</title></item>")
+            parts.append("</item>")
+        parts.append("</organization></organizations><resources>")
+        for digest in resources:
+            parts.append(f'<resource identifier="RES-{digest}" type="webcontent" {scorm_type}="sco" '
+                         f'href="assets/{digest}.html"><file href="assets/{digest}.html"/>'
+                         '<dependency identifierref="RES-COMMON"/></resource>')
+        parts.append(f'<resource identifier="RES-COMMON" type="webcontent" {scorm_type}="asset">'
+                     '<file href="scorm_api.js"/></resource>')
+        parts.append("</resources></manifest>")
+        return "\n".join(parts).encode("utf-8")
@@ -0,0 +1,275 @@
+# agents/tools/script_runner.py
+"""Sandboxed, parallel execution of lab scripts and code examples
+
+Each unit of scripts gets its own temporary directory as its home and working
+directory, a scrubbed environment and CPU, memory and file-size rlimits, and is
+killed with its whole process group when it exceeds its timeout. The lab's setup
+scripts and teardown procedures form one unit run in order in a shared directory;
+every code example is a unit of its own. Units run in parallel.
+
+Scripts are generated by an LLM, so by default they are only syntax-checked;
+mode="execute" (or LAB_SCRIPT_MODE=execute) actually runs them. Passes (and
+prose entries) are cached by script hash. Only entries that look like scripts (a shebang, a fenced
+code block or an explicit language) are run; prose steps are reported as skipped.
+"""
+import hashlib
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel
+
+from agents.tools.tool_cache import MISSING, ToolCache
+
+MODES = ("syntax", "execute")
+CACHE_LABEL = "ScriptRunner"
+_LANGUAGES = {
+    "bash": "bash", "shell": "bash", "sh": "bash", "zsh": "bash", "console": "bash",
+    "python": "python", "python3": "python", "py": "python",
+    "javascript": "node", "js": "node", "node": "node",
+}
+_PYTHON_HINT = re.compile(r"^\s*(import \w|from \w+ import|def \w+\(|class \w+[:(]|print\()", re.MULTILINE)
+_FENCE = re.compile(r"```[ \t]*([\w+-]*)[^\n]*\n(.*?)```", re.DOTALL)
+# Language of entries that are not scripts, e.g. a prose teardown step
+PROSE = "text"
+_CODE_KEYS = ("code", "source", "snippet", "script", "content", "example")
+
+# Sets the rlimits given as arguments and execs the command that follows them. Runs as the
+# child instead of a preexec_fn, which is unsafe while other threads are running
+_LIMITED_EXEC = """
+import os, resource, sys
+def limit(name, value):
+    hard = resource.getrlimit(name)[1]
+    if hard != resource.RLIM_INFINITY:
+        value = min(value, hard)
+    resource.setrlimit(name, (value, value))
+cpu, memory, size = (int(value) for value in sys.argv[1:4])
+limit(resource.RLIMIT_CPU, cpu)
+if memory:
+    limit(resource.RLIMIT_AS, memory)
+limit(resource.RLIMIT_FSIZE, size)
+limit(resource.RLIMIT_CORE, 0)
+os.execvp(sys.argv[4], sys.argv[4:])
+"""
+
+script_cache = ToolCache(max_entries=4096, directory=os.getenv("SCRIPT_CACHE_DIR") or None)
+
+
+@dataclass
+class Script:
+    name: str
+    source: str
+    language: str
+
+
+@dataclass
+class ScriptResult:
+    name: str
+    language: str
+    status: str
+    returncode: Optional[int]
+    duration: float
+    stdout: str
+    stderr: str
+    sha256: str
+    cached: bool = False
+
+    @property
+    def passed(self) -> bool:
+        return self.status == "passed"
+
+
+def detect_language(source: str, hint: Optional[str] = None) -> str:
+    """Interpreter family of a script from an explicit language hint, its shebang or its content"""
+    if hint and hint.strip().lower() in _LANGUAGES:
+        return _LANGUAGES[hint.strip().lower()]
+    first_line = source.lstrip().splitlines()[0] if source.strip() else ""
+    if first_line.startswith("#!"):
+        for name, language in _LANGUAGES.items():
+            if re.search(rf"\b{name}\b", first_line):
+                return language
+    if _PYTHON_HINT.search(source):
+        return "python"
+    return hint.strip().lower() if hint else "bash"
+
+
+def as_script(name: str, text: str, language: Optional[str] = None) -> Script:
+    """A Script from an entry with an explicit language, a shebang or a fenced code block, else a prose one"""
+    fence = _FENCE.search(text)
+    if fence and not language and not text.lstrip().startswith("#!"):
+        return Script(name, fence.group(2), detect_language(fence.group(2), fence.group(1) or None))
+    if language or text.lstrip().startswith("#!"):
+        return Script(name, text, detect_language(text, language))
+    return Script(name, text, PROSE)
+
+
+def _command(language: str, path: str, mode: str) -> Optional[List[str]]:
+    if language == "python":
+        return [sys.executable, "-I", "-m", "py_compile", path] if mode == "syntax" else [sys.executable, "-I", path]
+    if language == "bash" and shutil.which("bash"):
+        return ["bash", "-n", path] if mode == "syntax" else ["bash", "--noprofile", "--norc", "-e", path]
+    if language == "node" and shutil.which("node"):
+        return ["node", "--check", path] if mode == "syntax" else ["node", path]
+    return None
+
+
+class ScriptRunner:
+    """Runs script units in parallel, each in its own sandbox directory"""
+
+    def __init__(self, mode: str = "syntax", timeout: float = 30.0, max_workers: int = 4,
+                 cpu_seconds: int = 30, memory_mb: int = 1024, max_file_mb: int = 64,
+                 max_output: int = 2000, cache: Optional[ToolCache] = None):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got '{mode}'")
+        self.mode = mode
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.max_file_mb = max_file_mb
+        self.max_output = max_output
+        self.cache = cache or script_cache
+
+    @classmethod
+    def from_env(cls) -> "ScriptRunner":
+        """Build a runner from the LAB_SCRIPT_* environment variables"""
+        return cls(
+            mode=os.getenv("LAB_SCRIPT_MODE", "syntax"),
+            timeout=float(os.getenv("LAB_SCRIPT_TIMEOUT", "30")),
+            max_workers=int(os.getenv("LAB_SCRIPT_WORKERS", "4"))
+        )
+
+    def _key(self, chain: List[Script]) -> str:
+        digest = hashlib.sha256(f"{self.mode}\0{self.cpu_seconds}\0{self.memory_mb}".encode())
+        for script in chain:
+            digest.update(f"\0{script.language}\0{script.source}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _limited(self, command: List[str], language: str) -> List[str]:
+        """command wrapped so that it execs under this runner's rlimits"""
+        if os.name != "posix":
+            return command
+        # V8 reserves far more address space than it uses, so node is left unbounded here
+        memory = 0 if language == "node" else self.memory_mb * 1024 * 1024
+        return [sys.executable, "-I", "-c", _LIMITED_EXEC, str(self.cpu_seconds), str(memory),
+                str(self.max_file_mb * 1024 * 1024), *command]
+
+    def _tail(self, data: bytes) -> str:
+        text = data.decode("utf-8", errors="replace")
+        return text[-self.max_output:]
+
+    def _execute(self, script: Script, workdir: str, key: str) -> ScriptResult:
+        if script.language == PROSE:
+            return ScriptResult(script.name, script.language, "skipped", None, 0.0, "", "not a script", key)
+        path = os.path.join(workdir, f"{re.sub(r'[^A-Za-z0-9_.-]', '_', script.name)}.{script.language}")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(script.source)
+        command = _command(script.language, path, self.mode)
+        if command is None:
+            return ScriptResult(script.name, script.language, "skipped", None, 0.0, "",
+                                f"no interpreter available for {script.language}", key)
+
+        env = {"PATH": os.environ.get("PATH", "/usr/bin:/bin"), "HOME": workdir, "TMPDIR": workdir,
+               "LANG": "C.UTF-8", "PYTHONDONTWRITEBYTECODE": "1"}
+        start = time.perf_counter()
+        # Its own session, so a timeout can kill everything the script started
+        process = subprocess.Popen(self._limited(command, script.language), cwd=workdir, env=env,
+                                   stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   start_new_session=os.name == "posix")
+        try:
+            stdout, stderr = process.communicate(timeout=self.timeout)
+            status = "passed" if process.returncode == 0 else "failed"
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                process.kill()
+            stdout, stderr = process.communicate()
+            status = "timeout"
+        return ScriptResult(script.name, script.language, status, process.returncode,
+                            time.perf_counter() - start, self._tail(stdout), self._tail(stderr), key)
+
+    def run_unit(self, scripts: List[Script]) -> List[ScriptResult]:
+        """Run scripts in order in one sandbox, serving the whole unit from cache when nothing changed"""
+        keys = [self._key(scripts[:i + 1]) for i in range(len(scripts))]
+        cached = [self.cache.get(CACHE_LABEL, key) for key in keys]
+        if cached and all(entry is not MISSING for entry in cached):
+            return [ScriptResult(**dict(entry, cached=True)) for entry in cached]
+
+        results = []
+        with tempfile.TemporaryDirectory(prefix="lab-sandbox-") as workdir:
+            for script, key in zip(scripts, keys):
+                result = self._execute(script, workdir, key)
+                results.append(result)
+                # Failures and timeouts may be transient (a loaded host), so they are rerun next time
+                if result.passed or result.language == PROSE:
+                    self.cache.set(key, asdict(result))
+        return results
+
+    def run(self, units: List[List[Script]]) -> List[ScriptResult]:
+        """Run every unit in parallel, returning results in unit order"""
+        units = [unit for unit in units if unit]
+        with ThreadPoolExecutor(max(1, min(self.max_workers, len(units) or 1)),
+                                thread_name_prefix="lab-scripts") as pool:
+            return [result for unit_results in pool.map(self.run_unit, units) for result in unit_results]
+
+
+def collect_scripts(lab_environment: Optional[Union[BaseModel, Dict[str, Any]]] = None,
+                    content_assets: Optional[Union[BaseModel, Dict[str, Any]]] = None) -> List[List[Script]]:
+    """Script units of a lab design (setup then teardown) and of the course's code examples"""
+    def as_dict(value: Any) -> Dict[str, Any]:
+        return value.model_dump() if isinstance(value, BaseModel) else dict(value or {})
+
+    units: List[List[Script]] = []
+    lab = as_dict(lab_environment)
+    lab_unit = [as_script(f"{field}[{i}]", source)
+                for field in ("setup_scripts", "teardown_procedures")
+                for i, source in enumerate(lab.get(field) or []) if source.strip()]
+    if lab_unit:
+        units.append(lab_unit)
+
+    for i, example in enumerate(as_dict(content_assets).get("code_examples") or []):
+        lowered = {key.lower(): value for key, value in example.items()}
+        source = next((lowered[key] for key in _CODE_KEYS if lowered.get(key, "").strip()), None)
+        if source is None:
+            continue
+        units.append([as_script(f"code_examples[{i}]", source, lowered.get("language") or lowered.get("lang"))])
+    return units
+
+
+def technical_validation(results: List[ScriptResult], mode: str) -> Dict[str, str]:
+    """Summary in the shape of QualityReport.technical_validation
+
+    Only statuses go in, so the summary is identical across runs of the same scripts
+    and can be part of a prompt or fingerprint; see script_details for the rest. The
+    overall outcome is script_status, leaving the report's own keys alone.
+    """
+    ran = [result for result in results if result.status != "skipped"]
+    passed = sum(result.passed for result in ran)
+    summary = {
+        "script_mode": mode,
+        "scripts_passed": f"{passed}/{len(ran)}",
+        "script_status": ("skipped" if not ran else "pass" if passed == len(ran) else "fail"),
+    }
+    for result in results:
+        summary[result.name] = result.status
+    return summary
+
+
+def script_details(results: List[ScriptResult]) -> Dict[str, str]:
+    """Per-script duration, cache use and last stderr line of failures, in the shape of QualityReport.script_runs"""
+    details = {}
+    for result in results:
+        detail = f"{result.status} in {result.duration:.2f}s" + (" (cached)" if result.cached else "")
+        if result.status in ("failed", "timeout") and result.stderr.strip():
+            detail += f": {result.stderr.strip().splitlines()[-1][:200]}"
+        details[result.name] = detail
+    return details
@@ -0,0 +1,181 @@
+# agents/tools/tool_cache.py
+import copy
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from agents.instrumentation import instrumentation
+
+MISSING = object()
+
+
+def normalize(value: Any) -> Any:
+    """Canonical form of a tool argument: whitespace-collapsed strings, sorted mappings"""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(k): normalize(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    return value
+
+
+class ToolCache:
+    """Process-wide memo of deterministic tool results
+
+    An in-memory LRU bounded by max_entries sits in front of an optional on-disk
+    tier shared between processes. Entries older than ttl seconds are ignored in
+    both tiers. Hits and misses are counted per tool.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: Optional[float] = None,
+                 directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = directory
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ToolCache":
+        """Build a cache from the TOOL_CACHE_* environment variables"""
+        ttl = os.getenv("TOOL_CACHE_TTL")
+        return cls(
+            max_entries=int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "4096")),
+            ttl=float(ttl) if ttl else None,
+            directory=os.getenv("TOOL_CACHE_DIR") or None
+        )
+
+    def key(self, tool: str, arguments: Dict[str, Any]) -> str:
+        payload = json.dumps([tool, normalize(arguments)], sort_keys=True, default=repr)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pkl")
+
+    def _load(self, key: str) -> Tuple[float, Any]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                created, value = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return 0.0, MISSING
+        if self._expired(created):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return 0.0, MISSING
+        return created, value
+
+    def _store(self, key: str, created: float, value: Any):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump((created, value), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _remember(self, key: str, created: float, value: Any):
+        with self._lock:
+            self._entries[key] = (created, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, tool: str, key: str) -> Any:
+        """Return a copy of the cached result, or MISSING"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None and self.directory:
+            created, value = self._load(key)
+            if value is not MISSING:
+                entry = (created, value)
+                self._remember(key, created, value)
+        with self._lock:
+            if entry is None:
+                self.misses[tool] += 1
+                return MISSING
+            self.hits[tool] += 1
+        return copy.deepcopy(entry[1])
+
+    def set(self, key: str, value: Any):
+        created = time.time()
+        self._remember(key, created, copy.deepcopy(value))
+        if self.directory:
+            self._store(key, created, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits.clear()
+            self.misses.clear()
+        if self.directory:
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith(".pkl"):
+                        os.remove(os.path.join(root, name))
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Hit/miss counts and hit rate per tool"""
+        with self._lock:
+            tools = sorted(set(self.hits) | set(self.misses))
+            report = {}
+            for tool in tools:
+                total = self.hits[tool] + self.misses[tool]
+                report[tool] = {"hits": self.hits[tool], "misses": self.misses[tool],
+                                "hit_rate": self.hits[tool] / total if total else 0.0}
+        return report
+
+
+tool_cache = ToolCache.from_env()
+
+
+def memoize_tool(run: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a tool's _run so results are served from tool_cache for equivalent arguments
+
+    Error results (status == "error") and exceptions are never cached.
+    """
+    signature = inspect.signature(run)
+
+    @wraps(run)
+    def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        arguments.pop(next(iter(signature.parameters)))
+        name = self.name
+        key = tool_cache.key(f"{type(self).__module__}.{type(self).__qualname__}", arguments)
+        result = tool_cache.get(name, key)
+        if result is not MISSING:
+            instrumentation.increment("tool_cache_total", tool=name, result="hit")
+            return result
+        instrumentation.increment("tool_cache_total", tool=name, result="miss")
+        result = run(self, *args, **kwargs)
+        if not (isinstance(result, dict) and result.get("status") == "error"):
+            tool_cache.set(key, result)
+        return result
+    return wrapper
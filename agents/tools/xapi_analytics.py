@@ -0,0 +1,748 @@
+# agents/tools/xapi_analytics.py
+"""Streaming ingestion and aggregation of xAPI statements
+
+Statements are read from append-only JSONL files, resuming each file at the byte
+offset reached by the previous run, and flattened into columns: dictionary codes for
+course, module, learner and verb, the timestamp, result duration, scaled score and a
+completion flag. Columns are written as NumPy segments of up to segment_rows
+statements, the raw record every aggregate can be rebuilt from.
+
+Aggregates are updated once per batch with vectorised group-bys, at three grains: a
+cell per (module, learner), a unit per (course, module) and a day per (course, UTC
+day), plus the distinct learners of each course. Units, cells and days are located
+through sorted int64 keys such as course << 32 | module, so a course or module query
+reads a handful of unit rows, a learner query one key range of cells, and none of
+them depends on the number of statements.
+
+A commit writes new segments under fresh names and then replaces the manifest, which
+lists them with the dictionaries and file offsets; anything ingested after the last
+manifest is read again on the next run. Aggregates are snapshotted every
+snapshot_rows statements and the segments committed since are replayed on load.
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+STORE_VERSION = 1
+MANIFEST = "manifest.json"
+SEGMENT_ROWS = 1_000_000
+BATCH_ROWS = 50_000
+SNAPSHOT_ROWS = 2_000_000
+STATEMENT_EXTENSIONS = (".jsonl", ".ndjson")
+COMPLETION_VERBS = frozenset({"completed", "passed", "mastered"})
+DAY_MS = 86_400_000
+LOW_BITS = (1 << 32) - 1
+
+COLUMNS = {
+    "course": np.int32, "module": np.int32, "learner": np.int32, "verb": np.int32,
+    "timestamp": np.int64, "seconds": np.float32, "score": np.float32, "completed": np.bool_,
+}
+# "completed" counts learners who completed; "completions" counts completion statements
+UNIT_COLUMNS = {
+    "course": np.int32, "module": np.int32, "learners": np.int64, "completed": np.int64,
+    "statements": np.int64, "seconds": np.float64, "scores": np.int64, "score_sum": np.float64,
+    "score_max": np.float32, "last_seen": np.int64,
+}
+CELL_COLUMNS = {
+    "unit": np.int32, "learner": np.int32, "statements": np.int32, "completions": np.int32,
+    "seconds": np.float32, "scores": np.int32, "score_sum": np.float32, "score_max": np.float32,
+    "last_seen": np.int64,
+}
+DAY_COLUMNS = {"course": np.int32, "day": np.int32, "statements": np.int64, "completions": np.int64}
+COURSE_COLUMNS = {"learners": np.int64}
+TABLES = {"units": UNIT_COLUMNS, "cells": CELL_COLUMNS, "days": DAY_COLUMNS, "courses": COURSE_COLUMNS}
+# Keys of the sorted indexes: units by (course, module), cells by (unit, learner) and
+# (learner, unit), enrolments by (course, learner) and days by (course, day)
+INDEXES = ("units", "cells", "learners", "enrolments", "days")
+FILL = {"score_max": np.nan, "last_seen": np.iinfo(np.int64).min}
+DICTIONARIES = ("course", "module", "learner", "verb")
+_decode = json.JSONDecoder().decode
+
+_DURATION = re.compile(
+    r"P(?:([\d.]+)W)?(?:([\d.]+)D)?(?:T(?:([\d.]+)H)?(?:([\d.]+)M)?(?:([\d.]+)S)?)?$"
+)
+_DURATION_SECONDS = (604_800, 86_400, 3_600, 60, 1)
+
+
+@lru_cache(maxsize=65536)
+def parse_duration(value: Optional[str]) -> float:
+    """Seconds in an ISO 8601 duration such as PT1H5M30.5S; 0 when absent or invalid"""
+    match = _DURATION.match(value) if isinstance(value, str) else None
+    if not match:
+        return 0.0
+    return float(sum(float(part) * unit for part, unit in zip(match.groups(), _DURATION_SECONDS) if part))
+
+
+def parse_timestamp(value: Optional[str]) -> int:
+    """Milliseconds since the epoch of an ISO 8601 timestamp, read as UTC when it has no offset"""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def _first_id(activities: Any) -> Optional[str]:
+    if isinstance(activities, dict):
+        return activities.get("id")
+    if activities:
+        return activities[0].get("id")
+    return None
+
+
+def _actor_id(actor: Dict[str, Any]) -> str:
+    account = actor.get("account")
+    if account:
+        return f"{account.get('homePage', '')}|{account['name']}"
+    for key in ("mbox", "mbox_sha1sum", "openid"):
+        if actor.get(key):
+            return actor[key]
+    raise ValueError("Statement actor has no identifier")
+
+
+def flatten(statement: Dict[str, Any]) -> Tuple[str, str, str, str, int, float, float, bool]:
+    """(course, module, learner, verb, timestamp ms, seconds, scaled score, completed) of a statement
+
+    The course is the first grouping activity, else the first parent, else the object
+    itself; the module is the parent or object below it, and "" for statements about
+    the course as a whole.
+    """
+    activity = statement["object"]["id"]
+    context = (statement.get("context") or {}).get("contextActivities") or {}
+    grouping, parent = _first_id(context.get("grouping")), _first_id(context.get("parent"))
+    if grouping:
+        course, module = grouping, parent or activity
+    elif parent:
+        course, module = parent, activity
+    else:
+        course, module = activity, ""
+    if module == course:
+        module = ""
+
+    verb = statement["verb"]["id"]
+    result = statement.get("result") or {}
+    score = result.get("score") or {}
+    if score.get("scaled") is not None:
+        scaled = float(score["scaled"])
+    elif score.get("raw") is not None and score.get("max") is not None and score["max"] > score.get("min", 0):
+        scaled = (score["raw"] - score.get("min", 0)) / (score["max"] - score.get("min", 0))
+    else:
+        scaled = float("nan")
+    completed = result.get("completion") is True or verb.rsplit("/", 1)[-1] in COMPLETION_VERBS
+    return (course, module, _actor_id(statement["actor"]), verb,
+            parse_timestamp(statement.get("timestamp") or statement["stored"]),
+            parse_duration(result.get("duration")), scaled, completed)
+
+
+class _Table:
+    """Columns of equal length that grow by doubling"""
+
+    def __init__(self, dtypes: Dict[str, Any], data: Optional[Dict[str, np.ndarray]] = None):
+        self.columns = {name: np.array(data[name], dtype) if data is not None else np.zeros(0, dtype)
+                        for name, dtype in dtypes.items()}
+        self.count = len(next(iter(self.columns.values())))
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name][:self.count]
+
+    def append(self, rows: int, **values: np.ndarray) -> np.ndarray:
+        """Ids of the new rows, set from values, else from FILL, else zero"""
+        start, count = self.count, self.count + rows
+        for name, column in self.columns.items():
+            if count > len(column):
+                grown = np.zeros(max(count, 2 * len(column), 1024), column.dtype)
+                grown[:start] = column[:start]
+                column = self.columns[name] = grown
+            column[start:count] = values[name] if name in values else FILL.get(name, 0)
+        self.count = count
+        return np.arange(start, count)
+
+    def extend(self, count: int):
+        if count > self.count:
+            self.append(count - self.count)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: column[:self.count] for name, column in self.columns.items()}
+
+
+class _SortedIndex:
+    """int64 keys mapped to row ids through binary search
+
+    New keys go to a sorted delta that is merged into the main arrays once it outgrows
+    an eighth of them, so an insert costs amortised O(log n) and a lookup two searches.
+    """
+
+    def __init__(self, keys: Optional[np.ndarray] = None, rows: Optional[np.ndarray] = None):
+        self.keys = np.array(keys if keys is not None else [], np.int64)
+        self.rows = np.array(rows if rows is not None else [], np.int64)
+        self._delta_keys = np.zeros(0, np.int64)
+        self._delta_rows = np.zeros(0, np.int64)
+
+    def get(self, keys: np.ndarray) -> np.ndarray:
+        """Row of each key, -1 where it is missing"""
+        rows = np.full(len(keys), -1, np.int64)
+        for sorted_keys, sorted_rows in ((self.keys, self.rows), (self._delta_keys, self._delta_rows)):
+            if len(sorted_keys):
+                position = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+                found = sorted_keys[position] == keys
+                rows[found] = sorted_rows[position[found]]
+        return rows
+
+    def add(self, keys: np.ndarray, rows: np.ndarray):
+        keys = np.concatenate([self._delta_keys, keys])
+        rows = np.concatenate([self._delta_rows, rows])
+        order = np.argsort(keys, kind="stable")
+        self._delta_keys, self._delta_rows = keys[order], rows[order]
+        if len(self._delta_keys) > max(65_536, len(self.keys) // 8):
+            self.merge()
+
+    def merge(self):
+        if not len(self._delta_keys):
+            return
+        keys = np.concatenate([self.keys, self._delta_keys])
+        rows = np.concatenate([self.rows, self._delta_rows])
+        order = np.argsort(keys, kind="stable")
+        self.keys, self.rows = keys[order], rows[order]
+        self._delta_keys, self._delta_rows = self._delta_keys[:0], self._delta_rows[:0]
+
+    def prefix(self, high: int) -> np.ndarray:
+        """Rows of the keys whose upper 32 bits are high, in key order"""
+        keys, rows = [], []
+        for sorted_keys, sorted_rows in ((self.keys, self.rows), (self._delta_keys, self._delta_rows)):
+            start, stop = np.searchsorted(sorted_keys, [high << 32, (high + 1) << 32])
+            keys.append(sorted_keys[start:stop])
+            rows.append(sorted_rows[start:stop])
+        return np.concatenate(rows)[np.argsort(np.concatenate(keys), kind="stable")]
+
+
+class XapiAnalytics:
+    """Columnar xAPI statement store with incrementally maintained aggregates
+
+    One process at a time ingests into a store; a lock file serialises writers, and a
+    writer that finds a newer manifest on disk reloads it before ingesting.
+    """
+
+    def __init__(self, store_dir: str, segment_rows: int = SEGMENT_ROWS, batch_rows: int = BATCH_ROWS,
+                 snapshot_rows: int = SNAPSHOT_ROWS):
+        self.store_dir = os.path.abspath(store_dir)
+        self.segment_rows = segment_rows
+        self.batch_rows = batch_rows
+        self.snapshot_rows = snapshot_rows
+        self._lock = threading.RLock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.store_dir, MANIFEST)) as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            manifest = {}
+        if manifest.get("version") != STORE_VERSION:
+            manifest = {}
+        self.generation = manifest.get("generation", 0)
+        self._next_segment = manifest.get("next_segment", 0)
+        self.segments: List[Dict[str, Any]] = manifest.get("segments", [])
+        self.files: Dict[str, Dict[str, int]] = manifest.get("files", {})
+        self.rejected = manifest.get("rejected", 0)
+        names = manifest.get("dictionaries") or {name: [] for name in DICTIONARIES}
+        names["module"] = names["module"] or [""]
+        self._names: Dict[str, List[str]] = names
+        self._codes = {name: {value: code for code, value in enumerate(values)} for name, values in names.items()}
+        self._pending: List[Dict[str, np.ndarray]] = []
+        self._pending_rows = 0
+        self._dirty = False
+        self._mapped: Dict[str, Dict[str, np.ndarray]] = {}
+
+        self._snapshot = manifest.get("snapshot")
+        if self._snapshot:
+            with np.load(os.path.join(self.store_dir, self._snapshot["name"])) as data:
+                self._reset({name: {column: data[f"{name}.{column}"] for column in dtypes}
+                             for name, dtypes in TABLES.items()},
+                            {name: (data[f"index.{name}.keys"], data[f"index.{name}.rows"]) for name in INDEXES})
+            self._replay(self._snapshot["rows"])
+        else:
+            self._reset()
+            self._replay(0)
+
+    def _reset(self, tables: Optional[Dict[str, Dict[str, np.ndarray]]] = None,
+               indexes: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None):
+        self._tables = {name: _Table(dtypes, tables[name] if tables else None) for name, dtypes in TABLES.items()}
+        self._indexes = {name: _SortedIndex(*(indexes[name] if indexes else ())) for name in INDEXES}
+
+    def _replay(self, start: int):
+        """Aggregate the committed statements from row start on"""
+        offset = 0
+        for segment in self.segments:
+            end = offset + segment["rows"]
+            if end > start:
+                columns = self._segment(segment["name"])
+                for first in range(max(start - offset, 0), segment["rows"], self.batch_rows * 4):
+                    self._aggregate({name: np.asarray(column[first:first + self.batch_rows * 4])
+                                     for name, column in columns.items()})
+            offset = end
+
+    @property
+    def statements(self) -> int:
+        return sum(segment["rows"] for segment in self.segments) + self._pending_rows
+
+    @contextmanager
+    def _writer(self):
+        os.makedirs(self.store_dir, exist_ok=True)
+        with self._lock, open(os.path.join(self.store_dir, ".lock"), "w") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(os.path.join(self.store_dir, MANIFEST)) as file:
+                        generation = json.load(file).get("generation", 0)
+                except (OSError, ValueError):
+                    generation = 0
+                if generation != self.generation:
+                    self._load()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    # Ingestion
+
+    def ingest(self, path: str) -> Dict[str, int]:
+        """Ingest the statements added to a JSONL file, or to every JSONL file under a folder"""
+        if os.path.isdir(path):
+            paths = sorted(
+                os.path.join(directory, name)
+                for directory, _, names in os.walk(path)
+                if not os.path.basename(directory).startswith(".")
+                for name in names if name.endswith(STATEMENT_EXTENSIONS)
+            )
+        else:
+            paths = [path]
+        stats = {"files": 0, "statements": 0, "rejected": 0}
+        with self._writer():
+            for file_path in paths:
+                ingested, rejected = self._ingest_file(os.path.abspath(file_path))
+                stats["files"] += bool(ingested or rejected)
+                stats["statements"] += ingested
+                stats["rejected"] += rejected
+            self._commit()
+        return stats
+
+    def _ingest_file(self, path: str) -> Tuple[int, int]:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return 0, 0
+        position = self.files.get(path, {}).get("offset", 0)
+        if size == position:
+            return 0, 0
+        if size < position:
+            # Replaced or truncated rather than appended to: read it again from the start
+            position = 0
+        ingested = rejected = 0
+        with open(path, "rb") as handle:
+            handle.seek(position)
+            lines: List[bytes] = []
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break
+                position += len(line)
+                lines.append(line)
+                if len(lines) >= self.batch_rows:
+                    # The offset goes first so a commit inside the batch records it with the rows
+                    self.files[path] = {"offset": position}
+                    done, failed = self._ingest_lines(lines)
+                    ingested, rejected = ingested + done, rejected + failed
+                    lines = []
+            self.files[path] = {"offset": position}
+            done, failed = self._ingest_lines(lines)
+            ingested, rejected = ingested + done, rejected + failed
+        self._dirty = True
+        return ingested, rejected
+
+    def _ingest_lines(self, lines: List[bytes]) -> Tuple[int, int]:
+        rows = []
+        rejected = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                rows.append(flatten(_decode(line.decode("utf-8"))))
+            except (ValueError, KeyError, TypeError, AttributeError, IndexError):
+                rejected += 1
+        self.rejected += rejected
+        if not rows:
+            return 0, rejected
+        courses, modules, learners, verbs, timestamps, seconds, scores, completed = zip(*rows)
+        batch = {
+            "course": self._encode("course", courses), "module": self._encode("module", modules),
+            "learner": self._encode("learner", learners), "verb": self._encode("verb", verbs),
+            "timestamp": np.array(timestamps, np.int64), "seconds": np.array(seconds, np.float32),
+            "score": np.array(scores, np.float32), "completed": np.array(completed, np.bool_),
+        }
+        self._aggregate(batch)
+        self._pending.append(batch)
+        self._pending_rows += len(rows)
+        if self._pending_rows >= self.segment_rows:
+            self._commit()
+        return len(rows), rejected
+
+    def _encode(self, name: str, values: Tuple[str, ...]) -> np.ndarray:
+        codes, names = self._codes[name], self._names[name]
+        out = np.empty(len(values), np.int32)
+        for i, value in enumerate(values):
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(names)
+                names.append(value)
+            out[i] = code
+        return out
+
+    def _rows(self, name: str, keys: np.ndarray, **columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Row of each key in a table and which of them are new, appending rows for unseen keys"""
+        rows = self._indexes[name].get(keys)
+        new = rows < 0
+        if new.any():
+            rows[new] = self._tables[name].append(int(new.sum()), **{column: values[new]
+                                                                     for column, values in columns.items()})
+            self._indexes[name].add(keys[new], rows[new])
+        return rows, new
+
+    def _aggregate(self, batch: Dict[str, np.ndarray]):
+        course = batch["course"].astype(np.int64)
+        learner = batch["learner"].astype(np.int64)
+        scored = ~np.isnan(batch["score"])
+
+        unit_keys, unit_of = np.unique((course << 32) | batch["module"], return_inverse=True)
+        units, _ = self._rows("units", unit_keys, course=unit_keys >> 32, module=unit_keys & LOW_BITS)
+        cell_keys, inverse = np.unique((units[unit_of] << 32) | learner, return_inverse=True)
+        cell_units, cell_learners = cell_keys >> 32, cell_keys & LOW_BITS
+        cells, new_cells = self._rows("cells", cell_keys, unit=cell_units, learner=cell_learners)
+        if new_cells.any():
+            self._indexes["learners"].add((cell_learners[new_cells] << 32) | cell_units[new_cells], cells[new_cells])
+            enrolments = np.unique((self._tables["units"]["course"][cell_units[new_cells]].astype(np.int64) << 32)
+                                   | cell_learners[new_cells])
+            enrolled = self._indexes["enrolments"].get(enrolments) < 0
+            self._indexes["enrolments"].add(enrolments[enrolled], np.zeros(int(enrolled.sum()), np.int64))
+            self._tables["courses"].extend(len(self._names["course"]))
+            self._tables["courses"].columns["learners"][:len(self._names["course"])] += np.bincount(
+                enrolments[enrolled] >> 32, minlength=len(self._names["course"]))
+
+        size = len(cell_keys)
+        statements = np.bincount(inverse, minlength=size)
+        completions = np.bincount(inverse, batch["completed"], size)
+        seconds = np.bincount(inverse, batch["seconds"], size)
+        scores = np.bincount(inverse[scored], minlength=size)
+        score_sum = np.bincount(inverse[scored], batch["score"][scored], size)
+        score_max = np.full(size, np.nan, np.float32)
+        np.fmax.at(score_max, inverse[scored], batch["score"][scored])
+        last_seen = np.full(size, FILL["last_seen"], np.int64)
+        np.maximum.at(last_seen, inverse, batch["timestamp"])
+
+        table = self._tables["cells"].columns
+        completed = (table["completions"][cells] == 0) & (completions > 0)
+        table["statements"][cells] += statements.astype(np.int32)
+        table["completions"][cells] += completions.astype(np.int32)
+        table["seconds"][cells] += seconds.astype(np.float32)
+        table["scores"][cells] += scores.astype(np.int32)
+        table["score_sum"][cells] += score_sum.astype(np.float32)
+        table["score_max"][cells] = np.fmax(table["score_max"][cells], score_max)
+        table["last_seen"][cells] = np.maximum(table["last_seen"][cells], last_seen)
+
+        table, count = self._tables["units"].columns, self._tables["units"].count
+        for name, values in (("learners", new_cells), ("completed", completed), ("statements", statements),
+                             ("seconds", seconds), ("scores", scores), ("score_sum", score_sum)):
+            table[name][:count] += np.bincount(cell_units, values, count).astype(table[name].dtype)
+        np.fmax.at(table["score_max"], cell_units, score_max)
+        np.maximum.at(table["last_seen"], cell_units, last_seen)
+
+        day_keys, day_of = np.unique((course << 32) | np.maximum(batch["timestamp"] // DAY_MS, 0),
+                                     return_inverse=True)
+        days, _ = self._rows("days", day_keys, course=day_keys >> 32, day=day_keys & LOW_BITS)
+        table = self._tables["days"].columns
+        table["statements"][days] += np.bincount(day_of, minlength=len(day_keys))
+        table["completions"][days] += np.bincount(day_of, batch["completed"], len(day_keys)).astype(np.int64)
+
+    # Persistence
+
+    def commit(self):
+        """Write pending statements; ingest() commits on its own"""
+        with self._writer():
+            self._commit()
+
+    def rebuild(self):
+        """Recompute every aggregate from the stored statements"""
+        with self._writer():
+            self._commit()
+            self._reset()
+            self._replay(0)
+            self._dirty = True
+            self._commit(snapshot=True)
+
+    def _commit(self, snapshot: bool = False):
+        if not self._dirty:
+            return
+        segments = list(self.segments)
+        columns = {name: np.concatenate([batch[name] for batch in self._pending]) if self._pending
+                   else np.zeros(0, dtype) for name, dtype in COLUMNS.items()}
+        rows = len(columns["course"])
+        if rows and segments and segments[-1]["rows"] < self.segment_rows:
+            tail = self._segment(segments.pop()["name"])
+            columns = {name: np.concatenate([tail[name], columns[name]]) for name in COLUMNS}
+            rows = len(columns["course"])
+        for start in range(0, rows, self.segment_rows):
+            segments.append(self._write_segment({name: column[start:start + self.segment_rows]
+                                                 for name, column in columns.items()}))
+
+        generation = self.generation + 1
+        total = sum(segment["rows"] for segment in segments)
+        if snapshot or not self._snapshot or total - self._snapshot["rows"] >= self.snapshot_rows:
+            self._snapshot = {"name": f"aggregates-{generation:06d}.npz", "rows": total}
+            self._atomic(self._snapshot["name"], self._write_snapshot)
+        manifest = {
+            "version": STORE_VERSION, "generation": generation, "next_segment": self._next_segment,
+            "segments": segments, "snapshot": self._snapshot, "files": self.files, "rejected": self.rejected,
+            "dictionaries": self._names,
+        }
+        self._atomic(MANIFEST, lambda handle: handle.write(json.dumps(manifest).encode()))
+        self.generation, self.segments = generation, segments
+        self._pending, self._pending_rows, self._dirty = [], 0, False
+        self._remove_unreferenced()
+
+    def _write_snapshot(self, handle):
+        arrays = {f"{name}.{column}": values for name, table in self._tables.items()
+                  for column, values in table.arrays().items()}
+        for name, index in self._indexes.items():
+            index.merge()
+            arrays[f"index.{name}.keys"], arrays[f"index.{name}.rows"] = index.keys, index.rows
+        np.savez(handle, **arrays)
+
+    def _remove_unreferenced(self):
+        """Drop replaced segments and snapshots, and files left by an interrupted commit"""
+        referenced = {segment["name"] for segment in self.segments} | {self._snapshot["name"]}
+        for name in os.listdir(self.store_dir):
+            if name in referenced or not (name.startswith(("segment-", "aggregates-")) or name.endswith(".tmp")):
+                continue
+            self._mapped.pop(name, None)
+            path = os.path.join(self.store_dir, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+    def _write_segment(self, columns: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        name = f"segment-{self._next_segment:06d}"
+        self._next_segment += 1
+        directory = os.path.join(self.store_dir, name)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        for column, values in columns.items():
+            np.save(os.path.join(directory, f"{column}.npy"), values)
+        return {"name": name, "rows": len(columns["course"])}
+
+    def _atomic(self, name: str, write):
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                write(handle)
+            os.replace(tmp_path, os.path.join(self.store_dir, name))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _segment(self, name: str) -> Dict[str, np.ndarray]:
+        if name not in self._mapped:
+            directory = os.path.join(self.store_dir, name)
+            self._mapped[name] = {column: np.load(os.path.join(directory, f"{column}.npy"), mmap_mode="r")
+                                  for column in COLUMNS}
+        return self._mapped[name]
+
+    # Queries
+
+    def _code(self, name: str, value: str) -> int:
+        try:
+            return self._codes[name][value]
+        except KeyError:
+            raise KeyError(f"Unknown {name}: {value}") from None
+
+    def _summary(self, table: _Table, rows: np.ndarray, learners: int) -> Dict[str, Any]:
+        scores = int(table["scores"][rows].sum())
+        last = int(table["last_seen"][rows].max()) if len(rows) else None
+        statements = int(table["statements"][rows].sum())
+        seconds = float(table["seconds"][rows].sum())
+        return {
+            "learners": learners,
+            "statements": statements,
+            "time_on_task_hours": round(seconds / 3600, 2),
+            "mean_time_on_task_hours": round(seconds / learners / 3600, 2) if learners else None,
+            "mean_score": round(float(table["score_sum"][rows].sum()) / scores, 4) if scores else None,
+            "max_score": round(float(np.nanmax(table["score_max"][rows])), 4) if scores else None,
+            "last_activity": _iso(last) if last is not None else None,
+        }
+
+    def courses(self) -> List[str]:
+        with self._lock:
+            return list(self._names["course"])
+
+    def course(self, course: str) -> Dict[str, Any]:
+        """Course totals with a per-module breakdown
+
+        learners_completed counts learners with a completion statement about the
+        course itself; module completions count learners who completed the module.
+        """
+        with self._lock:
+            code = self._code("course", course)
+            units = self._tables["units"]
+            rows = self._indexes["units"].prefix(code)
+            in_module = units["module"][rows] != 0
+            summary = {"course": course,
+                       **self._summary(units, rows, int(self._tables["courses"]["learners"][code])),
+                       "learners_completed": int(units["completed"][rows[~in_module]].sum()),
+                       "completions": int(units["completed"][rows[in_module]].sum())}
+            summary["modules"] = [self._module(units, row) for row in rows[in_module].tolist()]
+            return summary
+
+    def _module(self, units: _Table, row: int) -> Dict[str, Any]:
+        learners = int(units["learners"][row])
+        return {
+            "module": self._names["module"][units["module"][row]],
+            **self._summary(units, np.array([row]), learners),
+            "completions": int(units["completed"][row]),
+            "completion_rate": round(int(units["completed"][row]) / learners, 4) if learners else None,
+        }
+
+    def module(self, course: str, module: str) -> Dict[str, Any]:
+        """Totals of one module of a course"""
+        with self._lock:
+            key = (self._code("course", course) << 32) | self._code("module", module)
+            row = int(self._indexes["units"].get(np.array([key], np.int64))[0])
+            if row < 0:
+                raise KeyError(f"Unknown module: {module}")
+            return {"course": course, **self._module(self._tables["units"], row)}
+
+    def learner(self, learner: str, course: Optional[str] = None) -> Dict[str, Any]:
+        """A learner's progress per course and module"""
+        with self._lock:
+            cells, units = self._tables["cells"], self._tables["units"]
+            rows = self._indexes["learners"].prefix(self._code("learner", learner))
+            if course is not None:
+                rows = rows[units["course"][cells["unit"][rows]] == self._code("course", course)]
+            progress = []
+            for row in rows.tolist():
+                unit, scores = cells["unit"][row], int(cells["scores"][row])
+                progress.append({
+                    "course": self._names["course"][units["course"][unit]],
+                    "module": self._names["module"][units["module"][unit]],
+                    "statements": int(cells["statements"][row]),
+                    "completed": bool(cells["completions"][row]),
+                    "time_on_task_hours": round(float(cells["seconds"][row]) / 3600, 2),
+                    "mean_score": round(float(cells["score_sum"][row]) / scores, 4) if scores else None,
+                    "max_score": round(float(cells["score_max"][row]), 4) if scores else None,
+                    "last_activity": _iso(int(cells["last_seen"][row])),
+                })
+            summary = self._summary(cells, rows, 1)
+            del summary["learners"], summary["mean_time_on_task_hours"]
+            return {"learner": learner, **summary, "completions": int(np.count_nonzero(cells["completions"][rows])),
+                    "progress": progress}
+
+    def activity(self, course: str, since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Statements and completions per UTC day for a course, optionally from since and before until"""
+        with self._lock:
+            days = self._tables["days"]
+            rows = self._indexes["days"].prefix(self._code("course", course))
+            day = days["day"][rows].astype(np.int64)
+            keep = np.ones(len(rows), bool)
+            if since:
+                keep &= day >= parse_timestamp(since) // DAY_MS
+            if until:
+                keep &= day * DAY_MS < parse_timestamp(until)
+            return [{"date": _iso(int(day[i]) * DAY_MS)[:10], "statements": int(days["statements"][row]),
+                     "completions": int(days["completions"][row])}
+                    for i, row in zip(np.flatnonzero(keep).tolist(), rows[keep].tolist())]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = 0
+            for directory, _, names in os.walk(self.store_dir):
+                size += sum(os.path.getsize(os.path.join(directory, name)) for name in names)
+            return {
+                "statements": self.statements,
+                "rejected": self.rejected,
+                "segments": len(self.segments),
+                "snapshot_statements": self._snapshot["rows"] if self._snapshot else 0,
+                "units": self._tables["units"].count,
+                "cells": self._tables["cells"].count,
+                **{f"{name}s": len(values) for name, values in self._names.items()},
+                "files": len(self.files),
+                "store_bytes": size,
+            }
+
+
+def _iso(milliseconds: int) -> str:
+    return datetime.fromtimestamp(milliseconds / 1000, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+_engines: Dict[str, XapiAnalytics] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(store_dir: str) -> XapiAnalytics:
+    """Process-wide XapiAnalytics for a store, loaded from disk on first use"""
+    store_dir = os.path.abspath(store_dir)
+    with _engines_lock:
+        if store_dir not in _engines:
+            _engines[store_dir] = XapiAnalytics(store_dir)
+        return _engines[store_dir]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m agents.tools.xapi_analytics", description="xAPI analytics")
+    parser.add_argument("--store", default=os.getenv("XAPI_STORE_DIR", "xapi_store"))
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("ingest").add_argument("path", nargs="?", default=os.getenv("XAPI_STATEMENTS_DIR", "xapi"))
+    commands.add_parser("stats")
+    course = commands.add_parser("course")
+    course.add_argument("course")
+    course.add_argument("--module")
+    learner = commands.add_parser("learner")
+    learner.add_argument("learner")
+    learner.add_argument("--course")
+    activity = commands.add_parser("activity")
+    activity.add_argument("course")
+    activity.add_argument("--since")
+    activity.add_argument("--until")
+    args = parser.parse_args(argv)
+
+    engine = XapiAnalytics(args.store)
+    try:
+        if args.command == "ingest":
+            result: Any = engine.ingest(args.path)
+        elif args.command == "stats":
+            result = engine.stats()
+        elif args.command == "course":
+            result = engine.module(args.course, args.module) if args.module else engine.course(args.course)
+        elif args.command == "learner":
+            result = engine.learner(args.learner, args.course)
+        else:
+            result = engine.activity(args.course, args.since, args.until)
+    except KeyError as e:
+        parser.exit(1, f"{e.args[0]}\n")
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
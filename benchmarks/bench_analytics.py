@@ -0,0 +1,138 @@
+# benchmarks/bench_analytics.py
+"""Ingestion rate and query latency of the xAPI analytics engine
+
+Writes --statements synthetic xAPI statements (learners enrolled in up to
+--enrolments courses launching, progressing and completing their modules with scores
+and durations) as JSONL files, ingests them, reopens the store, then times course,
+module, learner and daily-activity queries. A final append of --tail statements shows incremental ingestion resuming from the
+stored offsets.
+
+Run from the repository root: python benchmarks/bench_analytics.py [--statements 1000000]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.tools.xapi_analytics import XapiAnalytics  # noqa: E402
+
+VERBS = ["launched", "progressed", "experienced", "answered", "completed", "passed"]
+START = 1_767_225_600  # 2026-01-01T00:00:00Z
+
+
+def write_statements(path: str, count: int, courses: int, modules: int, learners: int, seed: int,
+                     enrolments: int = 3):
+    """JSONL of count statements spread over the given courses, modules and learners"""
+    rng = random.Random(seed)
+    template = ('{{"actor":{{"account":{{"homePage":"https://lms.example.com","name":"learner-{learner}"}}}},'
+                '"verb":{{"id":"http://adlnet.gov/expapi/verbs/{verb}"}},'
+                '"object":{{"id":"https://courses.example.com/course-{course}/module-{module}"}},'
+                '"context":{{"contextActivities":{{"grouping":[{{"id":"https://courses.example.com/course-{course}"}}]}}}},'
+                '"result":{result},"timestamp":"{timestamp}"}}\n')
+    with open(path, "w") as file:
+        for _ in range(count):
+            learner = rng.randrange(learners)
+            verb = rng.choice(VERBS)
+            result = {"duration": f"PT{rng.randint(1, 90)}M{rng.randint(0, 59)}S"}
+            if verb in ("answered", "passed"):
+                result["score"] = {"scaled": round(rng.random(), 2)}
+            if verb == "completed":
+                result["completion"] = True
+            moment = time.gmtime(START + rng.randint(0, 90 * 86_400))
+            file.write(template.format(
+                learner=learner, verb=verb, course=(learner * 7919 + rng.randrange(enrolments)) % courses,
+                module=rng.randrange(modules), result=json.dumps(result, separators=(",", ":")),
+                timestamp=time.strftime("%Y-%m-%dT%H:%M:%SZ", moment)))
+
+
+def timed(query, repeat: int) -> dict:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(latencies), 3), "max_ms": round(max(latencies), 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--statements", type=int, default=1_000_000)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--modules", type=int, default=12)
+    parser.add_argument("--learners", type=int, default=20_000)
+    parser.add_argument("--enrolments", type=int, default=3, help="courses per learner")
+    parser.add_argument("--tail", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--json", help="also write the results to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-xapi-") as directory:
+        statements_dir = os.path.join(directory, "statements")
+        os.makedirs(statements_dir)
+        start = time.perf_counter()
+        for i in range(args.files):
+            write_statements(os.path.join(statements_dir, f"statements-{i}.jsonl"), args.statements // args.files,
+                             args.courses, args.modules, args.learners, seed=i, enrolments=args.enrolments)
+        generated = time.perf_counter() - start
+
+        engine = XapiAnalytics(os.path.join(directory, "store"))
+        start = time.perf_counter()
+        ingested = engine.ingest(statements_dir)
+        ingest_s = time.perf_counter() - start
+
+        write_statements(os.path.join(statements_dir, "statements-tail.jsonl"), args.tail,
+                         args.courses, args.modules, args.learners, seed=args.files, enrolments=args.enrolments)
+        start = time.perf_counter()
+        tail = engine.ingest(statements_dir)
+        tail_s = time.perf_counter() - start
+
+        reopened = time.perf_counter()
+        engine = XapiAnalytics(os.path.join(directory, "store"))
+        reopen_s = time.perf_counter() - reopened
+
+        rng = random.Random(0)
+        course = lambda: f"https://courses.example.com/course-{rng.randrange(args.courses)}"  # noqa: E731
+
+        def module():
+            name = course()
+            return name, f"{name}/module-{rng.randrange(args.modules)}"
+
+        learner = lambda: f"https://lms.example.com|learner-{rng.randrange(args.learners)}"  # noqa: E731
+        queries = {
+            "course": timed(lambda: engine.course(course()), args.repeat),
+            "module": timed(lambda: engine.module(*module()), args.repeat),
+            "learner": timed(lambda: engine.learner(learner()), args.repeat),
+            "activity": timed(lambda: engine.activity(course()), args.repeat),
+        }
+        results = {
+            "statements": ingested["statements"],
+            "generate_s": round(generated, 2),
+            "ingest_s": round(ingest_s, 2),
+            "statements_per_s": round(ingested["statements"] / ingest_s),
+            "tail_statements": tail["statements"],
+            "tail_ingest_s": round(tail_s, 3),
+            "reopen_s": round(reopen_s, 3),
+            "store": engine.stats(),
+            "queries": queries,
+        }
+
+    print(f"ingested {results['statements']} statements in {results['ingest_s']:.2f}s "
+          f"({results['statements_per_s']} /s); tail of {results['tail_statements']} in {results['tail_ingest_s']:.3f}s")
+    print(f"store {results['store']['store_bytes'] / 1e6:.1f} MB, {results['store']['cells']} cells, "
+          f"reopened in {results['reopen_s']:.3f}s")
+    for name, latency in queries.items():
+        print(f"{name:>9} median {latency['median_ms']:>8.3f} ms  max {latency['max_ms']:>8.3f} ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_cold_start.py
+"""Cold-start latency of InstructionalDesignCrew: imports, construction and first agent builds
+
+Run from the repository root: python benchmarks/bench_cold_start.py [--repeat N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executed in a fresh interpreter so that every measurement is a true cold start
+PROBE = r"""
+import json, time
+timings = {}
+
+start = time.perf_counter()
+from crew_manager import InstructionalDesignCrew
+timings["import crew_manager"] = time.perf_counter() - start
+
+start = time.perf_counter()
+crew = InstructionalDesignCrew()
+timings["construct crew"] = time.perf_counter() - start
+
+start = time.perf_counter()
+crew.discovery_agent.get_agent()
+timings["first agent build"] = time.perf_counter() - start
+
+start = time.perf_counter()
+for wrapper in (crew.architect_agent, crew.lab_engineer, crew.content_creator,
+                crew.qa_agent, crew.deployment_agent):
+    wrapper.get_agent()
+timings["remaining agent builds"] = time.perf_counter() - start
+
+crew.close()
+start = time.perf_counter()
+with InstructionalDesignCrew() as second:
+    for wrapper in (second.discovery_agent, second.architect_agent, second.lab_engineer,
+                    second.content_creator, second.qa_agent, second.deployment_agent):
+        wrapper.get_agent()
+timings["second crew from pool"] = time.perf_counter() - start
+
+print(json.dumps(timings))
+"""
+
+
+def run_probe() -> dict:
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    completed = subprocess.run([sys.executable, "-c", PROBE], cwd=REPO_ROOT, env=env,
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    runs = [run_probe() for _ in range(args.repeat)]
+    summary = {
+        stage: {
+            "median_ms": statistics.median(run[stage] for run in runs) * 1000,
+            "max_ms": max(run[stage] for run in runs) * 1000
+        }
+        for stage in runs[0]
+    }
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"{'stage':<26}{'median ms':>12}{'max ms':>12}")
+    for stage, stats in summary.items():
+        print(f"{stage:<26}{stats['median_ms']:>12.1f}{stats['max_ms']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
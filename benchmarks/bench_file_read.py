@@ -0,0 +1,89 @@
+# benchmarks/bench_file_read.py
+"""Latency and memory of FileReadTool's chunked reader on files from 1 MB to 1 GB
+
+Run from the repository root: python benchmarks/bench_file_read.py [--sizes-mb 1 16 128 1024]
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.tools.file_reader import ChunkedFileReader, _cached_index  # noqa: E402
+
+LINE = "2024-01-01T00:00:00Z INFO stakeholder export row {:>10} lorem ipsum dolor sit amet\n"
+
+
+def write_file(path: str, size_mb: int) -> int:
+    """Write roughly size_mb of log-like lines and return the number of lines"""
+    target = size_mb * 1024 * 1024
+    lines = 0
+    with open(path, "w", encoding="utf-8") as file:
+        written = 0
+        block = []
+        while written < target:
+            row = LINE.format(lines)
+            block.append(row)
+            written += len(row)
+            lines += 1
+            if len(block) == 10000:
+                file.write("".join(block))
+                block = []
+        file.write("".join(block))
+    return lines
+
+
+def timed(func, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench(path: str, lines: int, samples: int) -> dict:
+    reader = ChunkedFileReader()
+    size = os.path.getsize(path)
+    rng = random.Random(0)
+    offsets = [rng.randrange(0, size) for _ in range(samples)]
+    line_numbers = [rng.randrange(1, lines) for _ in range(samples)]
+
+    _cached_index.cache_clear()
+    results = {
+        "first chunk ms": timed(lambda: reader.read(path), repeat=samples),
+        "random 4KB range ms": timed(lambda: [reader.read(path, offset=o, length=4096) for o in offsets]) / samples,
+        "index build ms": timed(lambda: reader.read(path, start_line=1, end_line=1)),
+    }
+    results["random line ms"] = timed(
+        lambda: [reader.read(path, start_line=n, end_line=n + 10) for n in line_numbers]) / samples
+    results["peak rss MB"] = peak_rss_mb()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[1, 16, 128, 1024])
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'size MB':>8}{'first chunk ms':>16}{'4KB range ms':>14}{'index build ms':>16}"
+          f"{'line seek ms':>14}{'peak rss MB':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size_mb in args.sizes_mb:
+            path = os.path.join(directory, f"export_{size_mb}mb.log")
+            lines = write_file(path, size_mb)
+            r = bench(path, lines, args.samples)
+            print(f"{size_mb:>8}{r['first chunk ms']:>16.3f}{r['random 4KB range ms']:>14.3f}"
+                  f"{r['index build ms']:>16.1f}{r['random line ms']:>14.3f}{r['peak rss MB']:>13.1f}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/bench_jobs.py
+"""Load test of the SQLite job queue: course throughput as the worker pool grows
+
+For each worker count, a fresh queue receives --jobs course requests and a
+WorkerPool drains it with crews backed by the deterministic fake LLM. Throughput
+is measured from submitting the jobs, once every worker has started and built its
+crew, to the last job finishing; start-up is reported separately. With --crash, one worker is killed
+while it holds a job to show the job being requeued and finished by another.
+
+Run from the repository root: python benchmarks/bench_jobs.py [--jobs 32] [--workers 1,2,4,8]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.pop("SCORM_PACKAGE_DIR", None)
+
+from benchmarks.bench_pipeline import course_inputs  # noqa: E402
+from pipeline.jobs import DONE, RUNNING, JobQueue, WorkerPool  # noqa: E402
+
+
+def fake_crew(latency: float, build_agents: bool):
+    """Crew factory run inside each worker process"""
+    from benchmarks.fake_llm import FakeLLM
+    from crew_manager import InstructionalDesignCrew
+
+    FakeLLM(latency=latency, build_agents=build_agents).install()
+    return InstructionalDesignCrew()
+
+
+def kill_busy_worker(pool: WorkerPool, queue: JobQueue) -> str:
+    while True:
+        running = queue.jobs(RUNNING)
+        if running and running[0].worker in pool.processes:
+            pool.processes[running[0].worker].kill()
+            return running[0].id
+        time.sleep(0.05)
+
+
+def run_level(workers: int, jobs: int, latency: float, build_agents: bool, crash: bool) -> dict:
+    with tempfile.TemporaryDirectory(prefix="bench-jobs-") as directory:
+        path = os.path.join(directory, "jobs.db")
+        queue = JobQueue(path, lease_seconds=30)
+        pool = WorkerPool(path, workers, partial(fake_crew, latency, build_agents),
+                          lease_seconds=30, poll_interval=0.05)
+        killed = None
+        start = time.perf_counter()
+        with pool:
+            pool.wait_ready()
+            startup = time.perf_counter() - start
+            submitted = time.time()
+            queue.submit_many([course_inputs(i) for i in range(jobs)])
+            if crash:
+                killed = kill_busy_worker(pool, queue)
+            pool.supervise(until_empty=True, interval=0.05)
+
+        finished = queue.jobs()
+        done = [job for job in finished if job.status == DONE]
+        window = max(job.finished for job in done) - submitted if done else 0.0
+        return {
+            "workers": workers,
+            "jobs": jobs,
+            "done": len(done),
+            "failed": len(finished) - len(done),
+            "retried": sum(job.attempts > 1 for job in finished),
+            "killed_job": killed,
+            "restarts": pool.restarts,
+            "startup_s": round(startup, 3),
+            "processing_s": round(window, 3),
+            "jobs_per_s": round(len(done) / window, 2) if window else None,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=32)
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated pool sizes")
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds per fake LLM call")
+    parser.add_argument("--real-agents", action="store_true", help="build real crewai agents in each worker")
+    parser.add_argument("--crash", action="store_true", help="kill one busy worker per level")
+    parser.add_argument("--json", help="also write the results to this path")
+    args = parser.parse_args()
+
+    rows = []
+    print(f"{'workers':>7} {'done':>5} {'retried':>7} {'startup s':>9} {'proc s':>7} {'jobs/s':>7} {'speedup':>7}")
+    for workers in (int(level) for level in args.workers.split(",")):
+        row = run_level(workers, args.jobs, args.latency, args.real_agents, args.crash)
+        row["speedup"] = round(row["jobs_per_s"] / rows[0]["jobs_per_s"], 2) if rows else 1.0
+        rows.append(row)
+        print(f"{row['workers']:>7} {row['done']:>5} {row['retried']:>7} {row['startup_s']:>9.2f} "
+              f"{row['processing_s']:>7.2f} {row['jobs_per_s']:>7.2f} {row['speedup']:>7.2f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"latency_s": args.latency, "levels": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
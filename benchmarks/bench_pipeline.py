@@ -0,0 +1,129 @@
+# benchmarks/bench_pipeline.py
+"""End-to-end pipeline benchmark against a deterministic fake LLM, with no network access
+
+For each concurrency level N, N distinct courses are created with max_concurrency=N
+and the script reports wall time, orchestration overhead (wall time during which
+no LLM call was in flight), peak Python memory and throughput.
+
+Run from the repository root: python benchmarks/bench_pipeline.py [--latency 0.05] [--levels 1,2,4,...,64]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.pop("SCORM_PACKAGE_DIR", None)
+
+from benchmarks.fake_llm import FakeLLM  # noqa: E402
+from crew_manager import InstructionalDesignCrew  # noqa: E402
+
+TOPICS = ["Kubernetes", "Terraform", "PostgreSQL", "Kafka", "Rust", "React", "Ansible", "Prometheus"]
+
+
+def course_inputs(index: int) -> dict:
+    return {
+        "course_topic": f"{TOPICS[index % len(TOPICS)]} for Operators #{index}",
+        "target_audience": "Platform engineers",
+        "business_context": f"Cohort {index} onboarding",
+        "timeline": "4 weeks",
+    }
+
+
+def create_courses(crew: InstructionalDesignCrew, courses: int, executor: str) -> float:
+    inputs_list = [course_inputs(i) for i in range(courses)]
+    gc.collect()
+    start = time.perf_counter()
+    results = list(crew.create_courses(inputs_list, max_concurrency=courses, executor=executor))
+    failures = [result for result in results if not result.ok]
+    if failures:
+        raise RuntimeError(f"{len(failures)} of {courses} courses failed: {failures[0].error!r}")
+    return start
+
+
+def run_level(crew: InstructionalDesignCrew, llm: FakeLLM, courses: int, executor: str,
+              trace_memory: bool) -> dict:
+    llm.reset()
+    start = create_courses(crew, courses, executor)
+    wall = time.perf_counter() - start
+    calls = llm.calls
+    busy = llm.busy_time(start, start + wall)
+    peak = None
+    if trace_memory:
+        # A separate pass, since tracing every allocation distorts the timings
+        tracemalloc.start()
+        create_courses(crew, courses, executor)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {
+        "courses": courses,
+        "wall_s": round(wall, 4),
+        "llm_calls": calls,
+        "llm_busy_s": round(busy, 4),
+        "overhead_s": round(wall - busy, 4),
+        "overhead_pct": round(100 * (wall - busy) / wall, 1),
+        "courses_per_s": round(courses / wall, 2),
+        "peak_mb": round(peak / 2**20, 1) if peak is not None else None,
+    }
+
+
+def run_single() -> dict:
+    """One course through the sequential and the DAG-scheduled entry points"""
+    timings = {}
+    with InstructionalDesignCrew() as crew:
+        # Warm-up so imports and first agent builds are not charged to the measurements
+        crew.create_course(course_inputs(0))
+        start = time.perf_counter()
+        crew.create_course(course_inputs(0))
+        timings["create_course_s"] = round(time.perf_counter() - start, 4)
+        start = time.perf_counter()
+        result = asyncio.run(crew.create_course_async(course_inputs(0)))
+        timings["create_course_async_s"] = round(time.perf_counter() - start, 4)
+        timings["critical_path"] = result["critical_path"]
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per fake LLM call")
+    parser.add_argument("--jitter", type=float, default=0.0, help="uniform +/- seconds per call")
+    parser.add_argument("--levels", default="1,2,4,8,16,32,64", help="comma-separated course counts")
+    parser.add_argument("--executor", choices=["thread", "asyncio"], default="thread")
+    parser.add_argument("--list-items", type=int, default=4, help="items per list/dict in fake outputs")
+    parser.add_argument("--text-words", type=int, default=40, help="words per string in fake outputs")
+    parser.add_argument("--stub-agents", action="store_true",
+                        help="skip building real crewai agents (isolates orchestration from crewai)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass per level")
+    parser.add_argument("--json", help="also write the results to this path")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.levels.split(",")]
+    llm = FakeLLM(latency=args.latency, jitter=args.jitter, list_items=args.list_items,
+                  text_words=args.text_words, build_agents=not args.stub_agents)
+    report = {"latency_s": args.latency, "executor": args.executor, "levels": []}
+    with llm:
+        report["single_course"] = run_single()
+        print(f"single course: {report['single_course']}")
+        print(f"{'courses':>7} {'wall s':>8} {'calls':>6} {'llm s':>8} {'overhead s':>10} "
+              f"{'ovh %':>6} {'course/s':>8} {'peak MB':>8}")
+        with InstructionalDesignCrew() as crew:
+            for courses in levels:
+                row = run_level(crew, llm, courses, args.executor, not args.no_memory)
+                report["levels"].append(row)
+                print(f"{row['courses']:>7} {row['wall_s']:>8.3f} {row['llm_calls']:>6} "
+                      f"{row['llm_busy_s']:>8.3f} {row['overhead_s']:>10.3f} {row['overhead_pct']:>6.1f} "
+                      f"{row['courses_per_s']:>8.2f} {str(row['peak_mb']):>8}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
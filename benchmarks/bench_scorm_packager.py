@@ -0,0 +1,63 @@
+# benchmarks/bench_scorm_packager.py
+"""Throughput and memory of ScormPackager on a course with thousands of assets
+
+Run from the repository root: python benchmarks/bench_scorm_packager.py [--assets 5000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.tools.scorm_packager import ScormPackager  # noqa: E402
+
+SECTIONS = ["presentations", "lab_guides", "assessments", "video_scripts", "code_examples",
+            "supporting_materials"]
+WORDS = ("pod deployment service ingress namespace kubectl helm chart node cluster volume "
+         "secret configmap replica rollout probe").split()
+
+
+def make_course(assets: int, shared_ratio: float, body_words: int, seed: int = 0) -> dict:
+    """Synthetic ContentAssets where shared_ratio of the items reuse a common module"""
+    rng = random.Random(seed)
+    shared = [{"title": f"Shared module {i}", "body": " ".join(rng.choices(WORDS, k=body_words))}
+              for i in range(20)]
+    course = {section: [] for section in SECTIONS}
+    for i in range(assets):
+        section = SECTIONS[i % len(SECTIONS)]
+        if rng.random() < shared_ratio:
+            course[section].append(dict(rng.choice(shared)))
+        else:
+            course[section].append({"title": f"{section} {i}", "body": " ".join(rng.choices(WORDS, k=body_words))})
+    return course
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--assets", type=int, default=5000)
+    parser.add_argument("--shared-ratio", type=float, default=0.3)
+    parser.add_argument("--body-words", type=int, default=800)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    course = make_course(args.assets, args.shared_ratio, args.body_words)
+    print(f"{args.assets} assets, {args.shared_ratio:.0%} shared, ~{args.body_words} words each")
+    print(f"{'workers':>8}{'seconds':>10}{'assets/s':>11}{'unique':>9}{'dedup':>8}"
+          f"{'MB in':>9}{'MB out':>9}{'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for workers in args.workers:
+            output = os.path.join(directory, f"course_{workers}.zip")
+            tracemalloc.start()
+            report = ScormPackager(workers=workers).package(course, output)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{workers:>8}{report.seconds:>10.2f}{report.items / report.seconds:>11.0f}"
+                  f"{report.unique_assets:>9}{report.dedup_ratio:>8.2f}"
+                  f"{report.bytes_uncompressed / 1e6:>9.1f}{report.bytes_written / 1e6:>9.1f}{peak / 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# benchmarks/fake_llm.py
+"""Deterministic offline stand-in for the LLM behind every crewai agent
+
+Installing a FakeLLM routes every agent the pool builds through FakeAgent, whose
+kickoff sleeps for a configurable latency and returns a schema-valid instance of
+the requested response_format derived from a hash of the prompt. No network
+access is needed and identical prompts always produce identical artifacts.
+
+With prefix_cache on, the fake also models a provider-side prompt cache: a prompt
+sharing a prefix of at least CACHE_MIN_CHARS with an earlier one reports the
+shared part, in CACHE_BLOCK_CHARS steps, as cached_prompt_tokens and is answered
+faster in proportion.
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+import typing
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from agents.context import estimate_tokens
+from agents.pool import agent_pool
+
+CACHE_BLOCK_CHARS = 512
+CACHE_MIN_CHARS = 4096
+
+WORDS = ("course module lab learner objective assessment cluster container deploy pipeline "
+         "security network storage monitor scale policy review exercise scenario outcome").split()
+
+
+def fake_value(annotation: Any, rng: random.Random, list_items: int, text_words: int) -> Any:
+    """A deterministic value of the given type annotation"""
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Union:
+        return fake_value(next(arg for arg in args if arg is not type(None)), rng, list_items, text_words)
+    if origin in (list, List):
+        return [fake_value(args[0], rng, list_items, text_words) for _ in range(list_items)]
+    if origin in (dict, Dict):
+        return {f"{rng.choice(WORDS)}_{i}": fake_value(args[1], rng, list_items, text_words)
+                for i in range(list_items)}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return fake_model(annotation, rng, list_items, text_words)
+    if annotation is bool:
+        return rng.random() < 0.5
+    if annotation is int:
+        return rng.randint(1, 100)
+    if annotation is float:
+        return round(rng.uniform(0, 100), 2)
+    return " ".join(rng.choices(WORDS, k=text_words))
+
+
+@lru_cache(maxsize=None)
+def _response_format(model: type) -> str:
+    from crewai.utilities.i18n import I18N_DEFAULT
+    from crewai.utilities.pydantic_schema_utils import generate_model_description
+
+    return I18N_DEFAULT.slice("lite_agent_response_format").format(
+        response_format=json.dumps(generate_model_description(model), indent=2))
+
+
+def fake_model(model: type, rng: random.Random, list_items: int, text_words: int) -> BaseModel:
+    """A deterministic instance of a pydantic model"""
+    return model(**{name: fake_value(field.annotation, rng, list_items, text_words)
+                    for name, field in model.model_fields.items()})
+
+
+class FakeAgent:
+    """Proxy for a built crewai Agent whose kickoff never reaches an LLM"""
+
+    def __init__(self, agent: Any, llm: "FakeLLM"):
+        self._agent = agent
+        self._llm = llm
+        self._system: Optional[str] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._agent, name)
+
+    def system_prompt(self, response_format: Optional[type] = None) -> str:
+        """The system message crewai's LiteAgent sends ahead of every prompt"""
+        from crewai.utilities.agent_utils import get_tool_names, parse_tools, render_text_description_and_args
+        from crewai.utilities.i18n import I18N_DEFAULT
+
+        if self._system is None:
+            fields = {name: getattr(self._agent, name, "") for name in ("role", "backstory", "goal")}
+            tools = parse_tools(getattr(self._agent, "tools", None) or [])
+            if tools:
+                self._system = I18N_DEFAULT.slice("lite_agent_system_prompt_with_tools").format(
+                    tools=render_text_description_and_args(tools), tool_names=get_tool_names(tools), **fields)
+            else:
+                self._system = I18N_DEFAULT.slice("lite_agent_system_prompt_without_tools").format(**fields)
+        return self._system + (_response_format(response_format) if response_format is not None else "")
+
+    def kickoff(self, messages: Any, response_format: Optional[type] = None, **kwargs) -> Any:
+        from crewai.lite_agent_output import LiteAgentOutput
+
+        prompt = messages if isinstance(messages, str) else str(messages)
+        sent = f"{self.system_prompt(response_format)}\n\n{prompt}"
+        name = response_format.__name__ if response_format else ""
+        seed = hashlib.sha256(f"{self._llm.seed}\0{name}\0{prompt}".encode()).digest()
+        rng = random.Random(seed)
+        cached = self._llm.cached_prefix(sent)
+        self._llm.wait(rng, cached / len(sent))
+        output = (fake_model(response_format, rng, self._llm.list_items, self._llm.text_words)
+                  if response_format else None)
+        raw = output.model_dump_json() if output else " ".join(rng.choices(WORDS, k=self._llm.text_words))
+        usage = {"prompt_tokens": estimate_tokens(sent), "completion_tokens": estimate_tokens(raw),
+                 "cached_prompt_tokens": estimate_tokens(sent[:cached]) if cached else 0,
+                 "successful_requests": 1}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        return LiteAgentOutput(raw=raw, pydantic=output, agent_role=getattr(self._agent, "role", ""),
+                               usage_metrics=usage)
+
+
+class FakeLLM:
+    """Latency model and call log shared by every FakeAgent it creates"""
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, seed: int = 0,
+                 list_items: int = 4, text_words: int = 40, build_agents: bool = True,
+                 prefix_cache: bool = False, prefill_share: float = 0.5):
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+        self.list_items = list_items
+        self.text_words = text_words
+        self.build_agents = build_agents
+        self.prefix_cache = prefix_cache
+        # Fraction of a call's latency spent on the prompt, which a fully cached prompt skips
+        self.prefill_share = prefill_share
+        self.intervals: List[Tuple[float, float]] = []
+        self._prefixes: set = set()
+        self._lock = threading.Lock()
+
+    def factory(self, key: str, build: Callable[[], Any]) -> FakeAgent:
+        """AgentPool factory wrapping the real agent, or a bare stub when build_agents is off"""
+        # Pay for crewai's import here, where a real build would, rather than in the first kickoff
+        import crewai.lite_agent_output  # noqa: F401
+
+        agent = build() if self.build_agents else _StubAgent(key)
+        return FakeAgent(agent, self)
+
+    def install(self) -> "FakeLLM":
+        agent_pool.use_factory(self.factory)
+        return self
+
+    def uninstall(self):
+        agent_pool.use_factory(None)
+
+    def __enter__(self) -> "FakeLLM":
+        return self.install()
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    def cached_prefix(self, prompt: str) -> int:
+        """Characters of prompt served from the simulated prefix cache, remembering its prefixes"""
+        if not self.prefix_cache:
+            return 0
+        digest, cached, seen = hashlib.sha256(), 0, []
+        data = prompt.encode("utf-8")
+        for end in range(CACHE_BLOCK_CHARS, len(data) + 1, CACHE_BLOCK_CHARS):
+            digest.update(data[end - CACHE_BLOCK_CHARS:end])
+            seen.append((end, digest.copy().hexdigest()))
+        with self._lock:
+            for end, key in seen:
+                if end >= CACHE_MIN_CHARS and key in self._prefixes:
+                    cached = end
+            self._prefixes.update(key for _, key in seen)
+        return len(data[:cached].decode("utf-8", errors="ignore"))
+
+    def wait(self, rng: random.Random, cached_share: float = 0.0):
+        delay = max(0.0, self.latency + rng.uniform(-self.jitter, self.jitter))
+        delay *= 1 - self.prefill_share * cached_share
+        start = time.perf_counter()
+        time.sleep(delay)
+        with self._lock:
+            self.intervals.append((start, time.perf_counter()))
+
+    def reset(self):
+        with self._lock:
+            self.intervals = []
+            self._prefixes = set()
+
+    @property
+    def calls(self) -> int:
+        return len(self.intervals)
+
+    def busy_time(self, start: float = float("-inf"), end: float = float("inf")) -> float:
+        """Wall time within [start, end] during which at least one fake call was in flight"""
+        total, current_start, current_end = 0.0, None, None
+        for left, right in sorted(self.intervals):
+            left, right = max(left, start), min(right, end)
+            if right <= left:
+                continue
+            if current_end is None or left > current_end:
+                if current_end is not None:
+                    total += current_end - current_start
+                current_start, current_end = left, right
+            else:
+                current_end = max(current_end, right)
+        if current_end is not None:
+            total += current_end - current_start
+        return total
+
+
+class _StubAgent:
+    def __init__(self, key: str):
+        self.role = key.rsplit(".", 1)[-1]
+        self.llm = "fake-llm"
@@ -1,51 +1,321 @@
 # crew_manager.py
-from crewai import Crew, Process
 from agents.discovery_agent import DiscoveryAgent
 from agents.content_architect_agent import ContentArchitectAgent
 from agents.lab_engineer_agent import LabEngineerAgent
-from agents.content_creation_agent import ContentCreationAgent
+from agents.content_creation_agent import ContentCreationAgent, ContentAssets, BLUEPRINT_SECTIONS, LAB_SECTIONS
 from agents.quality_assurance_agent import QualityAssuranceAgent
 from agents.deployment_agent import DeploymentAgent
-from typing import Dict, Any
+from agents.context import ContextProjector
+from agents.instrumentation import instrumentation
+from agents.phase_cache import PhaseCache
+from agents.pool import release_agents
+from pipeline.asset_store import AssetStore
+from pipeline.batch import CourseResult, run_batch
+from pipeline.checkpoint import CheckpointStore, INPUTS
+from pipeline.fingerprint import fingerprint, phase_key, select
+from pipeline.scheduler import Phase, PhaseScheduler, PhaseTiming
+from typing import Dict, Any, AsyncIterator, Callable, Iterable, Iterator, List, Optional, Tuple
+from collections import Counter
+from functools import partial
+import time
+
+# Artifacts returned by create_course, in the order they are produced
+PHASES = ["requirements", "blueprint", "lab_environment", "content_assets", "qa_report", "deployment_package"]
 
 class InstructionalDesignCrew:
-    def __init__(self):
-        self.discovery_agent = DiscoveryAgent()
-        self.architect_agent = ContentArchitectAgent()
-        self.lab_engineer = LabEngineerAgent()
-        self.content_creator = ContentCreationAgent()
-        self.qa_agent = QualityAssuranceAgent()
-        self.deployment_agent = DeploymentAgent()
-    
-    def create_course(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute the complete course creation workflow"""
-        
-        # Phase 1: Discovery
-        requirements = self.discovery_agent.execute_discovery(inputs)
-        
-        # Phase 2: Architecture
-        blueprint = self.architect_agent.create_blueprint(requirements)
-        
-        # Phase 3: Lab Environment
-        lab_environment = self.lab_engineer.design_lab_environment(blueprint, requirements)
-        
-        # Phase 4: Content Creation
-        content_assets = self.content_creator.generate_content(blueprint, lab_environment)
-        
-        # Phase 5: Quality Assurance
-        qa_report = self.qa_agent.execute_quality_assurance(content_assets, lab_environment)
-        
-        # Phase 6: Deployment
-        deployment_package = self.deployment_agent.create_deployment_package(content_assets, qa_report)
-        
-        return {
-            "requirements": requirements,
-            "blueprint": blueprint,
-            "lab_environment": lab_environment,
-            "content_assets": content_assets,
-            "qa_report": qa_report,
-            "deployment_package": deployment_package
-        }
+    def __init__(self, cache: Optional[PhaseCache] = None,
+                 checkpoints: Optional[CheckpointStore] = None,
+                 context: Optional[ContextProjector] = None,
+                 assets: Optional[AssetStore] = None):
+        self.cache = cache
+        self.checkpoints = checkpoints
+        self.assets = assets
+        self.context = context or ContextProjector()
+        self.discovery_agent = DiscoveryAgent(cache=cache)
+        self.architect_agent = ContentArchitectAgent(cache=cache)
+        self.lab_engineer = LabEngineerAgent(cache=cache, context=self.context)
+        self.content_creator = ContentCreationAgent(cache=cache, context=self.context)
+        self.qa_agent = QualityAssuranceAgent(cache=cache, context=self.context)
+        self.deployment_agent = DeploymentAgent(cache=cache, context=self.context)
+    
+    def _agents(self) -> Tuple[Any, ...]:
+        return (self.discovery_agent, self.architect_agent, self.lab_engineer,
+                self.content_creator, self.qa_agent, self.deployment_agent)
+    
+    def close(self):
+        """Return this crew's built agents to the process-wide pool for reuse by other crews"""
+        for wrapper in self._agents():
+            release_agents(wrapper)
+    
+    def warm_up(self):
+        """Build every agent now rather than on its first kickoff, for long-lived workers"""
+        for wrapper in self._agents():
+            wrapper.get_agent()
+    
+    def context_report(self) -> Dict[str, Dict[str, int]]:
+        """Prompt token counts per phase before and after context projection"""
+        return self.context.report()
+    
+    def __enter__(self) -> "InstructionalDesignCrew":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _sequential_phases(self) -> List[Phase]:
+        """The workflow phases in execution order, with the fields each one reads upstream"""
+        return [
+            # Phase 1: Discovery
+            Phase("requirements", self.discovery_agent.execute_discovery,
+                  depends_on=["inputs"], reads=self.discovery_agent.CONTEXT_FIELDS),
+            # Phase 2: Architecture
+            Phase("blueprint", self.architect_agent.create_blueprint,
+                  depends_on=["requirements"], reads=self.architect_agent.CONTEXT_FIELDS),
+            # Phase 3: Lab Environment
+            Phase("lab_environment", self.lab_engineer.design_lab_environment,
+                  depends_on=["blueprint", "requirements"], reads=self.lab_engineer.CONTEXT_FIELDS),
+            # Phase 4: Content Creation
+            Phase("content_assets", self.content_creator.generate_content,
+                  depends_on=["blueprint", "lab_environment"], reads=self.content_creator.CONTEXT_FIELDS),
+            # Phase 5: Quality Assurance
+            Phase("qa_report", self.qa_agent.execute_quality_assurance,
+                  depends_on=["content_assets", "lab_environment", "blueprint"], reads=self.qa_agent.CONTEXT_FIELDS),
+            # Phase 6: Deployment
+            Phase("deployment_package", self.deployment_agent.create_deployment_package,
+                  depends_on=["content_assets", "qa_report"], reads=self.deployment_agent.CONTEXT_FIELDS),
+        ]
+
+    @staticmethod
+    def _phase_key(phase: Phase, artifacts: Dict[str, Any]) -> str:
+        return phase_key(phase.name, {dep: fingerprint(select(artifacts[dep], phase.reads.get(dep)))
+                                      for dep in phase.depends_on})
+
+    def _start_run(self, inputs: Dict[str, Any], run_id: Optional[str]) -> Optional[str]:
+        if self.checkpoints is None:
+            if run_id is not None:
+                raise ValueError("run_id requires a crew created with a CheckpointStore")
+            return None
+        return self.checkpoints.new_run(inputs, run_id)
+
+    def _run_phase(self, name: str, key: str, compute: Callable[[], Any], run_id: Optional[str],
+                   course: str, previous: Optional[Dict[str, Any]] = None) -> Tuple[Any, str]:
+        """The artifact of one phase and where it came from
+        
+        It comes from previous when the fingerprints match ("previous"), else from the
+        run's checkpoint ("checkpoint"), else from an identical phase of any course in
+        the asset store ("asset_store"), and only then from compute() ("computed"). The
+        asset store follows the PhaseCache: it is skipped when the cache is bypassed and
+        ignores artifacts older than its ttl. Only computed artifacts are put in the store.
+        """
+        previous = previous or {}
+        if previous.get("fingerprints", {}).get(name) == key and name in previous:
+            artifact, source = previous[name], "previous"
+        elif run_id is not None and self.checkpoints.has(run_id, name):
+            artifact, source = self.checkpoints.load(run_id, name), "checkpoint"
+        else:
+            # Another course may already have produced this phase from identical inputs
+            stored = None
+            if self.assets is not None and not (self.cache is not None and self.cache.bypass):
+                stored = self.assets.find(name, key, max_age=self.cache.ttl if self.cache is not None else None)
+                instrumentation.increment("asset_store_total", phase=name,
+                                          result="hit" if stored is not None else "miss")
+            if stored is not None:
+                artifact, source = stored, "asset_store"
+            else:
+                artifact, source = compute(), "computed"
+                if self.assets is not None:
+                    self.assets.put(artifact, course, name, key)
+        if run_id is not None and not self.checkpoints.has(run_id, name):
+            self.checkpoints.save(run_id, name, artifact)
+        return artifact, source
+
+    @staticmethod
+    def _timing(timing: PhaseTiming, key: str, source: str) -> PhaseTiming:
+        timing.fingerprint = key
+        timing.reused = source == "previous"
+        timing.stored = source == "asset_store"
+        return timing
+
+    def _iter_phases(self, inputs: Dict[str, Any], run_id: Optional[str] = None,
+                     previous: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[str, Any, PhaseTiming]]:
+        phases = self._sequential_phases()
+        consumers = Counter(dep for phase in phases for dep in phase.depends_on)
+        artifacts: Dict[str, Any] = {"inputs": inputs}
+        course = run_id or fingerprint(inputs)
+        for phase in phases:
+            start = time.time()
+            key = self._phase_key(phase, artifacts)
+            
+            def compute(phase: Phase = phase) -> Any:
+                with instrumentation.span("phase", phase.name):
+                    return phase.func(**{dep: artifacts[dep] for dep in phase.depends_on})
+            
+            artifact, source = self._run_phase(phase.name, key, compute, run_id, course, previous)
+            timing = self._timing(PhaseTiming(phase.name, start, time.time()), key, source)
+            
+            # Only hold on to artifacts that a later phase still needs
+            for dep in phase.depends_on:
+                consumers[dep] -= 1
+                if consumers[dep] == 0:
+                    del artifacts[dep]
+            if consumers[phase.name]:
+                artifacts[phase.name] = artifact
+            
+            yield phase.name, artifact, timing
+            del artifact
+
+    def _collect(self, inputs: Dict[str, Any], run_id: Optional[str] = None,
+                 previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        fingerprints: Dict[str, str] = {}
+        reused: List[str] = []
+        for name, artifact, timing in self._iter_phases(inputs, run_id, previous):
+            result[name] = artifact
+            fingerprints[name] = timing.fingerprint
+            if timing.reused:
+                reused.append(name)
+        result["fingerprints"] = fingerprints
+        if previous is not None:
+            result["reused"] = reused
+            result["recomputed"] = [name for name in fingerprints if name not in reused]
+        if run_id is not None:
+            result["run_id"] = run_id
+        return result
+
+    def create_course(self, inputs: Dict[str, Any], run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Execute the complete course creation workflow
+        
+        With a CheckpointStore every finished phase is persisted under run_id (a new
+        one is generated when omitted), which is returned in the result. The per-phase
+        "fingerprints" in the result let update_course skip unchanged phases later.
+        With an AssetStore every artifact is stored deduplicated, and a phase whose
+        inputs match one produced for any earlier course is loaded instead of rerun.
+        """
+        return self._collect(inputs, self._start_run(inputs, run_id))
+
+    def iter_course(self, inputs: Dict[str, Any],
+                    run_id: Optional[str] = None) -> Iterator[Tuple[str, Any, PhaseTiming]]:
+        """Yield (phase_name, artifact, timing) as each phase of the workflow finishes
+        
+        Artifacts are only retained until the last phase that needs them has run, so
+        memory stays flat when the consumer does not keep them either.
+        """
+        return self._iter_phases(inputs, self._start_run(inputs, run_id))
+
+    def update_course(self, previous_result: Dict[str, Any], new_inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Re-run the workflow for changed inputs, reusing every phase whose inputs are unchanged
+        
+        A phase is reused when the fingerprint of the fields it reads from its upstream
+        artifacts matches the one recorded in previous_result, so a change only
+        propagates as far as it actually alters what later phases see. The result
+        lists the "reused" and "recomputed" phases.
+        """
+        if "fingerprints" not in previous_result:
+            raise ValueError("previous_result has no phase fingerprints; pass a result of create_course "
+                             "or create_course_async")
+        return self._collect(new_inputs, previous=previous_result)
+
+    def resume(self, run_id: str) -> Dict[str, Any]:
+        """Reload the finished phases of a checkpointed run and continue from the first missing one"""
+        if self.checkpoints is None:
+            raise ValueError("resume() requires a crew created with a CheckpointStore")
+        
+        inputs = self.checkpoints.load(run_id, INPUTS)
+        return self._collect(inputs, run_id)
+
+    def _phase_graph(self) -> List[Phase]:
+        """_sequential_phases with content creation split so the core sections need not wait for the lab"""
+        graph = []
+        for phase in self._sequential_phases():
+            if phase.name != "content_assets":
+                graph.append(phase)
+                continue
+            graph += [
+                Phase("content_core",
+                      lambda blueprint: self.content_creator.generate_content_sections(
+                          blueprint, BLUEPRINT_SECTIONS),
+                      depends_on=["blueprint"], resource="content_creator",
+                      reads={"blueprint": phase.reads.get("blueprint")}),
+                Phase("content_lab",
+                      lambda blueprint, lab_environment: self.content_creator.generate_content_sections(
+                          blueprint, LAB_SECTIONS, lab_environment),
+                      depends_on=["blueprint", "lab_environment"], resource="content_creator", reads=phase.reads),
+                # Also given what content_assets reads sequentially, so both paths fingerprint it alike
+                Phase("content_assets",
+                      lambda content_core, content_lab, **upstream: ContentAssets(**content_core, **content_lab),
+                      depends_on=["content_core", "content_lab"] + phase.depends_on, reads=phase.reads),
+            ]
+        return graph
+
+    def _scheduler(self, inputs: Dict[str, Any],
+                   run_id: Optional[str]) -> Tuple[PhaseScheduler, Dict[str, Tuple[str, str]]]:
+        """A scheduler over _phase_graph whose phases go through _run_phase, and the
+        (fingerprint, source) of each phase it has run"""
+        sequential = {phase.name: phase for phase in self._sequential_phases()}
+        course = run_id or fingerprint(inputs)
+        outcomes: Dict[str, Tuple[str, str]] = {}
+
+        def stored(phase: Phase) -> Phase:
+            def run(**upstream: Any) -> Any:
+                key = self._phase_key(sequential.get(phase.name, phase), upstream)
+                artifact, source = self._run_phase(phase.name, key, lambda: phase.func(**upstream), run_id, course)
+                outcomes[phase.name] = (key, source)
+                return artifact
+            return Phase(phase.name, run, phase.depends_on, phase.resource, phase.reads)
+
+        return PhaseScheduler([stored(phase) for phase in self._phase_graph()]), outcomes
+
+    async def create_course_async(self, inputs: Dict[str, Any], run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Execute the workflow, overlapping phases whose inputs are already available
+        
+        Checkpoints, the asset store and the "fingerprints" of the result work as in
+        create_course, so the result can be passed to update_course.
+        """
+        run_id = self._start_run(inputs, run_id)
+        scheduler, outcomes = self._scheduler(inputs, run_id)
+        artifacts = await scheduler.run(inputs=inputs)
+        for name, timing in scheduler.timings.items():
+            self._timing(timing, *outcomes[name])
+        
+        result = {name: artifacts[name] for name in PHASES}
+        result["fingerprints"] = {name: outcomes[name][0] for name in PHASES}
+        result["timings"] = scheduler.timings
+        result["critical_path"] = scheduler.critical_path()
+        if run_id is not None:
+            result["run_id"] = run_id
+        return result
+
+    def create_courses(self, inputs_list: Iterable[Dict[str, Any]], max_concurrency: int = 4,
+                       executor: str = "thread") -> Iterator[CourseResult]:
+        """Create many courses concurrently, yielding each result as soon as it completes
+        
+        executor is "thread", "process" or "asyncio". Agents are reused across courses but
+        never shared by two courses at the same time, and a failed course is reported in
+        its CourseResult instead of aborting the batch.
+        """
+        crew_factory = partial(type(self), cache=self.cache, checkpoints=self.checkpoints,
+                               context=self.context, assets=self.assets)
+        results = run_batch(inputs_list, crew_factory=crew_factory, max_concurrency=max_concurrency,
+                            executor=executor, crew=self)
+        return self._merge_context_stats(results)
+
+    def _merge_context_stats(self, results: Iterator[CourseResult]) -> Iterator[CourseResult]:
+        # Courses run in worker processes count their prompt tokens on a copy of the projector
+        for course in results:
+            if course.context_stats:
+                self.context.merge(course.context_stats)
+            yield course
+
+    async def aiter_course(self, inputs: Dict[str, Any],
+                           run_id: Optional[str] = None) -> AsyncIterator[Tuple[str, Any, PhaseTiming]]:
+        """Async variant of iter_course that overlaps independent phases
+        
+        Besides the six artifacts, the partial content_core and content_lab results
+        are yielded as soon as they are ready.
+        """
+        scheduler, outcomes = self._scheduler(inputs, self._start_run(inputs, run_id))
+        async for name, artifact, timing in scheduler.iter_run(inputs=inputs):
+            yield name, artifact, self._timing(timing, *outcomes[name])
 
 # Usage example
 if __name__ == "__main__":
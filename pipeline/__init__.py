@@ -0,0 +1 @@
+# pipeline/__init__.py
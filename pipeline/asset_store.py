@@ -0,0 +1,372 @@
+# pipeline/asset_store.py
+"""Content-addressed store of phase artifacts shared by every course
+
+An artifact is split into chunks: every dict inside it (one lab guide, one
+assessment, ...) is a chunk, and long text values within those are further cut at
+paragraph boundaries chosen by content, so a shared paragraph is stored once even
+when the surrounding text differs. Chunks are keyed by SHA-256 and stored once,
+zlib-compressed, in a single SQLite file; an artifact is a small manifest of chunk
+hashes. Artifacts are indexed by course, phase and phase fingerprint, so a phase
+whose inputs match an artifact already produced for any course can be served from
+the store instead of being regenerated.
+
+Usage: python -m pipeline.asset_store [--db assets.db] {stats,courses}
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from pipeline.checkpoint import _qualified_name, _resolve
+
+# Text shorter than this stays inside its item's chunk
+TEXT_CHUNK_MIN = 1024
+# Paragraph runs are cut where a paragraph's hash says so, between these sizes
+PIECE_MIN, PIECE_MAX = 512, 8192
+CUT_MASK = 3
+
+_PARAGRAPH = re.compile(r".*?(?:\n[ \t]*\n+|\Z)", re.DOTALL)
+_TITLE_KEYS = ("title", "name", "module", "topic")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    refs INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    manifest BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    course TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    artifact TEXT NOT NULL REFERENCES artifacts (id),
+    key TEXT,
+    created REAL NOT NULL,
+    PRIMARY KEY (course, phase)
+);
+CREATE INDEX IF NOT EXISTS entries_key ON entries (phase, key);
+CREATE INDEX IF NOT EXISTS entries_artifact ON entries (artifact);
+CREATE TABLE IF NOT EXISTS titles (
+    section TEXT NOT NULL,
+    title TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (section, title, hash)
+);
+"""
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", title.lower()))
+
+
+def item_title(item: Dict[str, Any]) -> Optional[str]:
+    for key in _TITLE_KEYS:
+        for field, value in item.items():
+            if field.lower() == key and isinstance(value, str) and value.strip():
+                return normalize_title(value)
+    return None
+
+
+def split_text(text: str) -> List[str]:
+    """Cut text into runs of whole paragraphs at content-defined points
+
+    A run ends after a paragraph whose CRC has its low bits clear, once the run holds
+    at least PIECE_MIN characters, or when it would exceed PIECE_MAX. Since the cuts
+    depend on the paragraphs themselves, an edit only changes the runs around it.
+    """
+    pieces, current, size = [], [], 0
+    for match in _PARAGRAPH.finditer(text):
+        paragraph = match.group(0)
+        if not paragraph:
+            continue
+        if current and size + len(paragraph) > PIECE_MAX:
+            pieces.append("".join(current))
+            current, size = [], 0
+        current.append(paragraph)
+        size += len(paragraph)
+        if size >= PIECE_MIN and zlib.crc32(paragraph.encode("utf-8")) & CUT_MASK == 0:
+            pieces.append("".join(current))
+            current, size = [], 0
+    if current:
+        pieces.append("".join(current))
+    return pieces
+
+
+class _Chunker:
+    """Turns a JSON value into manifest nodes, collecting the chunks it references"""
+
+    def __init__(self):
+        self.chunks: Dict[str, bytes] = {}
+        self.titles: List[Tuple[str, str, str]] = []
+
+    def _chunk(self, data: bytes) -> str:
+        digest = _digest(data)
+        self.chunks[digest] = data
+        return digest
+
+    def node(self, value: Any, section: str = "") -> Any:
+        if isinstance(value, str) and len(value) >= TEXT_CHUNK_MIN:
+            return {"t": [self._chunk(piece.encode("utf-8")) for piece in split_text(value)]}
+        if isinstance(value, dict):
+            digest = self._chunk(_dumps({key: self.node(item) for key, item in value.items()}).encode("utf-8"))
+            title = item_title(value)
+            if section and title:
+                self.titles.append((section, title, digest))
+            return {"c": digest}
+        if isinstance(value, list):
+            return {"l": [self.node(item, section) for item in value]}
+        return {"v": value}
+
+
+class AssetStore:
+    """Deduplicating artifact store in one SQLite file, safe to share between processes"""
+
+    def __init__(self, path: str = "assets.db", compression_level: int = 6):
+        self.path = path
+        self.compression_level = compression_level
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> Optional["AssetStore"]:
+        """Store at ASSET_STORE_DB, or None when it is not set"""
+        path = os.getenv("ASSET_STORE_DB")
+        return cls(path) if path else None
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def put(self, artifact: Any, course: str, phase: str, key: Optional[str] = None) -> str:
+        """Store artifact as course's phase result, returning its content address"""
+        if isinstance(artifact, BaseModel):
+            type_name, data = _qualified_name(type(artifact)), artifact.model_dump(mode="json")
+        else:
+            type_name, data = "", artifact
+        chunker = _Chunker()
+        if isinstance(data, dict):
+            manifest = {"type": type_name, "fields": {name: chunker.node(value, name) for name, value in data.items()}}
+        else:
+            manifest = {"type": type_name, "node": chunker.node(data, phase)}
+        # Every chunk the artifact holds a reference on, including those nested in item chunks
+        manifest["chunks"] = sorted(chunker.chunks)
+        manifest_json = _dumps(manifest).encode("utf-8")
+        artifact_id = _digest(manifest_json)
+        size = len(_dumps(data).encode("utf-8"))
+        now = time.time()
+
+        with self._transaction() as conn:
+            new_artifact = conn.execute(
+                "INSERT OR IGNORE INTO artifacts (id, type, manifest, size, created) VALUES (?, ?, ?, ?, ?)",
+                (artifact_id, type_name, zlib.compress(manifest_json, self.compression_level), size, now)).rowcount == 1
+            if new_artifact:
+                known = self._existing(conn, list(chunker.chunks))
+                conn.executemany("INSERT INTO chunks (hash, data, size) VALUES (?, ?, ?)",
+                                 [(digest, zlib.compress(data, self.compression_level), len(data))
+                                  for digest, data in chunker.chunks.items() if digest not in known])
+                conn.executemany("UPDATE chunks SET refs = refs + 1 WHERE hash = ?",
+                                 [(digest,) for digest in chunker.chunks])
+                conn.executemany("INSERT OR IGNORE INTO titles (section, title, hash) VALUES (?, ?, ?)",
+                                 chunker.titles)
+            replaced = conn.execute("SELECT artifact FROM entries WHERE course = ? AND phase = ?",
+                                    (course, phase)).fetchone()
+            conn.execute("INSERT OR REPLACE INTO entries (course, phase, artifact, key, created) "
+                         "VALUES (?, ?, ?, ?, ?)", (course, phase, artifact_id, key, now))
+            if replaced and replaced[0] != artifact_id:
+                self._release(conn, replaced[0])
+        return artifact_id
+
+    @staticmethod
+    def _batches(digests: List[str]) -> Iterator[Tuple[str, List[str]]]:
+        # Stay below SQLite's bound-parameter limit
+        for i in range(0, len(digests), 500):
+            batch = digests[i:i + 500]
+            yield ",".join("?" * len(batch)), batch
+
+    def _existing(self, conn: sqlite3.Connection, digests: List[str]) -> set:
+        return {row[0] for marks, batch in self._batches(digests)
+                for row in conn.execute(f"SELECT hash FROM chunks WHERE hash IN ({marks})", batch)}
+
+    def _release(self, conn: sqlite3.Connection, artifact_id: str):
+        """Drop an artifact no entry points to any more, and the chunks only it used"""
+        if conn.execute("SELECT 1 FROM entries WHERE artifact = ? LIMIT 1", (artifact_id,)).fetchone():
+            return
+        row = conn.execute("SELECT manifest FROM artifacts WHERE id = ?", (artifact_id,)).fetchone()
+        if row is None:
+            return
+        conn.execute("DELETE FROM artifacts WHERE id = ?", (artifact_id,))
+        conn.executemany("UPDATE chunks SET refs = refs - 1 WHERE hash = ?",
+                         [(digest,) for digest in json.loads(zlib.decompress(row[0]))["chunks"]])
+        conn.execute("DELETE FROM titles WHERE hash IN (SELECT hash FROM chunks WHERE refs <= 0)")
+        conn.execute("DELETE FROM chunks WHERE refs <= 0")
+
+    def _decode(self, conn: sqlite3.Connection, nodes: List[Any]) -> List[Any]:
+        """Values of manifest nodes, fetching the chunks of each nesting level in one query"""
+        chunks: Dict[str, bytes] = {}
+        pending = list(nodes)
+        while pending:
+            wanted = [digest for node in pending for digest in
+                      (node.get("t", []) if "t" in node else [node["c"]] if "c" in node else [])
+                      if digest not in chunks]
+            for marks, batch in self._batches(list(dict.fromkeys(wanted))):
+                chunks.update((digest, zlib.decompress(blob)) for digest, blob in conn.execute(
+                    f"SELECT hash, data FROM chunks WHERE hash IN ({marks})", batch))
+            children = []
+            for node in pending:
+                if "l" in node:
+                    children.extend(node["l"])
+                elif "c" in node:
+                    children.extend(json.loads(chunks[node["c"]]).values())
+            pending = children
+
+        def value(node: Dict[str, Any]) -> Any:
+            if "v" in node:
+                return node["v"]
+            if "l" in node:
+                return [value(item) for item in node["l"]]
+            if "t" in node:
+                return "".join(chunks[digest].decode("utf-8") for digest in node["t"])
+            return {key: value(item) for key, item in json.loads(chunks[node["c"]]).items()}
+
+        return [value(node) for node in nodes]
+
+    def _load(self, conn: sqlite3.Connection, artifact_id: str) -> Any:
+        row = conn.execute("SELECT manifest FROM artifacts WHERE id = ?", (artifact_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No artifact '{artifact_id}'")
+        manifest = json.loads(zlib.decompress(row[0]))
+        if "fields" in manifest:
+            names = list(manifest["fields"])
+            data = dict(zip(names, self._decode(conn, [manifest["fields"][name] for name in names])))
+        else:
+            data = self._decode(conn, [manifest["node"]])[0]
+        return _resolve(manifest["type"]).model_validate(data) if manifest["type"] else data
+
+    def get(self, artifact_id: str) -> Any:
+        """Rebuild an artifact from its content address"""
+        with self._connect() as conn:
+            return self._load(conn, artifact_id)
+
+    def load(self, course: str, phase: str) -> Any:
+        with self._connect() as conn:
+            row = conn.execute("SELECT artifact FROM entries WHERE course = ? AND phase = ?",
+                               (course, phase)).fetchone()
+            if row is None:
+                raise KeyError(f"No '{phase}' artifact for course '{course}'")
+            return self._load(conn, row[0])
+
+    def find(self, phase: str, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """An artifact any course produced for phase from identical inputs, or None
+        
+        With max_age, only an artifact stored within the last max_age seconds counts.
+        """
+        oldest = time.time() - max_age if max_age is not None else 0.0
+        with self._connect() as conn:
+            row = conn.execute("SELECT artifact FROM entries WHERE phase = ? AND key = ? AND created >= ? "
+                               "ORDER BY created DESC LIMIT 1", (phase, key, oldest)).fetchone()
+            return self._load(conn, row[0]) if row else None
+
+    def find_items(self, section: str, title: str) -> List[Dict[str, Any]]:
+        """Stored items of a section (e.g. lab_guides) whose title matches, ignoring case and punctuation"""
+        with self._connect() as conn:
+            digests = [row[0] for row in conn.execute("SELECT hash FROM titles WHERE section = ? AND title = ?",
+                                                      (section, normalize_title(title)))]
+            return self._decode(conn, [{"c": digest} for digest in digests])
+
+    def contains(self, item: Dict[str, Any]) -> bool:
+        """Whether an identical item is already stored"""
+        digest = _Chunker().node(item)["c"]
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM chunks WHERE hash = ?", (digest,)).fetchone() is not None
+
+    def delete(self, course: str, phase: Optional[str] = None) -> int:
+        """Remove a course's entries (one phase or all), freeing chunks nothing else uses"""
+        with self._transaction() as conn:
+            query, params = "SELECT phase, artifact FROM entries WHERE course = ?", [course]
+            if phase is not None:
+                query, params = query + " AND phase = ?", params + [phase]
+            rows = conn.execute(query, params).fetchall()
+            for entry_phase, artifact_id in rows:
+                conn.execute("DELETE FROM entries WHERE course = ? AND phase = ?", (course, entry_phase))
+                self._release(conn, artifact_id)
+        return len(rows)
+
+    def courses(self) -> Dict[str, List[str]]:
+        with self._connect() as conn:
+            listing: Dict[str, List[str]] = {}
+            for course, phase in conn.execute("SELECT course, phase FROM entries ORDER BY course, phase"):
+                listing.setdefault(course, []).append(phase)
+        return listing
+
+    def stats(self) -> Dict[str, Any]:
+        """Logical versus stored size and the resulting dedup ratio"""
+        with self._connect() as conn:
+            entries, logical = conn.execute("SELECT COUNT(*), COALESCE(SUM(artifacts.size), 0) FROM entries "
+                                            "JOIN artifacts ON artifacts.id = entries.artifact").fetchone()
+            artifacts, manifests = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(manifest)), 0) FROM artifacts").fetchone()
+            chunks, unique, compressed = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM chunks").fetchone()
+        stored = compressed + manifests
+        return {
+            "entries": entries,
+            "artifacts": artifacts,
+            "chunks": chunks,
+            "logical_bytes": logical,
+            "unique_bytes": unique,
+            "stored_bytes": stored,
+            "dedup_ratio": round(logical / unique, 3) if unique else 0.0,
+            "storage_ratio": round(logical / stored, 3) if stored else 0.0,
+            "saved_bytes": logical - stored,
+        }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m pipeline.asset_store", description="Course asset store")
+    parser.add_argument("--db", default=os.getenv("ASSET_STORE_DB", "assets.db"))
+    parser.add_argument("command", choices=["stats", "courses"])
+    args = parser.parse_args(argv)
+    store = AssetStore(args.db)
+    print(json.dumps(store.stats() if args.command == "stats" else store.courses(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
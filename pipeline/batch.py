@@ -0,0 +1,202 @@
+# pipeline/batch.py
+import asyncio
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+EXECUTORS = ("thread", "process", "asyncio")
+
+
+@dataclass
+class CourseResult:
+    index: int
+    inputs: Dict[str, Any]
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+    # Context projection counts of a course run in a worker process, for the parent to merge
+    context_stats: Optional[Dict[str, Dict[str, int]]] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class CrewPool:
+    """Hands out crews so that courses running at the same time never share an agent"""
+
+    def __init__(self, factory: Callable[[], Any], size: int, seed: Any = None):
+        self.factory = factory
+        self.size = size
+        self._idle: "queue.Queue[Any]" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        if seed is not None:
+            self._idle.put(seed)
+            self._created = 1
+
+    def acquire(self) -> Any:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if create:
+            try:
+                return self.factory()
+            except BaseException:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get()
+
+    def release(self, crew: Any):
+        self._idle.put(crew)
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        crew = self.acquire()
+        try:
+            yield crew
+        finally:
+            self.release(crew)
+
+
+def _failure(index: int, inputs: Dict[str, Any], error: BaseException, start: float) -> CourseResult:
+    return CourseResult(index, inputs, error=f"{type(error).__name__}: {error}",
+                        duration=time.perf_counter() - start)
+
+
+def _run_one(pool: CrewPool, index: int, inputs: Dict[str, Any], drain: bool = False) -> CourseResult:
+    start = time.perf_counter()
+    context_stats = None
+    try:
+        with pool.lease() as crew:
+            try:
+                result = crew.create_course(inputs)
+            finally:
+                if drain and hasattr(crew, "context"):
+                    context_stats = crew.context.drain()
+    except Exception as e:
+        failure = _failure(index, inputs, e, start)
+        failure.context_stats = context_stats
+        return failure
+    return CourseResult(index, inputs, result=result, duration=time.perf_counter() - start,
+                        context_stats=context_stats)
+
+
+# Each worker process builds its crew once and reuses it for every course it is given
+_process_pool: Optional[CrewPool] = None
+
+
+def _init_process(factory: Callable[[], Any]):
+    global _process_pool
+    _process_pool = CrewPool(factory, size=1)
+
+
+def _run_in_process(index: int, inputs: Dict[str, Any]) -> CourseResult:
+    return _run_one(_process_pool, index, inputs, drain=True)
+
+
+def _run_executor(executor: Executor, submit: Callable[[int, Dict[str, Any]], Any],
+                  inputs_list: List[Dict[str, Any]]) -> Iterator[CourseResult]:
+    try:
+        futures = {}
+        for index, inputs in enumerate(inputs_list):
+            try:
+                futures[submit(index, inputs)] = (index, inputs)
+            except Exception as e:
+                # The pool could not start a worker or send it the crew factory
+                yield _failure(index, inputs, e, time.perf_counter())
+        for future in as_completed(futures):
+            index, inputs = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                # A worker process died or the result could not be transferred back
+                yield _failure(index, inputs, e, time.perf_counter())
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _run_asyncio(pool: CrewPool, inputs_list: List[Dict[str, Any]],
+                 max_concurrency: int) -> Iterator[CourseResult]:
+    results: "queue.Queue[Optional[CourseResult]]" = queue.Queue()
+    stop = threading.Event()
+
+    async def run(semaphore: asyncio.Semaphore, index: int, inputs: Dict[str, Any]):
+        async with semaphore:
+            if stop.is_set():
+                return
+            start = time.perf_counter()
+            try:
+                crew = pool.acquire()
+                try:
+                    result = await crew.create_course_async(inputs)
+                finally:
+                    pool.release(crew)
+            except Exception as e:
+                results.put(_failure(index, inputs, e, start))
+                return
+            results.put(CourseResult(index, inputs, result=result, duration=time.perf_counter() - start))
+
+    async def run_all():
+        # Every course can have two phases in flight at once
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_concurrency * 2))
+        semaphore = asyncio.Semaphore(max_concurrency)
+        await asyncio.gather(*(run(semaphore, index, inputs) for index, inputs in enumerate(inputs_list)))
+
+    def loop_thread():
+        try:
+            asyncio.run(run_all())
+        finally:
+            results.put(None)
+
+    thread = threading.Thread(target=loop_thread, name="create-courses", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = results.get()
+            if item is None:
+                break
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_batch(inputs_list: List[Dict[str, Any]], crew_factory: Callable[[], Any],
+              max_concurrency: int = 4, executor: str = "thread",
+              crew: Any = None) -> Iterator[CourseResult]:
+    """Create many courses concurrently, yielding each result as soon as it completes"""
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {EXECUTORS}, got '{executor}'")
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    inputs_list = list(inputs_list)
+    max_concurrency = min(max_concurrency, max(len(inputs_list), 1))
+
+    if executor == "process":
+        # Spawned rather than forked: the parent has threads (schedulers, heartbeats, the asyncio
+        # loop) whose locks a forked child could inherit held
+        pool_executor = ProcessPoolExecutor(max_concurrency, mp_context=multiprocessing.get_context("spawn"),
+                                            initializer=_init_process, initargs=(crew_factory,))
+        return _run_executor(pool_executor, lambda index, inputs: pool_executor.submit(
+            _run_in_process, index, inputs), inputs_list)
+
+    pool = CrewPool(crew_factory, size=max_concurrency, seed=crew)
+    if executor == "asyncio":
+        return _run_asyncio(pool, inputs_list, max_concurrency)
+
+    thread_executor = ThreadPoolExecutor(max_concurrency, thread_name_prefix="create-courses")
+    return _run_executor(thread_executor, lambda index, inputs: thread_executor.submit(
+        _run_one, pool, index, inputs), inputs_list)
@@ -0,0 +1,82 @@
+# pipeline/checkpoint.py
+import importlib
+import os
+import pickle
+import tempfile
+import uuid
+import zlib
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+INPUTS = "inputs"
+
+
+def _qualified_name(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _resolve(name: str) -> type:
+    module_name, _, qualname = name.partition(":")
+    target: Any = importlib.import_module(module_name)
+    for attr in qualname.split("."):
+        target = getattr(target, attr)
+    return target
+
+
+class CheckpointStore:
+    """Persists each phase artifact of a run so an interrupted run can be resumed
+    
+    Artifacts are stored as zlib-compressed pickles of the model's field values
+    together with the model class, one file per phase under the run ID.
+    """
+
+    def __init__(self, directory: str = ".checkpoints"):
+        self.directory = directory
+
+    def new_run(self, inputs: Dict[str, Any], run_id: Optional[str] = None) -> str:
+        run_id = run_id or uuid.uuid4().hex
+        if not self.has(run_id, INPUTS):
+            self.save(run_id, INPUTS, inputs)
+        return run_id
+
+    def _path(self, run_id: str, phase: str) -> str:
+        return os.path.join(self.directory, run_id, f"{phase}.ckpt")
+
+    def has(self, run_id: str, phase: str) -> bool:
+        return os.path.exists(self._path(run_id, phase))
+
+    def save(self, run_id: str, phase: str, artifact: Any):
+        if isinstance(artifact, BaseModel):
+            record = {"type": _qualified_name(type(artifact)), "data": artifact.model_dump()}
+        else:
+            record = {"type": None, "data": artifact}
+        payload = zlib.compress(pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+        path = self._path(run_id, phase)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, run_id: str, phase: str) -> Any:
+        try:
+            with open(self._path(run_id, phase), "rb") as file:
+                record = pickle.loads(zlib.decompress(file.read()))
+        except FileNotFoundError:
+            raise KeyError(f"No checkpoint for phase '{phase}' of run '{run_id}'") from None
+        if record["type"] is None:
+            return record["data"]
+        return _resolve(record["type"]).model_validate(record["data"])
+
+    def completed(self, run_id: str) -> List[str]:
+        run_dir = os.path.join(self.directory, run_id)
+        if not os.path.isdir(run_dir):
+            return []
+        return sorted(name[:-len(".ckpt")] for name in os.listdir(run_dir)
+                      if name.endswith(".ckpt") and name != f"{INPUTS}.ckpt")
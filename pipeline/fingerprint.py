@@ -0,0 +1,31 @@
+# pipeline/fingerprint.py
+import hashlib
+import json
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return repr(value)
+
+
+def select(artifact: Any, fields: Optional[List[str]]) -> Any:
+    """The part of an artifact a phase reads: the given fields, or all of it when fields is None"""
+    if fields is None:
+        return artifact
+    if isinstance(artifact, dict):
+        return {name: artifact.get(name) for name in fields}
+    return {name: getattr(artifact, name, None) for name in fields}
+
+
+def fingerprint(value: Any) -> str:
+    """Stable content hash of an artifact, a dict of them or a plain JSON value"""
+    payload = json.dumps(value, sort_keys=True, default=_canonical, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def phase_key(name: str, upstream: Dict[str, str]) -> str:
+    """Fingerprint of a phase run: its name and the fingerprints of what it reads"""
+    return fingerprint([name, sorted(upstream.items())])
@@ -0,0 +1,537 @@
+# pipeline/jobs.py
+"""SQLite-backed course job queue and the worker processes that drain it
+
+Workers claim jobs under a lease that a heartbeat keeps extending. A job whose
+lease runs out (its worker crashed or hung) goes back to the queue, up to
+max_attempts claims. Workers run the course phase by phase with a CheckpointStore
+keyed by the job ID, so a requeued job resumes after the last phase its previous
+worker finished, and a worker that finds its lease taken over abandons the job.
+
+Usage: python -m pipeline.jobs [--db jobs.db] {submit,status,fetch,work} ...
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+STATUSES = (QUEUED, RUNNING, DONE, FAILED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    result BLOB,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    submitted REAL NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, submitted);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    pid INTEGER NOT NULL,
+    ready REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class Job:
+    id: str
+    status: str
+    inputs: Dict[str, Any]
+    attempts: int
+    worker: Optional[str]
+    error: Optional[str]
+    submitted: float
+    started: Optional[float]
+    finished: Optional[float]
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        return cls(row["id"], row["status"], json.loads(row["inputs"]), row["attempts"], row["worker"],
+                   row["error"], row["submitted"], row["started"], row["finished"])
+
+
+class JobQueue:
+    """Course requests persisted in one SQLite file shared by every worker process"""
+
+    def __init__(self, path: str = "jobs.db", lease_seconds: float = 300.0, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        with self._connect() as conn:
+            # WAL lets status queries read while a worker holds the write lock
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def submit(self, inputs: Dict[str, Any], job_id: Optional[str] = None) -> str:
+        return self.submit_many([inputs], [job_id] if job_id else None)[0]
+
+    def submit_many(self, inputs_list: List[Dict[str, Any]], job_ids: Optional[List[str]] = None) -> List[str]:
+        """Queue one job per inputs dict in a single transaction"""
+        job_ids = job_ids or [uuid.uuid4().hex for _ in inputs_list]
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany("INSERT INTO jobs (id, status, inputs, submitted) VALUES (?, ?, ?, ?)",
+                             [(job_id, QUEUED, json.dumps(inputs), now)
+                              for job_id, inputs in zip(job_ids, inputs_list)])
+        return job_ids
+
+    def _expire(self, conn: sqlite3.Connection, now: float, worker: Optional[str] = None) -> int:
+        """Requeue running jobs whose lease ran out (or all jobs of worker), failing those out of attempts"""
+        condition, params = ("worker = ?", [worker]) if worker else ("lease_expires < ?", [now])
+        cursor = conn.execute(
+            f"""UPDATE jobs SET
+                    status = CASE WHEN attempts < ? THEN '{QUEUED}' ELSE '{FAILED}' END,
+                    finished = CASE WHEN attempts < ? THEN NULL ELSE ? END,
+                    error = 'worker ' || worker || ' stopped before finishing attempt ' || attempts,
+                    worker = NULL, lease_expires = NULL
+                WHERE status = '{RUNNING}' AND {condition}""",
+            [self.max_attempts, self.max_attempts, now] + params)
+        return cursor.rowcount
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """Lease the oldest queued job to worker, or return None when there is none"""
+        with self._transaction() as conn:
+            now = time.time()
+            self._expire(conn, now)
+            row = conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY submitted, rowid LIMIT 1",
+                               (QUEUED,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("""UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1,
+                                lease_expires = ?, started = ? WHERE id = ?""",
+                         (RUNNING, worker, now + self.lease_seconds, now, row["id"]))
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        return Job.from_row(row)
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """Extend worker's lease on job_id; False when the lease was lost"""
+        with self._transaction() as conn:
+            now = time.time()
+            conn.execute("UPDATE workers SET last_seen = ? WHERE id = ?", (now, worker))
+            cursor = conn.execute("UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND status = ?",
+                                  (now + self.lease_seconds, job_id, worker, RUNNING))
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker: str, result: Dict[str, Any]) -> bool:
+        """Store the result if worker still holds the lease"""
+        payload = zlib.compress(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        with self._transaction() as conn:
+            cursor = conn.execute("""UPDATE jobs SET status = ?, result = ?, error = NULL, finished = ?,
+                                         lease_expires = NULL WHERE id = ? AND worker = ? AND status = ?""",
+                                  (DONE, payload, time.time(), job_id, worker, RUNNING))
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker: str, error: str) -> bool:
+        """Record a failed attempt, requeueing the job while it has attempts left"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"""UPDATE jobs SET
+                        status = CASE WHEN attempts < ? THEN '{QUEUED}' ELSE '{FAILED}' END,
+                        finished = CASE WHEN attempts < ? THEN NULL ELSE ? END,
+                        error = ?, worker = NULL, lease_expires = NULL
+                    WHERE id = ? AND worker = ? AND status = '{RUNNING}'""",
+                (self.max_attempts, self.max_attempts, time.time(), error, job_id, worker))
+        return cursor.rowcount == 1
+
+    def requeue_worker(self, worker: str) -> int:
+        """Release every job leased to a worker known to be dead, without waiting for its leases"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM workers WHERE id = ?", (worker,))
+            return self._expire(conn, time.time(), worker)
+
+    def register(self, worker: str):
+        """Record that worker is ready to take jobs"""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO workers (id, pid, ready, last_seen) VALUES (?, ?, ?, ?)",
+                         (worker, os.getpid(), now, now))
+
+    def unregister(self, worker: str):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM workers WHERE id = ?", (worker,))
+
+    def workers(self) -> List[Dict[str, Any]]:
+        """Registered workers, with the job each one currently holds"""
+        with self._connect() as conn:
+            rows = conn.execute("""SELECT workers.*, jobs.id AS job FROM workers
+                                   LEFT JOIN jobs ON jobs.worker = workers.id AND jobs.status = ?
+                                   ORDER BY workers.ready""", (RUNNING,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def get(self, job_id: str) -> Job:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No job '{job_id}'")
+        return Job.from_row(row)
+
+    def jobs(self, status: Optional[str] = None) -> List[Job]:
+        query, params = "SELECT * FROM jobs", ()
+        if status is not None:
+            query, params = query + " WHERE status = ?", (status,)
+        with self._connect() as conn:
+            return [Job.from_row(row) for row in conn.execute(query + " ORDER BY submitted, rowid", params)]
+
+    def fetch(self, job_id: str) -> Dict[str, Any]:
+        """Result of a finished job"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT status, result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No job '{job_id}'")
+        if row["status"] != DONE:
+            raise ValueError(f"Job '{job_id}' is {row['status']}, not {DONE}")
+        return pickle.loads(zlib.decompress(row["result"]))
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in STATUSES}
+
+
+logger = logging.getLogger(__name__)
+
+
+def make_crew(checkpoint_dir: Optional[str] = ".checkpoints") -> Any:
+    """Default worker crew; checkpoints let a requeued job skip the phases already done"""
+    from crew_manager import InstructionalDesignCrew
+    from pipeline.asset_store import AssetStore
+    from pipeline.checkpoint import CheckpointStore
+
+    return InstructionalDesignCrew(checkpoints=CheckpointStore(checkpoint_dir) if checkpoint_dir else None,
+                                   assets=AssetStore.from_env())
+
+
+class Worker:
+    """Claims jobs one at a time and runs them on a single reused crew"""
+
+    def __init__(self, queue: JobQueue, crew_factory: Callable[[], Any] = make_crew,
+                 worker_id: Optional[str] = None, poll_interval: float = 1.0):
+        self.queue = queue
+        self.crew_factory = crew_factory
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = poll_interval
+        self._crew = None
+
+    def _heartbeat(self, job: Job, done: threading.Event, lost: threading.Event):
+        interval = self.queue.lease_seconds / 3
+        delay = interval
+        while not done.wait(delay):
+            try:
+                held = self.queue.heartbeat(job.id, self.worker_id)
+            except Exception as e:
+                # e.g. "database is locked"; retry sooner, the lease has not expired yet
+                logger.warning("Heartbeat for job %s failed, retrying: %s", job.id, e)
+                delay = min(max(delay / 2, 0.05), interval)
+                continue
+            if not held:
+                logger.warning("Lost the lease on job %s, abandoning it", job.id)
+                lost.set()
+                return
+            delay = interval
+
+    def _create_course(self, job: Job, lost: threading.Event) -> Optional[Dict[str, Any]]:
+        """The job's course, or None when the lease was lost before it was finished"""
+        run_id = job.id if getattr(self._crew, "checkpoints", None) is not None else None
+        if not hasattr(self._crew, "iter_course"):
+            result = (self._crew.create_course(job.inputs, run_id=run_id) if run_id
+                      else self._crew.create_course(job.inputs))
+            return None if lost.is_set() else result
+
+        # Phase by phase, so a job whose lease was lost stops at the next phase boundary
+        result: Dict[str, Any] = {}
+        fingerprints: Dict[str, str] = {}
+        for name, artifact, timing in self._crew.iter_course(job.inputs, run_id=run_id):
+            if lost.is_set():
+                return None
+            result[name] = artifact
+            fingerprints[name] = timing.fingerprint
+        result["fingerprints"] = fingerprints
+        if run_id is not None:
+            result["run_id"] = run_id
+        return result
+
+    def run_job(self, job: Job) -> bool:
+        done, lost = threading.Event(), threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(job, done, lost), name=f"lease-{job.id}", daemon=True)
+        beat.start()
+        try:
+            result = self._create_course(job, lost)
+        except Exception as e:
+            if not lost.is_set():
+                self.queue.fail(job.id, self.worker_id, f"{type(e).__name__}: {e}")
+            return False
+        finally:
+            done.set()
+            beat.join()
+        if result is None:
+            # Another worker owns the job now; neither complete nor fail it
+            return False
+        return self.queue.complete(job.id, self.worker_id, result)
+
+    def prepare(self):
+        """Build the crew, before the first claim so a job's lease is not spent on imports and agent setup"""
+        if self._crew is None:
+            self._crew = self.crew_factory()
+            if hasattr(self._crew, "warm_up"):
+                self._crew.warm_up()
+
+    def run(self, stop: Optional[Any] = None, max_jobs: Optional[int] = None) -> int:
+        """Process jobs until stop is set or max_jobs have run, returning how many succeeded"""
+        self.prepare()
+        self.queue.register(self.worker_id)
+        try:
+            return self._drain(stop, max_jobs)
+        finally:
+            self.queue.unregister(self.worker_id)
+
+    def _drain(self, stop: Optional[Any], max_jobs: Optional[int]) -> int:
+        succeeded = ran = 0
+        while (stop is None or not stop.is_set()) and (max_jobs is None or ran < max_jobs):
+            job = self.queue.claim(self.worker_id)
+            if job is None:
+                if stop is None:
+                    break
+                stop.wait(self.poll_interval)
+                continue
+            succeeded += self.run_job(job)
+            ran += 1
+        return succeeded
+
+
+# Exit code of a worker process whose crew_factory raised
+STARTUP_FAILED = 3
+
+
+def _work(path: str, lease_seconds: float, max_attempts: int, worker_id: str,
+          crew_factory: Callable[[], Any], poll_interval: float, stop: Any, errors: Any):
+    worker = Worker(JobQueue(path, lease_seconds, max_attempts), crew_factory, worker_id, poll_interval)
+    try:
+        worker.prepare()
+    except Exception as e:
+        errors.put(f"{type(e).__name__}: {e}")
+        sys.exit(STARTUP_FAILED)
+    worker.run(stop)
+
+
+class WorkerPool:
+    """Worker processes draining one queue; a worker that dies is replaced and its jobs requeued
+
+    Workers whose crew_factory raises are restarted with exponential backoff, and after
+    max_startup_failures such failures in a row check() raises with the factory's error.
+    """
+
+    def __init__(self, path: str = "jobs.db", workers: int = 4, crew_factory: Callable[[], Any] = make_crew,
+                 lease_seconds: float = 300.0, max_attempts: int = 3, poll_interval: float = 1.0,
+                 max_startup_failures: int = 3):
+        self.queue = JobQueue(path, lease_seconds, max_attempts)
+        self.workers = workers
+        self.crew_factory = crew_factory
+        self.poll_interval = poll_interval
+        self.max_startup_failures = max_startup_failures
+        # spawn rather than fork: crewai starts threads that deadlock a forked child
+        self._context = multiprocessing.get_context("spawn")
+        self._stop = self._context.Event()
+        self._errors = self._context.SimpleQueue()
+        self.processes: Dict[str, Any] = {}
+        self.restarts = 0
+        self.startup_failures = 0
+        self.startup_error: Optional[str] = None
+        self._respawn_at = 0.0
+
+    def _spawn(self):
+        worker_id = f"{socket.gethostname()}:pool-{uuid.uuid4().hex[:8]}"
+        process = self._context.Process(
+            target=_work, name=worker_id, daemon=True,
+            args=(self.queue.path, self.queue.lease_seconds, self.queue.max_attempts, worker_id,
+                  self.crew_factory, self.poll_interval, self._stop, self._errors))
+        process.start()
+        self.processes[worker_id] = process
+
+    def start(self) -> "WorkerPool":
+        while len(self.processes) < self.workers:
+            self._spawn()
+        return self
+
+    def check(self) -> int:
+        """Requeue the jobs of workers that died and start replacements; returns how many died"""
+        dead = [worker_id for worker_id, process in self.processes.items() if not process.is_alive()]
+        for worker_id in dead:
+            process = self.processes.pop(worker_id)
+            process.join()
+            self.queue.requeue_worker(worker_id)
+            if process.exitcode == STARTUP_FAILED:
+                self.startup_failures += 1
+                self._respawn_at = time.monotonic() + min(0.5 * 2 ** (self.startup_failures - 1), 60.0)
+        while not self._errors.empty():
+            self.startup_error = self._errors.get()
+        if self.startup_failures >= self.max_startup_failures:
+            raise RuntimeError(f"Workers failed to start {self.startup_failures} times in a row; "
+                               f"last error: {self.startup_error}")
+        if not self._stop.is_set():
+            self.restarts += len(dead)
+            if time.monotonic() >= self._respawn_at:
+                self.start()
+        return len(dead)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until every worker has built its crew and registered"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self.check()
+            ready = {worker["id"] for worker in self.queue.workers()}
+            if len(self.processes) == self.workers and all(worker_id in ready for worker_id in self.processes):
+                self.startup_failures = 0
+                return True
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.1)
+
+    def supervise(self, until_empty: bool = False, interval: float = 1.0):
+        """Watch the workers until interrupted, or until no job is queued or running"""
+        while True:
+            self.check()
+            if until_empty:
+                counts = self.queue.counts()
+                if not counts[QUEUED] and not counts[RUNNING]:
+                    return
+            time.sleep(interval)
+
+    def stop(self, timeout: float = 30.0):
+        """Let workers finish their current job, then terminate any that do not exit in time"""
+        self._stop.set()
+        deadline = time.monotonic() + timeout
+        for worker_id, process in self.processes.items():
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            self.queue.requeue_worker(worker_id)
+        self.processes.clear()
+
+    def __enter__(self) -> "WorkerPool":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return repr(value)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m pipeline.jobs", description="Course creation job queue")
+    parser.add_argument("--db", default=os.getenv("JOB_QUEUE_DB", "jobs.db"), help="SQLite queue file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    submit = commands.add_parser("submit", help="queue course requests")
+    submit.add_argument("--inputs", help="JSON file (or - for stdin) with one inputs object or a list of them")
+    for field in ("course_topic", "target_audience", "business_context", "timeline"):
+        submit.add_argument(f"--{field.replace('_', '-')}", dest=field)
+
+    status = commands.add_parser("status", help="show jobs, or queue counts when no job is given")
+    status.add_argument("job_ids", nargs="*")
+
+    fetch = commands.add_parser("fetch", help="print the result of a finished job as JSON")
+    fetch.add_argument("job_id")
+    fetch.add_argument("--output", help="write to this file instead of stdout")
+
+    work = commands.add_parser("work", help="run worker processes")
+    work.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    work.add_argument("--checkpoint-dir", default=".checkpoints")
+    work.add_argument("--lease", type=float, default=300.0, help="seconds before a silent worker's job is requeued")
+    work.add_argument("--max-attempts", type=int, default=3)
+    work.add_argument("--until-empty", action="store_true", help="exit once no job is queued or running")
+    args = parser.parse_args(argv)
+
+    if args.command == "work":
+        pool = WorkerPool(args.db, args.workers, partial(make_crew, args.checkpoint_dir),
+                          lease_seconds=args.lease, max_attempts=args.max_attempts)
+        with pool:
+            try:
+                pool.supervise(until_empty=args.until_empty)
+            except KeyboardInterrupt:
+                pass
+        print(json.dumps(pool.queue.counts()))
+        return
+
+    queue = JobQueue(args.db)
+    if args.command == "submit":
+        if args.inputs:
+            with (sys.stdin if args.inputs == "-" else open(args.inputs)) as file:
+                loaded = json.load(file)
+            inputs_list = loaded if isinstance(loaded, list) else [loaded]
+        else:
+            inputs = {field: getattr(args, field) for field in
+                      ("course_topic", "target_audience", "business_context", "timeline") if getattr(args, field)}
+            if "course_topic" not in inputs:
+                parser.error("submit needs --inputs or at least --course-topic")
+            inputs_list = [inputs]
+        for job_id in queue.submit_many(inputs_list):
+            print(job_id)
+        return
+    try:
+        if args.command == "status":
+            if not args.job_ids:
+                print(json.dumps({"jobs": queue.counts(), "workers": queue.workers()}))
+            for job_id in args.job_ids:
+                print(json.dumps(asdict(queue.get(job_id))))
+        elif args.command == "fetch":
+            text = json.dumps(queue.fetch(args.job_id), default=_json_default, indent=2)
+            if args.output:
+                with open(args.output, "w") as file:
+                    file.write(text)
+            else:
+                print(text)
+    except (KeyError, ValueError) as e:
+        parser.exit(1, f"{e.args[0]}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# pipeline/scheduler.py
+import asyncio
+import contextlib
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from agents.instrumentation import instrumentation
+
+
+@dataclass
+class Phase:
+    """A pipeline step, the artifacts it consumes and the agent it occupies"""
+    name: str
+    func: Callable[..., Any]
+    depends_on: List[str] = field(default_factory=list)
+    resource: Optional[str] = None
+    # Fields of each dependency the phase reads; dependencies not listed are read whole
+    reads: Dict[str, Optional[List[str]]] = field(default_factory=dict)
+
+
+@dataclass
+class PhaseTiming:
+    name: str
+    start: float
+    end: float
+    fingerprint: Optional[str] = None
+    # Taken from a previous result (update_course) or loaded from the asset store instead of computed
+    reused: bool = False
+    stored: bool = False
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class PhaseScheduler:
+    """Run phases as soon as their declared inputs are available"""
+
+    def __init__(self, phases: List[Phase]):
+        self.phases = self._topological_order(phases)
+        self.timings: Dict[str, PhaseTiming] = {}
+
+    @staticmethod
+    def _topological_order(phases: List[Phase]) -> List[Phase]:
+        by_name = {phase.name: phase for phase in phases}
+        if len(by_name) != len(phases):
+            raise ValueError("Phase names must be unique")
+
+        ordered: List[Phase] = []
+        state: Dict[str, str] = {}
+
+        def visit(phase: Phase, path: List[str]):
+            if state.get(phase.name) == "done":
+                return
+            if state.get(phase.name) == "visiting":
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + [phase.name])}")
+            state[phase.name] = "visiting"
+            for dep in phase.depends_on:
+                if dep in by_name:
+                    visit(by_name[dep], path + [phase.name])
+            state[phase.name] = "done"
+            ordered.append(phase)
+
+        for phase in phases:
+            visit(phase, [])
+        return ordered
+
+    async def iter_run(self, **initial: Any) -> AsyncIterator[Tuple[str, Any, PhaseTiming]]:
+        """Execute every phase, yielding (name, artifact, timing) as each one completes
+        
+        The scheduler only keeps an artifact until the last phase that consumes it
+        has started, so consumers control how long finished artifacts stay in memory.
+        """
+        known = set(initial) | {phase.name for phase in self.phases}
+        for phase in self.phases:
+            missing = [dep for dep in phase.depends_on if dep not in known]
+            if missing:
+                raise ValueError(f"Phase '{phase.name}' depends on unknown inputs: {missing}")
+
+        self.timings = {}
+        values: Dict[str, Any] = dict(initial)
+        consumers = Counter(dep for phase in self.phases for dep in phase.depends_on)
+        finished = {name: asyncio.Event() for name in known}
+        for name in initial:
+            finished[name].set()
+        locks = {phase.resource: asyncio.Lock() for phase in self.phases if phase.resource}
+        completions: "asyncio.Queue[Tuple[str, Any, Optional[PhaseTiming], Optional[BaseException]]]" = asyncio.Queue()
+
+        async def execute(phase: Phase):
+            try:
+                for dep in phase.depends_on:
+                    await finished[dep].wait()
+                kwargs = {dep: values[dep] for dep in phase.depends_on}
+                for dep in phase.depends_on:
+                    consumers[dep] -= 1
+                    if consumers[dep] == 0:
+                        values.pop(dep, None)
+
+                lock = locks.get(phase.resource) or contextlib.nullcontext()
+                async with lock:
+                    start = time.time()
+                    with instrumentation.span("phase", phase.name):
+                        if asyncio.iscoroutinefunction(phase.func):
+                            value = await phase.func(**kwargs)
+                        else:
+                            value = await asyncio.to_thread(phase.func, **kwargs)
+                    timing = PhaseTiming(phase.name, start, time.time())
+                del kwargs
+            except Exception as e:
+                await completions.put((phase.name, None, None, e))
+                return
+
+            self.timings[phase.name] = timing
+            if consumers[phase.name]:
+                values[phase.name] = value
+            finished[phase.name].set()
+            await completions.put((phase.name, value, timing, None))
+
+        tasks = [asyncio.ensure_future(execute(phase)) for phase in self.phases]
+        try:
+            for _ in self.phases:
+                name, value, timing, error = await completions.get()
+                if error is not None:
+                    raise error
+                yield name, value, timing
+                del value
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self, **initial: Any) -> Dict[str, Any]:
+        """Execute every phase and return all artifacts keyed by phase name"""
+        results = {}
+        async for name, value, _ in self.iter_run(**initial):
+            results[name] = value
+        return results
+
+    def critical_path(self) -> List[str]:
+        """Chain of phases that determined the total wall-clock time of the last run"""
+        if not self.timings:
+            return []
+        by_name = {phase.name: phase for phase in self.phases}
+        current = max(self.timings.values(), key=lambda timing: timing.end).name
+        path = [current]
+        while True:
+            upstream = [self.timings[dep] for dep in by_name[current].depends_on if dep in self.timings]
+            if not upstream:
+                break
+            current = max(upstream, key=lambda timing: timing.end).name
+            path.append(current)
+        return list(reversed(path))
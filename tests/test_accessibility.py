@@ -0,0 +1,42 @@
+# tests/test_accessibility.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from agents.tools.accessibility import check_accessibility, contrast_ratio  # noqa: E402
+
+
+def rules(content_assets):
+    return [(finding.section, finding.index, finding.rule) for finding in check_accessibility(content_assets).findings]
+
+
+def test_heading_order_follows_the_document():
+    # h1, h2 (HTML), h3: in order, though every Markdown heading precedes every HTML one in the text
+    nested = "# Course\n<h2>Module</h2>\n### Lesson"
+    # h1 then h3: a jump, hidden if HTML headings were all checked after Markdown ones
+    skipped = "<h1>Course</h1>\n### Lesson\n## Module"
+
+    assert rules({"modules": [{"title": "a", "body": nested}, {"title": "b", "body": skipped}]}) == [
+        ("modules", 1, "heading_order")
+    ]
+
+
+def test_alt_text_contrast_and_transcripts():
+    content_assets = {
+        "modules": [
+            {"title": "images", "body": '![](a.png) <img src="b.png"> <img src="c.png" alt="chart">'},
+            {"title": "grey", "body": "color: #777777; background: #888888"},
+            {"title": "ok", "body": "color: #000; background: #fff"},
+        ],
+        "video_scripts": [{"title": "intro", "script": "Hello"}, {"title": "captioned", "transcript": "Hello"}],
+    }
+    report = check_accessibility(content_assets)
+
+    assert rules(content_assets) == [("modules", 0, "missing_alt_text"), ("modules", 1, "colour_contrast"),
+                                     ("video_scripts", 0, "missing_transcript")]
+    assert report.findings[0].message == "2 image(s) without alternative text"
+    assert report.compliance()["status"] == "fail"
+    assert report.items_checked == 5
+    assert round(contrast_ratio("#000", "#fff"), 1) == 21.0
@@ -0,0 +1,91 @@
+# tests/test_asset_store.py
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from agents.discovery_agent import LearningRequirements  # noqa: E402
+from agents.phase_cache import PhaseCache  # noqa: E402
+from benchmarks.bench_pipeline import course_inputs  # noqa: E402
+from benchmarks.fake_llm import FakeLLM, fake_model  # noqa: E402
+from crew_manager import InstructionalDesignCrew  # noqa: E402
+from pipeline.asset_store import AssetStore  # noqa: E402
+
+PARAGRAPHS = [f"Paragraph {i}: " + "kubectl apply deploys the manifest to the cluster. " * 12 + "\n\n"
+              for i in range(12)]
+GUIDE = {"title": "Deploy a Pod", "steps": "kubectl run web --image=nginx"}
+
+
+def course(name, paragraphs):
+    return {"lab_guides": [GUIDE, {"title": f"{name} extras", "steps": name}],
+            "handbook": "".join(paragraphs)}
+
+
+def test_shared_items_and_paragraphs_are_stored_once(tmp_path):
+    store = AssetStore(str(tmp_path / "assets.db"))
+    first = course("a", PARAGRAPHS)
+    # One paragraph edited: only the piece of text around it is new
+    second = course("b", PARAGRAPHS[:-1] + ["An edited paragraph.\n\n"])
+
+    store.put(first, "course-a", "content_assets")
+    after_first = store.stats()
+    store.put(second, "course-b", "content_assets")
+    stats = store.stats()
+
+    assert store.load("course-a", "content_assets") == first
+    assert store.load("course-b", "content_assets") == second
+    assert stats["entries"] == 2 and stats["dedup_ratio"] > 1.5
+    assert stats["unique_bytes"] - after_first["unique_bytes"] < after_first["unique_bytes"] / 4
+    assert store.contains(GUIDE)
+    assert store.find_items("lab_guides", "deploy a pod!") == [GUIDE]
+
+
+def test_refs_free_chunks_only_when_unused(tmp_path):
+    store = AssetStore(str(tmp_path / "assets.db"))
+    requirements = fake_model(LearningRequirements, random.Random(0), 2, 5)
+    store.put(course("a", PARAGRAPHS), "course-a", "content_assets")
+    store.put(course("b", PARAGRAPHS), "course-b", "content_assets")
+    store.put(requirements, "course-b", "requirements")
+
+    assert store.delete("course-a") == 1
+    assert store.load("course-b", "content_assets") == course("b", PARAGRAPHS)
+    assert store.load("course-b", "requirements") == requirements
+    assert store.contains(GUIDE)
+
+    assert store.delete("course-b", "content_assets") == 1
+    assert not store.contains(GUIDE)
+    assert store.courses() == {"course-b": ["requirements"]}
+    store.delete("course-b")
+    assert store.stats()["chunks"] == 0 and store.stats()["artifacts"] == 0
+
+
+def test_find_matches_phase_key_and_age(tmp_path):
+    store = AssetStore(str(tmp_path / "assets.db"))
+    store.put({"plan": "v1"}, "course-a", "blueprint", key="k1")
+
+    assert store.find("blueprint", "k1") == {"plan": "v1"}
+    assert store.find("blueprint", "k2") is None
+    assert store.find("lab_environment", "k1") is None
+    assert store.find("blueprint", "k1", max_age=60) == {"plan": "v1"}
+    assert store.find("blueprint", "k1", max_age=-1) is None
+
+
+def test_crew_reuses_phases_from_other_courses(tmp_path):
+    store = AssetStore(str(tmp_path / "assets.db"))
+    with FakeLLM(latency=0, build_agents=False) as llm:
+        with InstructionalDesignCrew(assets=store) as crew:
+            first = crew.create_course(course_inputs(0))
+            llm.reset()
+            timings = [timing for _, _, timing in crew.iter_course(course_inputs(0))]
+            assert llm.calls == 0
+            assert all(timing.stored and not timing.reused for timing in timings)
+
+        # A bypassed phase cache bypasses the store as well
+        with InstructionalDesignCrew(cache=PhaseCache(str(tmp_path / "cache"), bypass=True), assets=store) as crew:
+            llm.reset()
+            again = crew.create_course(course_inputs(0))
+            assert llm.calls > 0
+
+    assert again["fingerprints"] == first["fingerprints"]
@@ -0,0 +1,44 @@
+# tests/test_batch.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from agents.context import ContextProjector  # noqa: E402
+from benchmarks.bench_pipeline import course_inputs  # noqa: E402
+from benchmarks.fake_llm import FakeLLM  # noqa: E402
+from crew_manager import InstructionalDesignCrew  # noqa: E402
+
+
+class FakeCrew(InstructionalDesignCrew):
+    """A crew answered by FakeLLM, installed again in every spawned worker process"""
+
+    def __init__(self, **kwargs):
+        FakeLLM(latency=0, build_agents=False).install()
+        super().__init__(**kwargs)
+
+
+def test_process_executor_under_spawn():
+    projector = ContextProjector()
+    with FakeCrew(context=projector) as crew:
+        results = list(crew.create_courses([course_inputs(0), course_inputs(1)], max_concurrency=2,
+                                           executor="process"))
+
+    assert sorted(result.index for result in results) == [0, 1]
+    assert all(result.ok for result in results), [result.error for result in results]
+    assert all("deployment_package" in result.result for result in results)
+    # Token counts from the worker processes end up on the parent's projector
+    assert projector.report()["deployment"]["calls"] == 2
+
+
+def test_projector_survives_pickling():
+    import pickle
+
+    projector = ContextProjector(token_budget=500)
+    projector.record("qa", "prompt", [])
+    copy = pickle.loads(pickle.dumps(projector))
+    assert copy.token_budget == 500 and copy.report() == {}
+    copy.record("qa", "prompt", [])
+    projector.merge(copy.drain())
+    assert projector.report()["qa"]["calls"] == 2 and copy.report() == {}
@@ -0,0 +1,67 @@
+# tests/test_checkpoint.py
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from agents.discovery_agent import LearningRequirements  # noqa: E402
+from benchmarks.bench_pipeline import course_inputs  # noqa: E402
+from benchmarks.fake_llm import FakeLLM  # noqa: E402
+from crew_manager import InstructionalDesignCrew  # noqa: E402
+from pipeline.checkpoint import INPUTS, CheckpointStore  # noqa: E402
+
+PHASES = ["blueprint", "content_assets", "deployment_package", "lab_environment", "qa_report", "requirements"]
+
+
+def test_store_round_trips_models_and_plain_values(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    inputs = course_inputs(0)
+    run_id = store.new_run(inputs)
+
+    with FakeLLM(latency=0, build_agents=False) as llm, InstructionalDesignCrew() as crew:
+        requirements = crew.discovery_agent.execute_discovery(inputs)
+    assert llm.calls == 1
+    store.save(run_id, "requirements", requirements)
+
+    assert store.load(run_id, INPUTS) == inputs
+    loaded = store.load(run_id, "requirements")
+    assert isinstance(loaded, LearningRequirements) and loaded == requirements
+    assert store.completed(run_id) == ["requirements"]
+    with pytest.raises(KeyError):
+        store.load(run_id, "blueprint")
+
+
+def test_resume_continues_an_interrupted_run(tmp_path):
+    with FakeLLM(latency=0, build_agents=False) as llm, \
+            InstructionalDesignCrew(checkpoints=CheckpointStore(str(tmp_path))) as crew:
+        # Interrupted after two phases
+        phases = crew.iter_course(course_inputs(1), run_id="run-1")
+        finished = [next(phases)[0] for _ in range(2)]
+        phases.close()
+        interrupted_calls = llm.calls
+        assert crew.checkpoints.completed("run-1") == sorted(finished)
+
+        llm.reset()
+        resumed = crew.resume("run-1")
+        resumed_calls = llm.calls
+
+        llm.reset()
+        full = crew.create_course(course_inputs(1))
+
+    assert resumed["run_id"] == "run-1"
+    assert crew.checkpoints.completed("run-1") == PHASES
+    # Only the phases that had not finished ran again
+    assert interrupted_calls + resumed_calls == llm.calls
+    assert resumed["fingerprints"] == full["fingerprints"]
+    assert resumed["deployment_package"] == full["deployment_package"]
+
+
+def test_run_id_needs_a_checkpoint_store():
+    with InstructionalDesignCrew() as crew:
+        with pytest.raises(ValueError):
+            crew.create_course(course_inputs(0), run_id="run-1")
+        with pytest.raises(ValueError):
+            crew.resume("run-1")
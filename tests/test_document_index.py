@@ -0,0 +1,43 @@
+# tests/test_document_index.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from agents.tools.document_index import DocumentIndex  # noqa: E402
+
+
+def test_refresh_is_incremental_and_search_ranks_passages(tmp_path):
+    (tmp_path / "kubernetes.md").write_text("Kubernetes pods schedule containers on nodes.\n\nPods restart.")
+    (tmp_path / "billing.txt").write_text("Invoices are sent monthly to the billing contact.")
+    (tmp_path / "image.png").write_bytes(b"\x89PNG")
+    index = DocumentIndex(str(tmp_path))
+
+    assert index.refresh() == {"added": 2, "updated": 0, "removed": 0, "unchanged": 0}
+    assert index.search("kubernetes pods")[0]["path"] == "kubernetes.md"
+    assert index.search("nothing matches zebra") == []
+
+    (tmp_path / "billing.txt").write_text("Invoices now go to the finance pods team.")
+    (tmp_path / "kubernetes.md").unlink()
+    assert index.refresh() == {"added": 0, "updated": 1, "removed": 1, "unchanged": 0}
+    assert [hit["path"] for hit in index.search("pods")] == ["billing.txt"]
+
+    # A fresh index loads the persisted state and finds nothing to redo
+    reloaded = DocumentIndex(str(tmp_path))
+    assert reloaded.refresh() == {"added": 0, "updated": 0, "removed": 0, "unchanged": 1}
+    assert reloaded.search("finance")[0]["path"] == "billing.txt"
+
+
+def test_refresh_if_stale_throttles_folder_walks(tmp_path):
+    (tmp_path / "a.md").write_text("alpha document")
+    index = DocumentIndex(str(tmp_path), refresh_interval=3600)
+
+    assert index.refresh_if_stale()["added"] == 1
+    (tmp_path / "b.md").write_text("beta document")
+    assert index.refresh_if_stale() is None
+    assert index.search("beta") == []
+
+    index.refresh_interval = 0
+    assert index.refresh_if_stale()["added"] == 1
+    assert index.search("beta")[0]["path"] == "b.md"
@@ -0,0 +1,66 @@
+# tests/test_file_reader.py
+import codecs
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from agents.tools.file_reader import LINES_PER_CHECKPOINT, ChunkedFileReader  # noqa: E402
+
+
+def read_all(reader, path, **kwargs):
+    """Every chunk of a read, following continuation tokens"""
+    chunks = [reader.read(str(path), **kwargs)]
+    while chunks[-1]["truncated"]:
+        chunks.append(reader.read(str(path), continuation_token=chunks[-1]["continuation_token"]))
+    return chunks
+
+
+def test_line_ranges_across_checkpoints(tmp_path):
+    lines = [f"line {i} é\n" for i in range(1, 3 * LINES_PER_CHECKPOINT)]
+    path = tmp_path / "log.txt"
+    path.write_text("".join(lines), encoding="utf-8")
+    start, end = LINES_PER_CHECKPOINT - 2, 2 * LINES_PER_CHECKPOINT + 5
+
+    chunks = read_all(ChunkedFileReader(max_bytes=1000), path, start_line=start, end_line=end)
+
+    assert len(chunks) > 1
+    assert "remain" in chunks[0]["summary"]
+    assert "".join(chunk["content"] for chunk in chunks) == "".join(lines[start - 1:end])
+    with pytest.raises(ValueError):
+        ChunkedFileReader().read(str(path), start_line=10, end_line=9)
+
+
+def test_continuation_tokens_cover_the_range_and_expire(tmp_path):
+    text = "".join(f"{i:05d} ünïcödé\n" for i in range(2000))
+    path = tmp_path / "data.txt"
+    path.write_text(text, encoding="utf-8")
+    reader = ChunkedFileReader(max_bytes=777)
+
+    chunks = read_all(reader, path, offset=0)
+    assert "".join(chunk["content"] for chunk in chunks) == text
+    assert all(chunk["offset"] + chunk["length"] == following["offset"]
+               for chunk, following in zip(chunks, chunks[1:]))
+
+    first = reader.read(str(path))
+    with open(path, "a", encoding="utf-8") as file:
+        file.write("more\n")
+    with pytest.raises(ValueError):
+        reader.read(str(path), continuation_token=first["continuation_token"])
+
+
+@pytest.mark.parametrize("encoding, bom", [("utf-16-be", codecs.BOM_UTF16_BE), ("utf-16-le", codecs.BOM_UTF16_LE),
+                                           ("utf-32-be", codecs.BOM_UTF32_BE)])
+def test_wide_encodings_keep_their_byte_order_across_chunks(tmp_path, encoding, bom):
+    text = "Größe – 尺寸\n" * 300
+    path = tmp_path / "wide.txt"
+    path.write_bytes(bom + text.encode(encoding))
+
+    chunks = read_all(ChunkedFileReader(max_bytes=501), path)
+
+    assert len(chunks) > 1
+    assert {chunk["encoding"] for chunk in chunks} == {encoding}
+    assert "".join(chunk["content"] for chunk in chunks) == text
@@ -0,0 +1,128 @@
+# tests/test_jobs.py
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from benchmarks.bench_pipeline import course_inputs  # noqa: E402
+from benchmarks.fake_llm import FakeLLM  # noqa: E402
+from crew_manager import InstructionalDesignCrew  # noqa: E402
+from pipeline.checkpoint import CheckpointStore  # noqa: E402
+from pipeline.jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue, Worker, WorkerPool  # noqa: E402
+
+
+class SlowCrew:
+    """Crew whose courses take longer than a lease"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def create_course(self, inputs):
+        time.sleep(self.seconds)
+        return {"course": inputs["topic"]}
+
+
+def broken_crew():
+    raise ImportError("no crew in this environment")
+
+
+def test_claim_complete_and_fetch(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    first, second = queue.submit_many([{"topic": "a"}, {"topic": "b"}])
+
+    job = queue.claim("w1")
+    assert (job.id, job.status, job.attempts, job.worker) == (first, RUNNING, 1, "w1")
+    with pytest.raises(ValueError):
+        queue.fetch(first)
+    assert not queue.complete(first, "w2", {"course": "stolen"})
+    assert queue.complete(first, "w1", {"course": "a"})
+
+    assert queue.fetch(first) == {"course": "a"}
+    assert queue.counts() == {QUEUED: 1, RUNNING: 0, DONE: 1, FAILED: 0}
+    assert queue.claim("w1").id == second
+    with pytest.raises(KeyError):
+        queue.get("missing")
+
+
+def test_expired_leases_are_requeued_until_attempts_run_out(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"), lease_seconds=0.05, max_attempts=2)
+    job_id = queue.submit({"topic": "a"})
+
+    queue.claim("w1")
+    time.sleep(0.1)
+    retry = queue.claim("w2")
+    assert (retry.id, retry.attempts, retry.worker) == (job_id, 2, "w2")
+    assert "w1" in retry.error
+    # The first worker lost its lease and can no longer finish or extend the job
+    assert not queue.heartbeat(job_id, "w1")
+    assert not queue.complete(job_id, "w1", {})
+
+    time.sleep(0.1)
+    assert queue.claim("w3") is None
+    assert queue.get(job_id).status == FAILED
+
+
+def test_requeue_worker_releases_leases_at_once(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"), lease_seconds=300)
+    job_id = queue.submit({"topic": "a"})
+    queue.register("w1")
+    queue.claim("w1")
+    assert [worker["job"] for worker in queue.workers()] == [job_id]
+
+    assert queue.requeue_worker("w1") == 1
+    assert queue.workers() == []
+    assert queue.claim("w2").id == job_id
+
+
+def test_heartbeat_keeps_a_long_job_leased(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"), lease_seconds=0.3)
+    job_id = queue.submit({"topic": "slow"})
+    worker = Worker(queue, lambda: SlowCrew(1.0), "w1")
+    thread = threading.Thread(target=worker.run, kwargs={"max_jobs": 1})
+    thread.start()
+    while queue.get(job_id).status == QUEUED:
+        time.sleep(0.01)
+
+    deadline = time.monotonic() + 1.5
+    stolen = None
+    while thread.is_alive() and time.monotonic() < deadline and stolen is None:
+        stolen = queue.claim("w2")
+        time.sleep(0.05)
+    thread.join(5)
+
+    assert stolen is None
+    assert queue.get(job_id).attempts == 1
+    assert queue.fetch(job_id) == {"course": "slow"}
+
+
+def test_worker_runs_a_course_with_checkpoints(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    job_id = queue.submit(course_inputs(0))
+
+    def crew():
+        return InstructionalDesignCrew(checkpoints=CheckpointStore(str(tmp_path / "checkpoints")))
+
+    with FakeLLM(latency=0, build_agents=False):
+        assert Worker(queue, crew, "w1").run(max_jobs=1) == 1
+
+    result = queue.fetch(job_id)
+    assert result["run_id"] == job_id
+    assert "deployment_package" in result and len(result["fingerprints"]) == 6
+    assert CheckpointStore(str(tmp_path / "checkpoints")).completed(job_id)
+
+
+def test_pool_raises_when_workers_cannot_start(tmp_path):
+    pool = WorkerPool(str(tmp_path / "jobs.db"), workers=1, crew_factory=broken_crew, poll_interval=0.1,
+                      max_startup_failures=2)
+    pool.start()
+    try:
+        with pytest.raises(RuntimeError, match="no crew in this environment"):
+            pool.wait_ready(timeout=60)
+    finally:
+        pool.stop()
+    assert pool.startup_failures == 2
@@ -0,0 +1,50 @@
+# tests/test_lab_capacity.py
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from agents.tools.lab_capacity import CapacityPlanner, SeatSpec, plan_lab_capacity, weekly_curve  # noqa: E402
+
+
+def test_seat_spec_units():
+    seat = SeatSpec.parse({"CPU": "500m", "Memory": "512Mi", "storage": "1 TB", "disk_iops": "fast", "gpu": "1"})
+    assert (seat.vcpu, seat.memory_gb, seat.storage_gb) == (0.5, 0.5, 1024.0)
+    assert SeatSpec.parse({"vcpus": "2 cores", "ram": "8GiB"}) == SeatSpec(vcpu=2.0, memory_gb=8.0)
+    assert SeatSpec.parse({"memory": "unknown"}) == SeatSpec()
+
+
+def test_plan_by_hand_on_a_flat_curve():
+    prices = {"spot_discount": 1.0, "storage_gb_month": {"aws": 0.0},
+              "instances": [{"provider": "aws", "name": "box", "vcpu": 4, "memory_gb": 8, "hourly": 1.0}]}
+    plan = CapacityPlanner(prices).plan(SeatSpec(vcpu=1, memory_gb=2), np.full(24, 10.0))[0]
+
+    # Memory fits 4 seats a node, so 10 learners need 3 nodes every hour
+    assert (plan.seats_per_node, plan.peak_nodes, plan.node_hours) == (4, 3, 72.0)
+    assert plan.total_cost == pytest.approx(72.0)
+    assert plan.served_fraction == 1.0
+    assert (plan.policy, plan.cpu_overcommit, plan.headroom, plan.spot_share) == ("static", 1.0, 0.0, 0.0)
+
+
+def test_optimal_plan_is_the_cheapest_feasible_scenario():
+    planner = CapacityPlanner()
+    seat, curve = SeatSpec(vcpu=2, memory_gb=4), weekly_curve(250)
+    result = planner.evaluate(seat, curve)
+    plans = planner.plan(seat, curve)
+
+    assert plans[0].total_cost == pytest.approx(result["total"][result["feasible"]].min())
+    assert [plan.total_cost for plan in plans] == sorted(plan.total_cost for plan in plans)
+    assert all(plan.served_fraction >= 0.99 for plan in plans)
+
+
+def test_provider_filter_and_oversized_seats():
+    report = plan_lab_capacity({"cpu": "2", "memory": "4GB"}, peak_learners=50, provider="GCP")
+    assert report["optimal"]["provider"] == "gcp"
+    assert report["hours"] == 168 and report["cost_estimates"]["total_monthly_usd"] > 0
+
+    with pytest.raises(ValueError):
+        plan_lab_capacity({"cpu": "1000"})
@@ -0,0 +1,57 @@
+# tests/test_learner_simulation.py
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from agents.tools.learner_simulation import (  # noqa: E402
+    LearnerProfile, LearnerSimulation, module_hours, simulate_learners,
+)
+
+COURSE = [
+    {"title": "Containers", "duration": "90 minutes"},
+    {"title": "Pods lab", "type": "hands-on lab", "duration": "3 hours"},
+    {"title": "Services", "estimated_time": "2h"},
+]
+
+
+def test_module_hours():
+    assert [module_hours(module) for module in COURSE] == [1.5, 3.0, 2.0]
+    assert module_hours({"effort": "1 day"}) == 8.0
+    assert module_hours({"title": "No estimate"}) == 2.0
+
+
+def test_runs_are_reproducible_per_seed():
+    first = simulate_learners(COURSE, learners=5000, seed=7)
+    assert simulate_learners(COURSE, learners=5000, seed=7) == first
+    assert simulate_learners(COURSE, learners=5000, seed=8) != first
+    assert first["completion_rate"] + first["dropout_rate"] == pytest.approx(1.0)
+    assert sum(first["profiles"].values()) == pytest.approx(1.0)
+    assert 0 < first["peak_concurrent_lab_learners"] <= 5000
+
+
+def test_failure_rates_drive_dropouts():
+    def run(failure_rate):
+        profile = LearnerProfile(share=1.0, pace=1.0, pace_sigma=0.0, failure_rate=failure_rate, daily_hours=2.0)
+        return LearnerSimulation(COURSE, {"only": profile}).run(learners=4000, seed=1)
+
+    perfect, struggling = run(0.0), run(0.5)
+    assert perfect["completion_rate"] == 1.0 and perfect["dropout_rate"] == 0.0
+    assert struggling["completion_rate"] < 0.9
+    # The lab fails more often than theory modules, so it is where learners drop out
+    assert struggling["bottleneck_modules"][0]["module"] == "Pods lab"
+    # With no rework, completion time is the planned 6.5 hours times per-module noise
+    assert perfect["completion_hours"]["p50"] == pytest.approx(6.5, rel=0.1)
+
+
+def test_invalid_inputs():
+    assert simulate_learners([{"title": "Reading"}], learners=100)["peak_concurrent_lab_learners"] == 0
+    with pytest.raises(ValueError):
+        simulate_learners([])
+    with pytest.raises(ValueError):
+        simulate_learners(COURSE, profile_mix={"expert": 1.0})
+    with pytest.raises(ValueError):
+        simulate_learners(COURSE, profile_mix={"novice": 0.0})
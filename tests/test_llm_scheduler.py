@@ -0,0 +1,84 @@
+# tests/test_llm_scheduler.py
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from agents.llm_scheduler import LLMQueueFull, LLMScheduler, TokenBucket  # noqa: E402
+
+
+def admission_order(scheduler, phases, gap=0.0):
+    """Phases in the order the scheduler admits them, all queued while one slot is held"""
+    order = []
+    holder = scheduler.acquire("hold")
+
+    def request(phase):
+        with scheduler.slot(phase):
+            order.append(phase)
+
+    threads = []
+    for phase in phases:
+        threads.append(threading.Thread(target=request, args=(phase,)))
+        threads[-1].start()
+        deadline = time.monotonic() + 5
+        while scheduler.stats()["queue_depth"] < len(threads) and time.monotonic() < deadline:
+            time.sleep(0.005)
+        time.sleep(gap)
+    scheduler.release(holder)
+    for thread in threads:
+        thread.join(5)
+    return order
+
+
+def test_later_phases_go_first():
+    scheduler = LLMScheduler(max_concurrency=1)
+    assert admission_order(scheduler, ["requirements", "blueprint", "deployment_package", "qa_report"]) == [
+        "deployment_package", "qa_report", "blueprint", "requirements"
+    ]
+    stats = scheduler.stats()
+    assert stats["in_flight"] == 0 and stats["max_queue_depth"] == 4
+    assert stats["waits"]["requirements"]["count"] == 1
+
+
+def test_aging_promotes_old_requests():
+    # Waiting 0.4s is worth 8 priority levels, more than the 5 between discovery and deployment
+    scheduler = LLMScheduler(max_concurrency=1, aging=0.05)
+    assert admission_order(scheduler, ["requirements", "deployment_package"], gap=0.4) == [
+        "requirements", "deployment_package"
+    ]
+
+
+def test_full_queue_rejects_after_timeout():
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=1)
+    holder = scheduler.acquire("hold")
+    waiter = threading.Thread(target=lambda: scheduler.release(scheduler.acquire("qa_report")))
+    waiter.start()
+    while scheduler.stats()["queue_depth"] < 1:
+        time.sleep(0.005)
+
+    with pytest.raises(LLMQueueFull):
+        scheduler.acquire("requirements", timeout=0.1)
+    scheduler.release(holder)
+    waiter.join(5)
+    assert scheduler.stats()["rejected"] == 1
+
+
+def test_token_bucket_and_reconciliation():
+    bucket = TokenBucket(per_minute=60)
+    now = bucket.updated
+    assert bucket.wait_time(60, now) == 0.0
+    bucket.consume(60, now)
+    assert bucket.wait_time(30, now) == pytest.approx(30.0)
+    # Requests larger than the bucket wait for a full one rather than forever
+    assert bucket.wait_time(600, now + 30) == pytest.approx(30.0)
+
+    scheduler = LLMScheduler(tpm=6000)
+    with scheduler.slot("qa_report", tokens=1000) as ticket:
+        ticket.actual_tokens = 3000
+    # The extra 2000 tokens actually used are charged on release
+    assert scheduler.tokens.level == pytest.approx(3000, abs=10)
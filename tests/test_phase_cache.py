@@ -0,0 +1,74 @@
+# tests/test_phase_cache.py
+import os
+import sys
+
+from pydantic import BaseModel
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from agents import phase_cache  # noqa: E402
+from agents.phase_cache import PhaseCache  # noqa: E402
+from benchmarks.bench_pipeline import course_inputs  # noqa: E402
+from benchmarks.fake_llm import FakeLLM  # noqa: E402
+from crew_manager import InstructionalDesignCrew  # noqa: E402
+
+
+class Answer(BaseModel):
+    text: str
+
+
+def test_key_covers_prompt_model_and_schema(tmp_path):
+    class Other(BaseModel):
+        text: int
+
+    cache = PhaseCache(str(tmp_path))
+    key = cache.key("prompt", "gpt-4o-mini", Answer)
+    assert key == cache.key("prompt", "gpt-4o-mini", Answer)
+    assert len({key, cache.key("prompt!", "gpt-4o-mini", Answer), cache.key("prompt", "gpt-4o", Answer),
+                cache.key("prompt", "gpt-4o-mini", Other)}) == 4
+
+
+def test_ttl_and_bypass(tmp_path, monkeypatch):
+    cache = PhaseCache(str(tmp_path), ttl=60)
+    cache.set("k1", Answer(text="cached"))
+    assert cache.get("k1", Answer) == Answer(text="cached")
+
+    now = phase_cache.time.time()
+    monkeypatch.setattr(phase_cache.time, "time", lambda: now + 61)
+    assert cache.get("k1", Answer) is None
+    assert not os.path.exists(cache._path("k1"))
+
+    bypassed = PhaseCache(str(tmp_path), bypass=True)
+    bypassed.set("k2", Answer(text="fresh"))
+    assert bypassed.get("k2", Answer) is None
+    assert PhaseCache(str(tmp_path)).get("k2", Answer) == Answer(text="fresh")
+
+
+def test_lru_eviction_keeps_recently_read_entries(tmp_path):
+    cache = PhaseCache(str(tmp_path))
+    for key in ("old", "older"):
+        cache.set(key, Answer(text=key))
+    entry_size = os.path.getsize(cache._path("old"))
+    os.utime(cache._path("old"), (1000, 1000))
+    os.utime(cache._path("older"), (500, 500))
+    # Reading "older" makes it the most recently used, leaving "old" to be evicted
+    assert cache.get("older", Answer) is not None
+
+    cache.max_bytes = 2 * entry_size + entry_size // 2
+    cache.set("new", Answer(text="new"))
+    assert [key for key in ("old", "older", "new") if os.path.exists(cache._path(key))] == ["older", "new"]
+
+
+def test_second_identical_course_is_served_from_cache(tmp_path):
+    with FakeLLM(latency=0, build_agents=False) as llm, \
+            InstructionalDesignCrew(cache=PhaseCache(str(tmp_path))) as crew:
+        first = crew.create_course(course_inputs(0))
+        calls = llm.calls
+        llm.reset()
+        second = crew.create_course(course_inputs(0))
+
+    assert calls > 0 and llm.calls == 0
+    assert crew.cache.hits == calls
+    assert second["fingerprints"] == first["fingerprints"]
+    assert second["deployment_package"] == first["deployment_package"]
@@ -0,0 +1,67 @@
+# tests/test_repair.py
+import json
+import os
+import sys
+from types import SimpleNamespace
+from typing import List
+
+from pydantic import BaseModel
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from agents.kickoff import kickoff_structured  # noqa: E402
+from agents.repair import failing_fields, parse_output  # noqa: E402
+
+
+class Plan(BaseModel):
+    title: str
+    modules: List[str]
+    hours: int
+
+
+class ScriptedAgent:
+    """Agent whose kickoffs return the given raw outputs in turn, validated against the requested format"""
+
+    def __init__(self, *outputs: str):
+        self.outputs = list(outputs)
+        self.requests = []
+
+    def kickoff(self, prompt, response_format):
+        self.requests.append((prompt, response_format))
+        raw = self.outputs.pop(0)
+        try:
+            value = response_format.model_validate_json(raw)
+        except ValueError:
+            value = None
+        return SimpleNamespace(raw=raw, pydantic=value, usage_metrics={"total_tokens": len(raw)})
+
+
+def test_parse_output_and_failing_fields():
+    assert parse_output('```json\n{"title": "K8s"}\n```') == {"title": "K8s"}
+    assert parse_output('Here you go: {"title": "K8s"} Hope it helps') == {"title": "K8s"}
+    assert parse_output("no json here") is None
+    assert failing_fields(Plan, {"hours": "many", "title": "K8s"}) == ["modules", "hours"]
+
+
+def test_only_invalid_fields_are_asked_for_again():
+    agent = ScriptedAgent(json.dumps({"title": "Kubernetes", "modules": ["Pods", "Services"], "hours": "ten"}),
+                          json.dumps({"hours": 10}))
+
+    plan = kickoff_structured(agent, "Plan a course", Plan)
+
+    assert plan == Plan(title="Kubernetes", modules=["Pods", "Services"], hours=10)
+    assert len(agent.requests) == 2
+    repair_prompt, repair_format = agent.requests[1]
+    assert list(repair_format.model_fields) == ["hours"]
+    # The accepted fields are quoted for consistency, not requested again
+    assert '"title": "Kubernetes"' in repair_prompt and "fields hours as JSON" in repair_prompt
+
+
+def test_unparseable_output_falls_back_to_a_full_retry():
+    good = json.dumps({"title": "Kubernetes", "modules": ["Pods"], "hours": 4})
+    agent = ScriptedAgent("I cannot answer in JSON", good)
+
+    assert kickoff_structured(agent, "Plan a course", Plan) == Plan.model_validate_json(good)
+    assert [request for request, _ in agent.requests] == ["Plan a course", "Plan a course"]
+    assert all(response_format is Plan for _, response_format in agent.requests)
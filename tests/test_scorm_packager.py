@@ -0,0 +1,65 @@
+# tests/test_scorm_packager.py
+import os
+import sys
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from agents.tools.custom_tools import SCORMPackagingTool  # noqa: E402
+from agents.tools.scorm_packager import _ZIP32_LIMIT, ScormPackager, StreamingZipWriter, compress  # noqa: E402
+
+
+def test_duplicate_assets_are_stored_once(tmp_path):
+    shared = {"title": "Shared", "content": "same body"}
+    assets = {"modules": [shared, {"title": "Other", "content": "x"}], "supporting_materials": [dict(shared)]}
+    report = ScormPackager(version="2004").package(assets, str(tmp_path / "course.zip"))
+
+    assert (report.items, report.unique_assets, report.duplicate_assets) == (3, 2, 1)
+    with zipfile.ZipFile(tmp_path / "course.zip") as package:
+        assert package.testzip() is None
+        pages = [name for name in package.namelist() if name.startswith("assets/")]
+        manifest = package.read("imsmanifest.xml").decode("utf-8")
+    assert len(pages) == 2
+    # Both items that use the shared page point at one resource
+    uses = sorted(manifest.count(f'identifierref="RES-{name[len("assets/"):-len(".html")]}"') for name in pages)
+    assert uses == [1, 2]
+
+
+def test_zip64_records_past_the_4gib_offset(tmp_path):
+    path = tmp_path / "big.zip"
+    with open(path, "wb") as stream:
+        # A sparse gap puts the entries past 4 GiB without writing 4 GiB
+        stream.seek(_ZIP32_LIMIT + 1)
+        writer = StreamingZipWriter(stream)
+        writer.offset = _ZIP32_LIMIT + 1
+        writer.add("a.txt", *compress(b"alpha" * 100, 6))
+        writer.add("b.txt", *compress(b"beta", 6))
+        writer.close()
+
+    with open(path, "rb") as stream:
+        stream.seek(-(56 + 20 + 22), os.SEEK_END)
+        assert stream.read(4) == b"PK\x06\x06"
+    with zipfile.ZipFile(path) as package:
+        assert package.read("a.txt") == b"alpha" * 100
+        assert package.read("b.txt") == b"beta"
+        assert package.getinfo("b.txt").header_offset > _ZIP32_LIMIT
+
+
+def test_packaging_tool_stays_in_its_directory(tmp_path):
+    tool = SCORMPackagingTool(output_dir=str(tmp_path / "packages"))
+
+    result = tool._run('{"modules": [{"title": "Intro"}]}', output_path="nested/course.zip")
+    assert result["status"] == "success"
+    assert result["scorm_package"] == os.path.realpath(tmp_path / "packages" / "nested" / "course.zip")
+    with zipfile.ZipFile(result["scorm_package"]) as package:
+        assert "imsmanifest.xml" in package.namelist()
+
+    for escape in ("../outside.zip", str(tmp_path / "absolute.zip"), "nested/../..", "."):
+        with pytest.raises(ValueError):
+            tool._resolve_output(escape)
+        assert tool._run("{}", output_path=escape)["status"] == "error"
+    assert not (tmp_path / "outside.zip").exists()
+    assert not (tmp_path / "absolute.zip").exists()
@@ -0,0 +1,70 @@
+# tests/test_script_runner.py
+import os
+import shutil
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from agents.tools.script_runner import (  # noqa: E402
+    PROSE, ScriptRunner, as_script, collect_scripts, technical_validation,
+)
+from agents.tools.tool_cache import ToolCache  # noqa: E402
+
+needs_bash = pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not installed")
+
+
+def runner(**kwargs):
+    return ScriptRunner(cache=ToolCache(), **kwargs)
+
+
+def test_only_scripts_are_collected_as_code():
+    lab = {
+        "setup_scripts": ["#!/bin/bash\necho ready", "```python\nprint('hi')\n```", "Create a namespace for the lab"],
+        "teardown_procedures": ["Delete the namespace when done", ""],
+    }
+    assets = {"code_examples": [{"language": "javascript", "code": "console.log(1)"}, {"title": "no code"}]}
+    units = collect_scripts(lab, assets)
+
+    assert [[(script.name, script.language) for script in unit] for unit in units] == [
+        [("setup_scripts[0]", "bash"), ("setup_scripts[1]", "python"), ("setup_scripts[2]", PROSE),
+         ("teardown_procedures[0]", PROSE)],
+        [("code_examples[0]", "node")],
+    ]
+    assert as_script("s", "```python\nprint('hi')\n```").source == "print('hi')\n"
+
+
+@needs_bash
+def test_execute_mode_shares_a_sandbox_and_reports_failures():
+    scripts = [as_script("setup", "#!/bin/bash\necho data > state.txt"),
+               as_script("check", "#!/bin/bash\ngrep -q data state.txt && test \"$HOME\" = \"$PWD\""),
+               as_script("broken", "#!/bin/bash\necho nope >&2; exit 3"),
+               as_script("note", "Then tell the learners to log in")]
+    results = runner(mode="execute").run_unit(scripts)
+
+    assert [result.status for result in results] == ["passed", "passed", "failed", "skipped"]
+    assert results[2].returncode == 3 and "nope" in results[2].stderr
+    summary = technical_validation(results, "execute")
+    assert (summary["scripts_passed"], summary["script_status"], summary["note"]) == ("2/3", "fail", "skipped")
+
+
+@needs_bash
+def test_timeouts_kill_the_process_group():
+    script = as_script("sleepy", "#!/bin/bash\nsleep 30 & sleep 30")
+    result = runner(mode="execute", timeout=0.5).run_unit([script])[0]
+    assert result.status == "timeout" and result.duration < 10
+
+
+def test_syntax_mode_and_caching():
+    scripts = [as_script("ok", "import os\nprint(os.sep)", "python"),
+               as_script("bad", "def broken(:\n    pass", "python")]
+    cached_runner = runner()
+
+    first = cached_runner.run([scripts[:1], scripts[1:]])
+    assert [(result.status, result.cached) for result in first] == [("passed", False), ("failed", False)]
+    second = cached_runner.run([scripts[:1], scripts[1:]])
+    # Passes are served from cache; failures run again in case they were transient
+    assert [(result.status, result.cached) for result in second] == [("passed", True), ("failed", False)]
+    assert technical_validation([], "syntax")["script_status"] == "skipped"
@@ -0,0 +1,57 @@
+# tests/test_update_course.py
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from benchmarks.bench_pipeline import course_inputs  # noqa: E402
+from benchmarks.fake_llm import FakeLLM  # noqa: E402
+from crew_manager import InstructionalDesignCrew  # noqa: E402
+
+PHASES = ["requirements", "blueprint", "lab_environment", "content_assets", "qa_report", "deployment_package"]
+
+
+def test_unchanged_inputs_reuse_every_phase():
+    with FakeLLM(latency=0, build_agents=False) as llm, InstructionalDesignCrew() as crew:
+        first = crew.create_course(course_inputs(0))
+        llm.reset()
+        # A key that no phase reads leaves every fingerprint unchanged
+        updated = crew.update_course(first, dict(course_inputs(0), notes="not read by any phase"))
+
+    assert llm.calls == 0
+    assert updated["reused"] == PHASES and updated["recomputed"] == []
+    assert updated["fingerprints"] == first["fingerprints"]
+
+
+def test_changed_inputs_recompute_only_downstream_phases():
+    with FakeLLM(latency=0, build_agents=False) as llm, InstructionalDesignCrew() as crew:
+        first = crew.create_course(course_inputs(0))
+        full_calls = llm.calls
+        requirements = first["requirements"]
+        # Discovery reruns for the new timeline but returns the same requirements, so nothing else changes
+        crew.discovery_agent.execute_discovery = lambda inputs: requirements
+        llm.reset()
+        updated = crew.update_course(first, dict(course_inputs(0), timeline="6 weeks"))
+
+    assert updated["recomputed"] == ["requirements"]
+    assert updated["reused"] == PHASES[1:]
+    assert llm.calls == 0 < full_calls
+
+
+def test_async_results_can_be_updated():
+    with FakeLLM(latency=0, build_agents=False) as llm, InstructionalDesignCrew() as crew:
+        sequential = crew.create_course(course_inputs(0))
+        concurrent = asyncio.run(crew.create_course_async(course_inputs(0)))
+        llm.reset()
+        updated = crew.update_course(concurrent, course_inputs(0))
+
+        with pytest.raises(ValueError):
+            crew.update_course({"requirements": sequential["requirements"]}, course_inputs(0))
+
+    # Phases up to content generation see the same inputs; the concurrent path generates content in parts
+    assert all(concurrent["fingerprints"][name] == sequential["fingerprints"][name] for name in PHASES[:4])
+    assert llm.calls == 0 and updated["recomputed"] == []
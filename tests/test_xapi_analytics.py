@@ -0,0 +1,100 @@
+# tests/test_xapi_analytics.py
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from agents.tools.xapi_analytics import XapiAnalytics, flatten, parse_duration  # noqa: E402
+
+COURSE = "https://lms.example.com/courses/k8s"
+VERB = "http://adlnet.gov/expapi/verbs/"
+
+
+def statement(learner, verb, module=None, day=1, duration=None, scaled=None):
+    result = {}
+    if duration:
+        result["duration"] = duration
+    if scaled is not None:
+        result["score"] = {"scaled": scaled}
+    context = {"contextActivities": {"parent": [{"id": COURSE}]}} if module else {}
+    return {
+        "actor": {"mbox": f"mailto:{learner}@example.com"},
+        "verb": {"id": VERB + verb},
+        "object": {"id": f"{COURSE}/{module}" if module else COURSE},
+        "context": context,
+        "result": result,
+        "timestamp": f"2026-03-{day:02d}T10:00:00Z",
+    }
+
+
+def write(path, statements, mode="w"):
+    with open(path, mode, encoding="utf-8") as file:
+        for item in statements:
+            file.write((item if isinstance(item, str) else json.dumps(item)) + "\n")
+
+
+STATEMENTS = [
+    statement("ana", "attempted", "pods", day=1, duration="PT30M"),
+    statement("ana", "passed", "pods", day=1, duration="PT1H", scaled=0.9),
+    statement("ben", "attempted", "pods", day=2, duration="PT45M", scaled=0.5),
+    statement("ben", "completed", "services", day=2, duration="PT15M"),
+    statement("ana", "completed", day=3),
+    "{not json",
+]
+
+
+def test_parsing():
+    assert parse_duration("PT1H5M30.5S") == 3930.5
+    assert parse_duration("P1DT1H") == 90000.0
+    assert parse_duration("bogus") == 0.0
+    course, module, learner, verb, timestamp, seconds, score, completed = flatten(STATEMENTS[1])
+    assert (course, module, learner) == (COURSE, f"{COURSE}/pods", "mailto:ana@example.com")
+    assert (seconds, score, completed) == (3600.0, pytest.approx(0.9), True)
+    assert flatten(STATEMENTS[4])[1] == ""
+
+
+def test_course_module_learner_and_daily_queries(tmp_path):
+    write(tmp_path / "statements.jsonl", STATEMENTS)
+    engine = XapiAnalytics(str(tmp_path / "store"))
+    assert engine.ingest(str(tmp_path)) == {"files": 1, "statements": 5, "rejected": 1}
+
+    course = engine.course(COURSE)
+    assert (course["learners"], course["statements"], course["learners_completed"]) == (2, 5, 1)
+    assert course["time_on_task_hours"] == 2.5
+    assert {module["module"]: module["completions"] for module in course["modules"]} == {
+        f"{COURSE}/pods": 1, f"{COURSE}/services": 1}
+
+    pods = engine.module(COURSE, f"{COURSE}/pods")
+    assert (pods["learners"], pods["completion_rate"], pods["mean_score"], pods["max_score"]) == (2, 0.5, 0.7, 0.9)
+    ana = engine.learner("mailto:ana@example.com", COURSE)
+    assert ana["completions"] == 2 and len(ana["progress"]) == 2
+    assert [(day["date"], day["statements"]) for day in engine.activity(COURSE, since="2026-03-02")] == [
+        ("2026-03-02", 2), ("2026-03-03", 1)]
+    with pytest.raises(KeyError):
+        engine.module(COURSE, "missing")
+
+
+def test_incremental_ingest_survives_reloads(tmp_path):
+    path = tmp_path / "statements.jsonl"
+    write(path, STATEMENTS[:3])
+    store = str(tmp_path / "store")
+    # Tiny segments and snapshots so reloading replays segments on top of a snapshot
+    options = {"segment_rows": 2, "batch_rows": 2, "snapshot_rows": 3}
+    assert XapiAnalytics(store, **options).ingest(str(path))["statements"] == 3
+
+    write(path, STATEMENTS[3:5], mode="a")
+    engine = XapiAnalytics(store, **options)
+    assert engine.ingest(str(path))["statements"] == 2
+    assert engine.ingest(str(path))["statements"] == 0
+
+    reloaded = XapiAnalytics(store, **options)
+    stats = reloaded.stats()
+    assert stats["statements"] == 5 and stats["segments"] > 1 and stats["snapshot_statements"] > 0
+    expected = engine.course(COURSE)
+    assert reloaded.course(COURSE) == expected
+    reloaded.rebuild()
+    assert reloaded.course(COURSE) == expected